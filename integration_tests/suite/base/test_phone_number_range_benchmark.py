@@ -0,0 +1,59 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import time
+import unittest
+
+from hamcrest import assert_that, equal_to
+
+from . import confd, db
+
+BENCHMARK_SIZES = [
+    int(size)
+    for size in os.environ.get('PHONE_NUMBER_RANGE_BENCHMARK_SIZES', '').split(',')
+    if size.strip()
+]
+FIRST_NUMBER = 15550000000
+# the largest range accepted by POST /phone-numbers/ranges
+BLOCK_SIZE = 10_000
+
+
+def create_numbers(size):
+    created = redundant = 0
+    for start in range(FIRST_NUMBER, FIRST_NUMBER + size, BLOCK_SIZE):
+        end = min(start + BLOCK_SIZE, FIRST_NUMBER + size) - 1
+        response = confd.phone_numbers.ranges.post(
+            {'start_number': '+{}'.format(start), 'end_number': '+{}'.format(end)}
+        )
+        response.assert_status(201)
+        created += len(response.item['created'])
+        redundant += response.item['total'] - len(response.item['created'])
+    return created, redundant
+
+
+@unittest.skipUnless(BENCHMARK_SIZES, 'PHONE_NUMBER_RANGE_BENCHMARK_SIZES is not set')
+def test_create_range_numbers_per_second():
+    for size in BENCHMARK_SIZES:
+        try:
+            start = time.monotonic()
+            created, _ = create_numbers(size)
+            created_elapsed = time.monotonic() - start
+
+            start = time.monotonic()
+            _, redundant = create_numbers(size)
+            redundant_elapsed = time.monotonic() - start
+
+            assert_that(created, equal_to(size))
+            assert_that(redundant, equal_to(size))
+            print(
+                'Created {} numbers in {:.2f}s ({:.1f} numbers/s), '
+                'found them existing in {:.2f}s'.format(
+                    size, created_elapsed, size / created_elapsed, redundant_elapsed
+                )
+            )
+        finally:
+            db.execute(
+                "DELETE FROM phone_number WHERE number LIKE :prefix",
+                prefix='+{}%'.format(str(FIRST_NUMBER)[:5]),
+            )
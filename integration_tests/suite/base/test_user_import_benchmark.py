@@ -0,0 +1,54 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import time
+import unittest
+
+from hamcrest import assert_that, has_length
+
+from ..helpers import fixtures, helpers as h
+from . import confd
+
+BENCHMARK_ROWS = int(os.environ.get('USER_IMPORT_BENCHMARK_ROWS') or 0)
+FIRST_EXTEN = 100000
+
+client = h.user_import.csv_client()
+
+
+@unittest.skipUnless(BENCHMARK_ROWS, 'USER_IMPORT_BENCHMARK_ROWS is not set')
+@fixtures.context(
+    user_ranges=[
+        {'start': str(FIRST_EXTEN), 'end': str(FIRST_EXTEN + BENCHMARK_ROWS - 1)}
+    ]
+)
+def test_import_rows_per_second(context):
+    csv = [
+        {
+            'firstname': 'Benchmark',
+            'lastname': str(number),
+            'line_protocol': 'sip',
+            'context': context['name'],
+            'exten': str(FIRST_EXTEN + number),
+            'voicemail_name': 'Benchmark {}'.format(number),
+            'voicemail_number': str(FIRST_EXTEN + number),
+            'voicemail_context': context['name'],
+        }
+        for number in range(BENCHMARK_ROWS)
+    ]
+
+    start = time.monotonic()
+    response = client.post('/users/import', csv)
+    elapsed = time.monotonic() - start
+
+    created = response.item['created']
+    try:
+        assert_that(created, has_length(BENCHMARK_ROWS))
+        print(
+            'Imported {} CSV rows in {:.2f}s ({:.1f} rows/s)'.format(
+                BENCHMARK_ROWS, elapsed, BENCHMARK_ROWS / elapsed
+            )
+        )
+    finally:
+        for row in created:
+            confd.users(row['user_uuid']).delete(recursive=True)
@@ -1,4 +1,4 @@
-# Copyright 2015-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from collections import deque
@@ -20,9 +20,12 @@ class FlushMixin:
         self.__deque.append((event, extra_headers))
 
     def flush(self):
+        count = 0
         while self.__deque:
             event, extra_headers = self.__deque.popleft()
             self.publish(event, headers=extra_headers)
+            count += 1
+        return count
 
     def rollback(self):
         self.__deque.clear()
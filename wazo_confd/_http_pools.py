@@ -0,0 +1,149 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import bisect
+import threading
+import time
+
+from functools import partial
+
+import requests
+
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+from xivo.status import Status
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class LatencyHistogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        index = bisect.bisect_left(self._buckets, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += seconds
+
+    def snapshot(self):
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        buckets = {}
+        cumulative = 0
+        for bucket, count in zip(self._buckets + ('+Inf',), counts):
+            cumulative += count
+            buckets[str(bucket)] = cumulative
+        return {'buckets': buckets, 'count': cumulative, 'sum': total}
+
+
+class HTTPPool:
+    """Keep-alive connections to one downstream service.
+
+    Sessions given by `session` or prepared by `mount` share the connections
+    of the pool, so they can be created for each call and used from any
+    thread. Every request gets the pool timeout unless one is given and its
+    latency is recorded, then given to `on_call` with the pool name.
+    """
+
+    def __init__(self, name, pool_size=10, timeout=10, on_call=None):
+        self.name = name
+        self.timeout = timeout
+        self.on_call = on_call
+        self._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.latencies = LatencyHistogram()
+        self.errors = 0
+
+    def session(self):
+        session = requests.Session()
+        session.trust_env = False
+        return self.mount(session)
+
+    def mount(self, session):
+        # wazo-lib-rest-client sessions ask to close the connection after each call
+        session.headers.pop('Connection', None)
+        session.mount('http://', self._adapter)
+        session.mount('https://', self._adapter)
+        session.request = partial(self._request, session.request)
+        return session
+
+    def attach(self, client):
+        """Make a wazo-lib-rest-client client use the pool."""
+        build_session = client.session
+        client.session = lambda: self.mount(build_session())
+        return client
+
+    def close(self):
+        self._adapter.close()
+
+    def provide_status(self):
+        return {'errors': self.errors, 'latency': self.latencies.snapshot()}
+
+    def _request(self, request, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        start = time.monotonic()
+        try:
+            return request(method, url, **kwargs)
+        except RequestException:
+            self.errors += 1
+            raise
+        finally:
+            elapsed = time.monotonic() - start
+            self.latencies.observe(elapsed)
+            if self.on_call:
+                self.on_call(self.name, elapsed)
+
+
+class HTTPPools:
+    """The HTTPPool of each downstream service, by name.
+
+    Services missing from the configuration get a pool with default settings.
+    The callbacks given to `subscribe` are called after each call of any pool.
+    """
+
+    def __init__(self):
+        self._config = {}
+        self._pools = {}
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def configure(self, config):
+        with self._lock:
+            self._config = dict(config)
+
+    def get(self, name):
+        with self._lock:
+            if name not in self._pools:
+                config = self._config.get(name) or {}
+                self._pools[name] = HTTPPool(name, on_call=self._on_call, **config)
+            return self._pools[name]
+
+    def subscribe(self, callback):
+        self._callbacks.append(callback)
+
+    def _on_call(self, name, seconds):
+        for callback in self._callbacks:
+            callback(name, seconds)
+
+    def attach(self, name, client):
+        return self.get(name).attach(client)
+
+    def close(self):
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.close()
+
+    def provide_status(self, status):
+        with self._lock:
+            pools = dict(self._pools)
+        status['http_pools']['status'] = Status.ok
+        for name, pool in pools.items():
+            status['http_pools'][name] = pool.provide_status()
+
+
+http_pools = HTTPPools()
@@ -0,0 +1,220 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import cProfile
+import io
+import logging
+import pstats
+import random
+import threading
+import time
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ._http_pools import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+PROFILE_LINES = 40
+
+
+class EndpointMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.latencies = LatencyHistogram()
+        self.db_queries = 0
+        self.db_time = 0
+        self.calls = {}
+        self.bus_events = 0
+        self.response_bytes = 0
+
+    def add(self, request_metrics, status_code, response_bytes):
+        self.requests += 1
+        if status_code >= 500:
+            self.errors += 1
+        self.db_queries += request_metrics.db_queries
+        self.db_time += request_metrics.db_time
+        for service, (count, seconds) in request_metrics.calls.items():
+            total_count, total_seconds = self.calls.get(service, (0, 0))
+            self.calls[service] = (total_count + count, total_seconds + seconds)
+        self.bus_events += request_metrics.bus_events
+        self.response_bytes += response_bytes
+
+    def snapshot(self):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'latency': self.latencies.snapshot(),
+            'db_queries': self.db_queries,
+            'db_time': self.db_time,
+            'calls': {
+                service: {'count': count, 'time': seconds}
+                for service, (count, seconds) in self.calls.items()
+            },
+            'bus_events': self.bus_events,
+            'response_bytes': self.response_bytes,
+        }
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.db_queries = 0
+        self.db_time = 0
+        self.calls = {}
+        self.bus_events = 0
+        self.profiler = None
+
+
+class Metrics:
+    """Counters of the requests handled by each endpoint.
+
+    The counters of a request are kept in `g` from `before_request` to
+    `after_request`, then added to the ones of its endpoint. The SQL queries
+    are counted through the SQLAlchemy engine events, the calls to other
+    services through `HTTPPools.subscribe`.
+
+    A `profile_sample_rate` fraction of the requests is run under cProfile,
+    one at a time. The statistics of the `profile_keep` slowest of them are
+    kept.
+    """
+
+    def __init__(self, enabled=True, profile_sample_rate=0, profile_keep=10):
+        self.enabled = enabled
+        self.profile_sample_rate = profile_sample_rate
+        self.profile_keep = profile_keep
+        self._endpoints = {}
+        self._profiles = []
+        self._registered = False
+        self._lock = threading.Lock()
+        self._profiler_lock = threading.Lock()
+
+    def configure(self, enabled, profile_sample_rate, profile_keep):
+        self.enabled = enabled
+        self.profile_sample_rate = profile_sample_rate
+        self.profile_keep = profile_keep
+
+    def init_app(self, app):
+        """Register the request hooks. The app `after_request` functions are
+        called in reverse order, so this must be called before registering
+        the others to count their work in the request.
+        """
+        app.before_request(self.start_request)
+        app.after_request(self.finish_request)
+        app.teardown_request(self._abort_request)
+        with self._lock:
+            if not self._registered:
+                event.listen(
+                    Engine, 'before_cursor_execute', self._before_cursor_execute
+                )
+                event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+                self._registered = True
+
+    def start_request(self):
+        if not self.enabled:
+            return
+
+        request_metrics = g.request_metrics = RequestMetrics()
+        if self._should_profile() and self._profiler_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                logger.debug('another profiler is active, request not profiled')
+                self._profiler_lock.release()
+            else:
+                request_metrics.profiler = profiler
+
+    def finish_request(self, response):
+        request_metrics = g.pop('request_metrics', None)
+        if not request_metrics:
+            return response
+
+        elapsed = time.monotonic() - request_metrics.started
+        if request_metrics.profiler:
+            request_metrics.profiler.disable()
+            self._profiler_lock.release()
+
+        if request.url_rule is None:
+            return response
+
+        name = '{} {}'.format(request.method, request.url_rule.rule)
+        response_bytes = response.calculate_content_length() or 0
+        with self._lock:
+            endpoint = self._endpoints.get(name)
+            if endpoint is None:
+                endpoint = self._endpoints[name] = EndpointMetrics()
+            endpoint.add(request_metrics, response.status_code, response_bytes)
+        endpoint.latencies.observe(elapsed)
+
+        if request_metrics.profiler:
+            self._keep_profile(name, elapsed, request_metrics.profiler)
+        return response
+
+    def _abort_request(self, exception):
+        request_metrics = g.pop('request_metrics', None)
+        if request_metrics and request_metrics.profiler:
+            request_metrics.profiler.disable()
+            self._profiler_lock.release()
+
+    def record_call(self, service, seconds):
+        request_metrics = self._current()
+        if request_metrics:
+            count, total = request_metrics.calls.get(service, (0, 0))
+            request_metrics.calls[service] = (count + 1, total + seconds)
+
+    def record_bus_events(self, count):
+        request_metrics = self._current()
+        if request_metrics:
+            request_metrics.bus_events += count
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'endpoints': {
+                    name: endpoint.snapshot()
+                    for name, endpoint in self._endpoints.items()
+                },
+                'profiles': list(self._profiles),
+            }
+
+    def _current(self):
+        if has_request_context():
+            return g.get('request_metrics')
+
+    def _should_profile(self):
+        return self.profile_sample_rate and random.random() < self.profile_sample_rate
+
+    def _keep_profile(self, name, elapsed, profiler):
+        with self._lock:
+            slowest = self._profiles[self.profile_keep - 1 : self.profile_keep]
+            if slowest and slowest[0]['duration'] >= elapsed:
+                return
+
+        output = io.StringIO()
+        stats = pstats.Stats(profiler, stream=output)
+        stats.sort_stats('cumulative').print_stats(PROFILE_LINES)
+        profile = {'endpoint': name, 'duration': elapsed, 'stats': output.getvalue()}
+
+        with self._lock:
+            self._profiles.append(profile)
+            self._profiles.sort(key=lambda profile: profile['duration'], reverse=True)
+            del self._profiles[self.profile_keep :]
+
+    def _before_cursor_execute(self, conn, cursor, statement, params, context, many):
+        if self._current():
+            context._confd_query_started = time.monotonic()
+
+    def _after_cursor_execute(self, conn, cursor, statement, params, context, many):
+        started = getattr(context, '_confd_query_started', None)
+        request_metrics = self._current()
+        if started is None or not request_metrics:
+            return
+        request_metrics.db_queries += 1
+        request_metrics.db_time += time.monotonic() - started
+
+
+metrics = Metrics()
@@ -0,0 +1,118 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import logging
+import threading
+import time
+
+from collections import namedtuple
+
+from stevedore.named import NamedExtensionManager
+
+logger = logging.getLogger(__name__)
+
+PluginTiming = namedtuple('PluginTiming', ['import_time', 'load_time'])
+
+
+class PluginLoader:
+    """Load the enabled plugins one by one, timing each of them.
+
+    The time taken to import each plugin and to run its `load` is kept in
+    `timings`. With `profile`, the timings are logged once all plugins are
+    loaded, slowest first.
+
+    The `lazy` function given to the plugins builds their services on first
+    use when `lazy` is set, and right away otherwise.
+    """
+
+    def __init__(self, profile=False, lazy=False):
+        self.profile = profile
+        self.lazy_services = lazy
+        self.timings = {}
+
+    def load(self, namespace, enabled_plugins, dependencies):
+        dependencies = dict(dependencies, lazy=self.lazy)
+        names = [name for name, enabled in enabled_plugins.items() if enabled]
+        logger.debug('enabled plugins: %s', names)
+
+        started = time.monotonic()
+        for name in names:
+            self._load_plugin(namespace, name, dependencies)
+        elapsed = time.monotonic() - started
+
+        logger.info('%s plugins loaded in %.3f seconds', len(names), elapsed)
+        if self.profile:
+            self._log_timings()
+
+    def lazy(self, factory, *args, **kwargs):
+        if not self.lazy_services:
+            return factory(*args, **kwargs)
+        return LazyService(factory, *args, **kwargs)
+
+    def _load_plugin(self, namespace, name, dependencies):
+        started = time.monotonic()
+        manager = NamedExtensionManager(
+            namespace,
+            [name],
+            invoke_on_load=True,
+            on_load_failure_callback=_on_load_failure,
+            on_missing_entrypoints_callback=_on_missing_entrypoints,
+        )
+        imported = time.monotonic()
+        for extension in manager:
+            logger.debug('loading plugin %s', name)
+            try:
+                extension.obj.load(dependencies)
+            except Exception:
+                logger.exception('failed to load plugin %s', name)
+        loaded = time.monotonic()
+        self.timings[name] = PluginTiming(imported - started, loaded - imported)
+
+    def _log_timings(self):
+        timings = sorted(
+            self.timings.items(),
+            key=lambda item: item[1].import_time + item[1].load_time,
+            reverse=True,
+        )
+        for name, timing in timings:
+            logger.info(
+                'plugin %s: import %.3f seconds, load %.3f seconds',
+                name,
+                timing.import_time,
+                timing.load_time,
+            )
+
+
+class LazyService:
+    """Proxy building its service on the first attribute access"""
+
+    def __init__(self, factory, *args, **kwargs):
+        self.__factory = factory
+        self.__args = args
+        self.__kwargs = kwargs
+        self.__service = None
+        self.__lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(self.__get_service(), name)
+
+    def __get_service(self):
+        if self.__service is None:
+            with self.__lock:
+                if self.__service is None:
+                    started = time.monotonic()
+                    self.__service = self.__factory(*self.__args, **self.__kwargs)
+                    logger.debug(
+                        'built %s in %.3f seconds',
+                        getattr(self.__factory, '__qualname__', self.__factory),
+                        time.monotonic() - started,
+                    )
+        return self.__service
+
+
+def _on_load_failure(manager, entrypoint, exception):
+    logger.error('failed to import plugin %s', entrypoint, exc_info=exception)
+
+
+def _on_missing_entrypoints(missing_names):
+    logger.error('could not find plugins: %s', ', '.join(sorted(missing_names)))
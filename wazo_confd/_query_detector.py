@@ -0,0 +1,166 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import logging
+import os
+import re
+import threading
+import traceback
+
+from collections import Counter
+from functools import wraps
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+MODULE_FILENAME = os.path.abspath(__file__)
+PACKAGE_DIRECTORY = os.path.dirname(MODULE_FILENAME)
+STACK_DEPTH = 12
+
+_parameter_list = re.compile(r'\(\s*(?:%\(\w+\)s|\?)(?:\s*,\s*(?:%\(\w+\)s|\?))*\s*\)')
+_spaces = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(Exception):
+    def __init__(self, name, count, budget):
+        super().__init__(
+            '{} made {} SQL queries, over its budget of {}'.format(name, count, budget)
+        )
+
+
+class RequestQueries:
+    def __init__(self):
+        self.count = 0
+        self.shapes = Counter()
+        self.stacks = {}
+
+
+class QueryDetector:
+    """Find the SQL statements repeated in a request, as done by N+1 patterns.
+
+    The statements of a request are counted by shape, the statement with its
+    lists of parameters collapsed. The call stack of a shape executed
+    `threshold` times is captured and logged at the end of the request.
+
+    The queries of the resource methods decorated with `query_budget` are
+    counted; going over the budget is logged or, with `enforce_budgets`, fails
+    the request with QueryBudgetExceeded.
+
+    Nothing is done unless `enabled`, the hooks are then not registered.
+    """
+
+    def __init__(self, enabled=False, threshold=5, enforce_budgets=False):
+        self.enabled = enabled
+        self.threshold = threshold
+        self.enforce_budgets = enforce_budgets
+        self._registered = False
+        self._lock = threading.Lock()
+
+    def configure(self, enabled, threshold, enforce_budgets):
+        self.enabled = enabled
+        self.threshold = threshold
+        self.enforce_budgets = enforce_budgets
+
+    def init_app(self, app):
+        if not self.enabled:
+            return
+
+        app.before_request(self.start_request)
+        app.teardown_request(self.finish_request)
+        with self._lock:
+            if not self._registered:
+                event.listen(
+                    Engine, 'before_cursor_execute', self._before_cursor_execute
+                )
+                self._registered = True
+
+    def start_request(self):
+        g.request_queries = RequestQueries()
+
+    def finish_request(self, exception):
+        request_queries = g.pop('request_queries', None)
+        if not request_queries:
+            return
+
+        for shape, stack in request_queries.stacks.items():
+            logger.warning(
+                'N+1 queries in %s %s: statement executed %s times: %s\n%s',
+                request.method,
+                request.path,
+                request_queries.shapes[shape],
+                shape,
+                stack,
+            )
+
+    def query_count(self):
+        request_queries = self._current()
+        return request_queries.count if request_queries else 0
+
+    def check_budget(self, name, count, budget):
+        if count <= budget:
+            return
+
+        error = QueryBudgetExceeded(name, count, budget)
+        if self.enforce_budgets:
+            raise error
+        logger.warning('%s', error)
+
+    def _current(self):
+        if has_request_context():
+            return g.get('request_queries')
+
+    def _before_cursor_execute(self, conn, cursor, statement, params, context, many):
+        request_queries = self._current()
+        if request_queries is None:
+            return
+
+        request_queries.count += 1
+        shape = _shape(statement)
+        request_queries.shapes[shape] += 1
+        if request_queries.shapes[shape] == self.threshold:
+            request_queries.stacks[shape] = _format_stack()
+
+
+def query_budget(budget, per_item=0, items=None):
+    """Declare the maximum number of SQL queries made by a resource method.
+
+    For the methods whose queries grow with the payload, `items` is called
+    with the arguments of the method and the budget grows by `per_item`
+    queries for each item it returns.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = query_detector.query_count()
+            result = func(*args, **kwargs)
+            count = query_detector.query_count() - start
+            limit = budget
+            if items:
+                limit += per_item * len(items(*args, **kwargs))
+            query_detector.check_budget(func.__qualname__, count, limit)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def _shape(statement):
+    return _parameter_list.sub('(...)', _spaces.sub(' ', statement.strip()))
+
+
+def _format_stack():
+    frames = [
+        frame
+        for frame in traceback.extract_stack()
+        if frame.filename.startswith(PACKAGE_DIRECTORY)
+        and frame.filename != MODULE_FILENAME
+    ]
+    return ''.join(traceback.format_list(frames[-STACK_DEPTH:]))
+
+
+query_detector = QueryDetector()
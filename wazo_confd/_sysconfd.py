@@ -1,10 +1,24 @@
-# Copyright 2013-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import logging
+import queue
+import threading
+import time
+
+from collections import deque
+
 import requests
 
+from flask import g
+from xivo.status import Status
+from xivo_dao.helpers.db_utils import session_scope
 from xivo_dao.resources.configuration import dao as configuration_dao
 
+from ._http_pools import http_pools
+
+logger = logging.getLogger(__name__)
+
 
 class SysconfdError(Exception):
     def __init__(self, code, value):
@@ -15,17 +29,74 @@ class SysconfdError(Exception):
         return "sysconfd error: status {} - {}".format(self.code, self.value)
 
 
+class LiveReloadState:
+    """Process-wide copy of the live reload setting.
+
+    It has the interface of the configuration dao used by SysconfdPublisher.
+    The value edited by a request is set once the request is committed, and
+    read again from the database after `ttl` seconds or when another process
+    edits it.
+    """
+
+    def __init__(self, dao, ttl=10):
+        self.dao = dao
+        self.ttl = ttl
+        self._enabled = None
+        self._expires_at = 0
+
+    def configure(self, ttl):
+        self.ttl = ttl
+
+    def is_live_reload_enabled(self):
+        enabled = self._enabled
+        if enabled is None or time.monotonic() >= self._expires_at:
+            enabled = self.dao.is_live_reload_enabled()
+            self.set(enabled)
+        return enabled
+
+    def set(self, enabled):
+        self._expires_at = time.monotonic() + self.ttl
+        self._enabled = enabled
+
+    def edited(self, enabled):
+        """Set the value once the request is committed. Call `committed` once
+        the request is committed, or `rolled_back`."""
+        g.live_reload_enabled = enabled
+
+    def committed(self):
+        enabled = g.pop('live_reload_enabled', None)
+        if enabled is not None:
+            self.set(enabled)
+
+    def rolled_back(self):
+        g.pop('live_reload_enabled', None)
+
+    def invalidate(self):
+        self._enabled = None
+
+    def load(self):
+        try:
+            with session_scope():
+                self.is_live_reload_enabled()
+        except Exception as e:
+            logger.warning('could not load the live reload setting: %s', e)
+
+
+live_reload_state = LiveReloadState(configuration_dao)
+
+
 class SysconfdPublisher:
     @classmethod
     def from_config(cls, config):
         url = "http://{}:{}".format(
             config['sysconfd']['host'], config['sysconfd']['port']
         )
-        return cls(url, configuration_dao)
+        return cls(url, live_reload_state, http_pools.get('sysconfd'))
 
-    def __init__(self, base_url, dao):
+    def __init__(self, base_url, dao, http_pool=None):
         self.base_url = base_url
         self.dao = dao
+        self.http_pool = http_pool
         self._reset()
 
     def exec_request_handlers(self, args):
@@ -123,6 +194,8 @@ class SysconfdPublisher:
         return response.json()['data']
 
     def _session(self):
+        if self.http_pool:
+            return self.http_pool.session()
         session = requests.Session()
         session.trust_env = False
         return session
@@ -154,6 +227,13 @@ class SysconfdPublisher:
             response = request_applicator(session)
             self.check_for_errors(response)
 
+    def dispatch(self, dispatcher, urgent=False):
+        job = dispatcher.submit(
+            self.handlers, self.handlers_contexts, self.requests, urgent
+        )
+        self._reset()
+        return job
+
     def rollback(self):
         self._reset()
 
@@ -161,3 +241,315 @@ class SysconfdPublisher:
         self.requests = []
         self.handlers = {}
         self.handlers_contexts = []
+
+
+class SysconfdJob:
+    def __init__(self, handlers, handlers_contexts, requests, urgent=False):
+        self.handlers = handlers
+        self.handlers_contexts = handlers_contexts
+        self.requests = requests
+        self.urgent = urgent
+        self.submitted_at = time.monotonic()
+        self.error = None
+        self._done = threading.Event()
+
+    def done(self, error=None):
+        self.error = error
+        self._done.set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+
+class ReloadScheduler:
+    """Send each handler command at most once every `interval` seconds.
+
+    A command requested again during its interval stays pending and is sent
+    once the interval expires. The contexts requested with commands are sent
+    once all of these commands are sent. Commands are only marked as sent
+    when sysconfd accepted them; after a failure, the pending commands are
+    retried after `retry_delay` seconds.
+    """
+
+    def __init__(self, interval=0, retry_delay=5):
+        self._interval = interval
+        self._retry_delay = retry_delay
+        self._last_sent = {}
+        self._pending = {}
+        self._pending_contexts = []
+        self._retry_at = None
+        self.requested_count = 0
+        self.sent_count = 0
+
+    @property
+    def pending_count(self):
+        return sum(len(commands) for commands in self._pending.values())
+
+    def add(self, handlers, handlers_contexts):
+        for service, commands in handlers.items():
+            self.requested_count += len(commands)
+            self._pending.setdefault(service, set()).update(commands)
+        if handlers_contexts:
+            keys = frozenset(
+                (service, command)
+                for service, commands in handlers.items()
+                for command in commands
+            )
+            self._pending_contexts.append((list(handlers_contexts), keys))
+
+    def due(self, now, force=False):
+        """Return the commands to send and their contexts. Call `sent` once
+        sysconfd accepted them, or `failed`."""
+        if not force and self._retry_at is not None and now < self._retry_at:
+            return {}, []
+
+        due = {}
+        for service, commands in self._pending.items():
+            for command in commands:
+                if force or self._is_due((service, command), now):
+                    due.setdefault(service, set()).add(command)
+
+        if not due:
+            return {}, []
+
+        contexts = []
+        for entry_contexts, keys in self._pending_contexts:
+            if all(self._is_sent_with(key, due) for key in keys):
+                contexts.extend(entry_contexts)
+        return due, contexts
+
+    def sent(self, handlers, now):
+        for service, commands in handlers.items():
+            self._pending[service] -= commands
+            if not self._pending[service]:
+                del self._pending[service]
+            for command in commands:
+                self._last_sent[(service, command)] = now
+            self.sent_count += len(commands)
+
+        self._retry_at = None
+        self._pending_contexts = [
+            (contexts, keys)
+            for contexts, keys in self._pending_contexts
+            if any(self._is_pending(key) for key in keys)
+        ]
+
+    def failed(self, now):
+        self._retry_at = now + self._retry_delay
+
+    def time_until_due(self, now):
+        if not self._pending:
+            return None
+        next_due = min(
+            self._last_sent.get((service, command), now) + self._interval
+            for service, commands in self._pending.items()
+            for command in commands
+        )
+        if self._retry_at is not None:
+            next_due = max(next_due, self._retry_at)
+        return max(next_due - now, 0)
+
+    def _is_due(self, key, now):
+        last_sent = self._last_sent.get(key)
+        return last_sent is None or now >= last_sent + self._interval
+
+    def _is_pending(self, key):
+        service, command = key
+        return command in self._pending.get(service, ())
+
+    def _is_sent_with(self, key, due):
+        service, command = key
+        return command in due.get(service, ()) or not self._is_pending(key)
+
+
+class SysconfdDispatcher:
+    """Send the sysconfd work of committed requests from a background thread.
+
+    Jobs submitted within `coalesce_delay` seconds are sent together, using one
+    keep-alive session. Requests are sent in the order they were submitted,
+    after the pending handlers. The handlers of jobs without requests go
+    through a ReloadScheduler, so identical reloads requested by many HTTP
+    requests are merged. A sysconfd error only fails the job it comes from.
+    """
+
+    @classmethod
+    def from_config(cls, config):
+        url = "http://{}:{}".format(
+            config['sysconfd']['host'], config['sysconfd']['port']
+        )
+        return cls(
+            url,
+            coalesce_delay=config['sysconfd']['coalesce_delay'],
+            reload_interval=config['sysconfd']['reload_interval'],
+            http_pool=http_pools.get('sysconfd'),
+        )
+
+    def __init__(
+        self, base_url, coalesce_delay=0.05, reload_interval=0, http_pool=None
+    ):
+        self.base_url = base_url
+        self._coalesce_delay = coalesce_delay
+        self._reload_scheduler = ReloadScheduler(reload_interval)
+        self._queue = queue.Queue()
+        self._thread = None
+        if http_pool:
+            self._session = http_pool.session()
+        else:
+            self._session = requests.Session()
+            self._session.trust_env = False
+        self._latencies = deque(maxlen=1000)
+        self._jobs_count = 0
+        self._handlers_count = 0
+        self._errors_count = 0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='sysconfd-dispatcher')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        if not self._thread:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def submit(self, handlers, handlers_contexts, requests, urgent=False):
+        if not handlers and not requests:
+            return None
+        job = SysconfdJob(handlers, handlers_contexts, requests, urgent)
+        self._queue.put(job)
+        return job
+
+    def wait(self, job, timeout=None):
+        if job is None:
+            return
+        if not job.wait(timeout):
+            raise SysconfdError(504, 'timeout waiting for sysconfd')
+        if job.error:
+            raise job.error
+
+    def provide_status(self, status):
+        latencies = list(self._latencies)
+        running = bool(self._thread and self._thread.is_alive())
+        scheduler = self._reload_scheduler
+        pending_reloads = scheduler.pending_count
+        status['sysconfd_dispatcher'].update(
+            {
+                'status': Status.ok if running else Status.fail,
+                'queue_size': self._queue.qsize(),
+                'jobs': self._jobs_count,
+                'handlers_sent': self._handlers_count,
+                'errors': self._errors_count,
+                'latency_avg': sum(latencies) / len(latencies) if latencies else 0,
+                'latency_max': max(latencies, default=0),
+                'reloads_requested': scheduler.requested_count,
+                'reloads_sent': scheduler.sent_count,
+                'reloads_pending': pending_reloads,
+                'reloads_saved': (
+                    scheduler.requested_count - scheduler.sent_count - pending_reloads
+                ),
+            }
+        )
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            timeout = self._reload_scheduler.time_until_due(time.monotonic())
+            try:
+                job = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._flush_reloads()
+                continue
+            if job is None:
+                break
+            jobs = [job]
+            deadline = time.monotonic() + self._coalesce_delay
+            while True:
+                try:
+                    job = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if job is None:
+                    stopping = True
+                    break
+                jobs.append(job)
+            self._process(jobs)
+
+        self._flush_reloads(force=True)
+
+    def _process(self, jobs):
+        # the jobs come from different HTTP requests, the error of one of
+        # them must not drop the others
+        urgent = False
+        waiting = []
+        for job in jobs:
+            self._reload_scheduler.add(job.handlers, job.handlers_contexts)
+            if not job.requests:
+                urgent = urgent or job.urgent
+                waiting.append(job)
+                continue
+            try:
+                # the handlers of a job are sent before its own requests, only
+                # the reloads of jobs without requests are rate limited
+                self._send_due_reloads(force=True)
+                for request_applicator in job.requests:
+                    self._check_for_errors(request_applicator(self._session))
+            except Exception as e:
+                self._done(job, self._failed(e))
+            else:
+                self._done(job)
+
+        error = None
+        try:
+            self._send_due_reloads(force=urgent)
+        except Exception as e:
+            error = self._failed(e)
+        for job in waiting:
+            self._done(job, error)
+
+    def _failed(self, error):
+        logger.exception('Error while sending requests to sysconfd')
+        self._errors_count += 1
+        return error
+
+    def _done(self, job, error=None):
+        self._jobs_count += 1
+        self._latencies.append(time.monotonic() - job.submitted_at)
+        job.done(error)
+
+    def _flush_reloads(self, force=False):
+        try:
+            self._send_due_reloads(force)
+        except Exception:
+            logger.exception('Error while sending reloads to sysconfd')
+            self._errors_count += 1
+
+    def _send_due_reloads(self, force=False):
+        scheduler = self._reload_scheduler
+        handlers, handlers_contexts = scheduler.due(time.monotonic(), force)
+        if not handlers:
+            return
+        url = "{}/exec_request_handlers".format(self.base_url)
+        body = {key: tuple(commands) for key, commands in handlers.items()}
+        if handlers_contexts:
+            body['context'] = handlers_contexts
+        try:
+            self._check_for_errors(self._session.request('POST', url, json=body))
+        except Exception:
+            # the reloads stay pending and are sent again on a next flush
+            scheduler.failed(time.monotonic())
+            raise
+        scheduler.sent(handlers, time.monotonic())
+        self._handlers_count += 1
+
+    def _check_for_errors(self, response):
+        if response.status_code != 200:
+            raise SysconfdError(response.status_code, response.text)
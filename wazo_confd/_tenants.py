@@ -0,0 +1,221 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import logging
+import threading
+import time
+
+from collections import defaultdict
+
+from flask import g
+from xivo.status import Status
+from xivo_dao import tenant_dao
+from xivo_dao.helpers.db_utils import session_scope
+
+from .database import tenant as tenant_db
+
+logger = logging.getLogger(__name__)
+
+
+class TenantTree:
+    """Hierarchy of the wazo-auth tenants, to find the sub-tenants of a tenant
+    without calling wazo-auth on each request.
+
+    The tenants are listed from wazo-auth at most once every `ttl` seconds and
+    kept up to date in between by the `auth_tenant_added` and
+    `auth_tenant_deleted` events. Until the tenants are listed, or for a tenant
+    which is not known yet, `visible_tenant_uuids` returns None and the
+    sub-tenants must be asked to wazo-auth.
+    """
+
+    def __init__(self, auth_client=None, ttl=300):
+        self._auth_client = auth_client
+        self.ttl = ttl
+        self._parents = None
+        self._children = None
+        self._fetched_at = None
+        self._changes = None
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.fetches = 0
+        self.errors = 0
+
+    def configure(self, auth_client, ttl):
+        self._auth_client = auth_client
+        self.ttl = ttl
+        self.invalidate()
+
+    def invalidate(self):
+        with self._lock:
+            self._parents = self._children = self._fetched_at = None
+
+    def visible_tenant_uuids(self, tenant_uuid):
+        """The tenant and all its sub-tenants, or None if the tenant is unknown"""
+        self._refresh()
+        with self._lock:
+            if self._parents is None or tenant_uuid not in self._parents:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            tenant_uuids = [tenant_uuid]
+            for parent_uuid in tenant_uuids:
+                tenant_uuids.extend(self._children.get(parent_uuid, ()))
+            return tenant_uuids
+
+    def add(self, tenant_uuid, parent_uuid):
+        with self._lock:
+            if self._changes is not None:
+                self._changes.append((self.add, tenant_uuid, parent_uuid))
+            if self._parents is None:
+                return
+            if parent_uuid is None or parent_uuid not in self._parents:
+                # the parent will be known on the next listing
+                self._fetched_at = None
+                return
+            self._add(tenant_uuid, parent_uuid)
+
+    def remove(self, tenant_uuid):
+        with self._lock:
+            if self._changes is not None:
+                self._changes.append((self.remove, tenant_uuid))
+            if self._parents is None or tenant_uuid not in self._parents:
+                return
+            parent_uuid = self._parents.pop(tenant_uuid)
+            self._children.get(parent_uuid, set()).discard(tenant_uuid)
+            removed_uuids = [tenant_uuid]
+            for removed_uuid in removed_uuids:
+                for child_uuid in self._children.pop(removed_uuid, ()):
+                    self._parents.pop(child_uuid, None)
+                    removed_uuids.append(child_uuid)
+
+    def provide_status(self, status):
+        with self._lock:
+            loaded = self._parents is not None
+            tenants = len(self._parents) if loaded else 0
+        status['tenant_tree'].update(
+            {
+                'status': Status.ok if loaded else Status.fail,
+                'tenants': tenants,
+                'hits': self.hits,
+                'misses': self.misses,
+                'fetches': self.fetches,
+                'errors': self.errors,
+            }
+        )
+
+    def _add(self, tenant_uuid, parent_uuid):
+        self._parents[tenant_uuid] = parent_uuid
+        # the top tenant is its own parent
+        if parent_uuid not in (None, tenant_uuid):
+            self._children[parent_uuid].add(tenant_uuid)
+
+    def _is_fresh(self):
+        fetched_at = self._fetched_at
+        return fetched_at is not None and time.monotonic() - fetched_at < self.ttl
+
+    def _refresh(self):
+        if self._is_fresh() or not self._auth_client:
+            return
+
+        # the other requests keep using the outdated tenants during the listing
+        if not self._fetch_lock.acquire(blocking=self._parents is None):
+            return
+
+        try:
+            if self._is_fresh():
+                return
+
+            with self._lock:
+                self.fetches += 1
+                # events received during the listing may not be included in it
+                self._changes = []
+            try:
+                tenants = self._auth_client.tenants.list()['items']
+            except Exception as e:
+                logger.warning('Failed to list the tenants from wazo-auth: %s', e)
+                with self._lock:
+                    self.errors += 1
+                    self._changes = None
+                    # retry after the ttl, wazo-auth is asked on each request
+                    # in the meantime if the tenants were never listed
+                    self._fetched_at = time.monotonic()
+                return
+
+            with self._lock:
+                changes, self._changes = self._changes, None
+                self._parents, self._children = {}, defaultdict(set)
+                for tenant in tenants:
+                    self._add(tenant['uuid'], tenant.get('parent_uuid'))
+                self._fetched_at = time.monotonic()
+            for change, *args in changes:
+                change(*args)
+            logger.debug('%s tenants listed from wazo-auth', len(tenants))
+        finally:
+            self._fetch_lock.release()
+
+
+class KnownTenants:
+    """Tenants of the `tenant` table, to create the tenant of a request
+    without a query on each write.
+
+    The tenants are read from the table at startup. The tenants created by a
+    request are known once it is committed, the others once the
+    `auth_tenant_added` event is handled. The tenants are forgotten after
+    `ttl` seconds, wazo-confd-sync-db removing tenants without events.
+    """
+
+    def __init__(self, dao=tenant_dao, ttl=300):
+        self._dao = dao
+        self.ttl = ttl
+        self._uuids = set()
+        self._expires_at = 0
+
+    def configure(self, ttl):
+        self.ttl = ttl
+        self._expires_at = 0
+
+    def load(self):
+        try:
+            with session_scope():
+                tenant_uuids = tenant_db.find_all_uuids()
+        except Exception as e:
+            logger.warning('could not load the tenants: %s', e)
+            return
+        self._current().update(tenant_uuids)
+
+    def ensure(self, tenant_uuid):
+        """Create the tenant if it is not in the table. Call `committed` once
+        the request is committed, or `rolled_back`."""
+        if tenant_uuid in self._current():
+            return
+
+        self._dao.find_or_create_tenant(tenant_uuid)
+        g.setdefault('created_tenant_uuids', set()).add(tenant_uuid)
+
+    def committed(self):
+        tenant_uuids = g.pop('created_tenant_uuids', None)
+        if tenant_uuids:
+            self._current().update(tenant_uuids)
+
+    def rolled_back(self):
+        g.pop('created_tenant_uuids', None)
+
+    def add(self, tenant_uuid):
+        self._current().add(tenant_uuid)
+
+    def discard(self, tenant_uuid):
+        self._current().discard(tenant_uuid)
+
+    def _current(self):
+        now = time.monotonic()
+        if now >= self._expires_at:
+            self._uuids = set()
+            self._expires_at = now + self.ttl
+        return self._uuids
+
+
+tenant_tree = TenantTree()
+known_tenants = KnownTenants()
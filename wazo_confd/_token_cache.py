@@ -0,0 +1,179 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import inspect
+import logging
+import threading
+import time
+
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import request
+from xivo.status import Status
+
+logger = logging.getLogger(__name__)
+
+
+class CachedToken:
+    def __init__(self, session_uuid, expires_at):
+        self.session_uuid = session_uuid
+        self.expires_at = expires_at
+
+
+class TokenCache:
+    """Tokens already accepted by wazo-auth for a resource method.
+
+    `cached(verify_token)` wraps the token verification of the
+    AuthVerifierFlask: a request is not verified again when the same token,
+    with the same `Wazo-Tenant` header, was accepted for the same method and
+    URL arguments, from which the required ACL is built. The decisions are
+    kept at most `ttl` seconds and never after the expiration of the token,
+    read once per token from wazo-auth. At most `size` decisions are kept, the
+    least recently used are removed first.
+
+    The tokens of a session are removed on the `auth_session_deleted` event,
+    sent by wazo-auth when a token is revoked or expires.
+    """
+
+    def __init__(self, auth_client=None, size=1000, ttl=30):
+        self._auth_client = auth_client
+        self.size = size
+        self.ttl = ttl
+        self._decisions = OrderedDict()
+        self._tokens = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, auth_client, size, ttl):
+        self._auth_client = auth_client
+        self.size = size
+        self.ttl = ttl
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._decisions.clear()
+            self._tokens.clear()
+
+    @property
+    def enabled(self):
+        return bool(self._auth_client and self.size and self.ttl)
+
+    def cached(self, verify_token):
+        def decorator(func):
+            verified = verify_token(func)
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                key = self._key(func, kwargs) if self.enabled else None
+                if key is None:
+                    return verified(*args, **kwargs)
+
+                if self._is_accepted(key):
+                    return func(*args, **kwargs)
+
+                # the verifier reads the required ACL from the attributes of
+                # the function, copied by wraps
+                @wraps(func)
+                def accepted(*args, **kwargs):
+                    self._accept(key)
+                    return func(*args, **kwargs)
+
+                return verify_token(accepted)(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def remove_session(self, session_uuid):
+        with self._lock:
+            for cache in (self._decisions, self._tokens):
+                for key in [
+                    key
+                    for key, value in cache.items()
+                    if value.session_uuid == session_uuid
+                ]:
+                    del cache[key]
+
+    def provide_status(self, status):
+        with self._lock:
+            decisions = len(self._decisions)
+        status['token_cache'].update(
+            {
+                'status': Status.ok,
+                'enabled': self.enabled,
+                'size': decisions,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+        )
+
+    def _key(self, func, kwargs):
+        token = request.headers.get('X-Auth-Token')
+        if not token:
+            return None
+        # the methods are decorated again on each request
+        method = inspect.unwrap(func)
+        return (
+            token,
+            request.headers.get('Wazo-Tenant'),
+            request.endpoint,
+            request.method,
+            getattr(method, '__func__', method),
+            tuple(sorted((name, str(value)) for name, value in kwargs.items())),
+        )
+
+    def _is_accepted(self, key):
+        now = time.monotonic()
+        with self._lock:
+            decision = self._decisions.get(key)
+            if decision and now < decision.expires_at:
+                self._decisions.move_to_end(key)
+                self.hits += 1
+                return True
+
+            self._decisions.pop(key, None)
+            self.misses += 1
+            return False
+
+    def _accept(self, key):
+        token = key[0]
+        with self._lock:
+            info = self._tokens.get(token)
+        if info is None:
+            info = self._token_info(token)
+            if info is None:
+                return
+
+        decision = CachedToken(
+            info.session_uuid, min(time.monotonic() + self.ttl, info.expires_at)
+        )
+        with self._lock:
+            _put(self._tokens, token, info, self.size)
+            _put(self._decisions, key, decision, self.size)
+
+    def _token_info(self, token):
+        try:
+            infos = self._auth_client.token.get(token)
+            expires_at = datetime.fromisoformat(infos['utc_expires_at'])
+        except Exception as e:
+            logger.debug('token expiration unknown, decision not kept: %s', e)
+            return None
+
+        if expires_at.tzinfo:
+            expires_at = expires_at.astimezone(timezone.utc).replace(tzinfo=None)
+        remaining = (expires_at - datetime.utcnow()).total_seconds()
+        return CachedToken(infos.get('session_uuid'), time.monotonic() + remaining)
+
+
+def _put(cache, key, value, size):
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > size:
+        cache.popitem(last=False)
+
+
+token_cache = TokenCache()
@@ -1,4 +1,4 @@
-# Copyright 2013-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import argparse
@@ -53,7 +53,32 @@ DEFAULT_CONFIG = {
         'exchange_type': 'headers',
     },
     'provd': {'host': 'localhost', 'port': 8666, 'prefix': None, 'https': False},
-    'sysconfd': {'host': 'localhost', 'port': '8668'},
+    'sysconfd': {
+        'host': 'localhost',
+        'port': '8668',
+        'async_dispatch': True,
+        'coalesce_delay': 0.05,
+        'reload_interval': 2,
+        'wait_timeout': 60,
+        'live_reload_ttl': 10,
+    },
+    'http_pools': {
+        'ari': {'pool_size': 10, 'timeout': 10},
+        'auth': {'pool_size': 10, 'timeout': 10},
+        'provd': {'pool_size': 10, 'timeout': 10},
+        'sysconfd': {'pool_size': 10, 'timeout': 60},
+    },
+    'device_updates': {'max_workers': 4, 'async': False},
+    'device_index': {'ttl': 10},
+    'sound_catalog': {'ttl': 300},
+    'directory_index': {'check_interval': 2},
+    'callerid_numbers': {'ttl': 60},
+    'tenant_tree': {'ttl': 300},
+    'known_tenants': {'ttl': 300},
+    'token_cache': {'size': 1000, 'ttl': 30},
+    'plugin_loading': {'profile': False, 'lazy': False},
+    'metrics': {'enabled': True, 'profile_sample_rate': 0, 'profile_keep': 10},
+    'query_detector': {'enabled': False, 'threshold': 5, 'enforce_budgets': False},
     'enabled_plugins': {
         'access_feature': True,
         'agent': True,
@@ -1,4 +1,4 @@
-# Copyright 2015-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
@@ -10,7 +10,7 @@ from functools import partial
 import xivo_dao
 
 from wazo_auth_client import Client as AuthClient
-from xivo import plugin_helpers
+from wazo_provd_client import Client as ProvdClient
 from xivo.consul_helpers import ServiceCatalogRegistration
 from xivo.status import StatusAggregator, TokenStatus
 from xivo.token_renewer import TokenRenewer
@@ -20,6 +20,12 @@ from wazo_confd.helpers.middleware import MiddleWareHandle
 
 from . import auth
 from ._bus import BusPublisher, BusConsumer
+from ._http_pools import http_pools
+from ._metrics import metrics
+from ._plugins import PluginLoader
+from ._sysconfd import live_reload_state
+from ._tenants import known_tenants, tenant_tree
+from ._token_cache import token_cache
 from .http_server import api, app, HTTPServer
 from .service_discovery import self_check
 
@@ -42,41 +48,78 @@ class Controller:
             config['bus'],
             partial(self_check, config),
         ]
+        http_pools.configure(config['http_pools'])
+        http_pools.subscribe(metrics.record_call)
         self.http_server = HTTPServer(config)
-        auth_client = AuthClient(**config['auth'])
+        auth_client = http_pools.attach('auth', AuthClient(**config['auth']))
+        provd_client = http_pools.attach('provd', ProvdClient(**config['provd']))
         self.token_renewer = TokenRenewer(auth_client)
         if not app.config['auth'].get('master_tenant_uuid'):
             self.token_renewer.subscribe_to_next_token_details_change(
                 auth.init_master_tenant
             )
         pjsip_doc = PJSIPDoc(config['pjsip_config_doc_filename'])
+        self._pjsip_doc = pjsip_doc
         middleware_handle = MiddleWareHandle()
         self.token_renewer.subscribe_to_token_change(
             self.token_status.token_change_callback
         )
+        self.token_renewer.subscribe_to_token_change(provd_client.set_token)
+        service_auth_client = http_pools.attach('auth', AuthClient(**config['auth']))
+        self.token_renewer.subscribe_to_token_change(service_auth_client.set_token)
+        tenant_tree.configure(service_auth_client, config['tenant_tree']['ttl'])
+        known_tenants.configure(config['known_tenants']['ttl'])
+        token_cache.configure(
+            service_auth_client,
+            config['token_cache']['size'],
+            config['token_cache']['ttl'],
+        )
+        self._bus_consumer.subscribe(
+            'auth_session_deleted',
+            lambda event: token_cache.remove_session(event['uuid']),
+        )
         self.status_aggregator.add_provider(auth.provide_status)
         self.status_aggregator.add_provider(self.token_status.provide_status)
         self.status_aggregator.add_provider(self._bus_consumer.provide_status)
+        self.status_aggregator.add_provider(http_pools.provide_status)
+        self.status_aggregator.add_provider(tenant_tree.provide_status)
+        self.status_aggregator.add_provider(token_cache.provide_status)
+        if self.http_server.sysconfd_dispatcher:
+            self.status_aggregator.add_provider(
+                self.http_server.sysconfd_dispatcher.provide_status
+            )
 
-        plugin_helpers.load(
-            namespace='wazo_confd.plugins',
-            names=config['enabled_plugins'],
-            dependencies={
+        self.plugin_loader = PluginLoader(
+            profile=config['plugin_loading']['profile'],
+            lazy=config['plugin_loading']['lazy'],
+        )
+        self.plugin_loader.load(
+            'wazo_confd.plugins',
+            config['enabled_plugins'],
+            {
                 'api': api,
                 'config': config,
                 'token_changed_subscribe': self.token_renewer.subscribe_to_token_change,
                 'bus_consumer': self._bus_consumer,
                 'bus_publisher': self._bus_publisher,
                 'auth_client': auth_client,
+                'http_pools': http_pools,
+                'metrics': metrics,
+                'provd_client': provd_client,
                 'middleware_handle': middleware_handle,
                 'pjsip_doc': pjsip_doc,
                 'status_aggregator': self.status_aggregator,
+                'tenant_tree': tenant_tree,
+                'known_tenants': known_tenants,
             },
         )
 
     def run(self):
         logger.info('wazo-confd starting...')
         xivo_dao.init_db_from_config(self.config)
+        live_reload_state.load()
+        known_tenants.load()
+        self._pjsip_doc.load_in_background()
         signal.signal(signal.SIGTERM, partial(_signal_handler, self))
         signal.signal(signal.SIGINT, partial(_signal_handler, self))
 
@@ -88,6 +131,7 @@ class Controller:
         finally:
             if self._stopping_thread:
                 self._stopping_thread.join()
+            http_pools.close()
 
     def stop(self, reason):
         logger.warning('Stopping wazo-confd: %s', reason)
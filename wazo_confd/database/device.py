@@ -1,9 +1,10 @@
-# Copyright 2016-2020 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2016-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from sqlalchemy.orm import Load
-from sqlalchemy.sql import or_
+from sqlalchemy.sql import and_, or_, tuple_
 
+from xivo_dao.alchemy.feature_extension import FeatureExtension
 from xivo_dao.alchemy.userfeatures import UserFeatures
 from xivo_dao.alchemy.linefeatures import LineFeatures
 from xivo_dao.alchemy.endpoint_sip import EndpointSIP
@@ -15,29 +16,38 @@ from xivo_dao.alchemy.sccpdevice import SCCPDevice
 from xivo_dao.helpers.db_manager import Session
 
 
-def profile_for_device(device_id):
+def profiles_for_devices(device_ids):
+    if not device_ids:
+        return {}
+
     query = (
-        Session.query(UserFeatures.uuid, LineFeatures.context)
+        Session.query(LineFeatures.device, UserFeatures.uuid, LineFeatures.context)
         .join(LineFeatures.user_lines)
         .join(UserLine.main_user_rel)
-        .filter(LineFeatures.device_id == device_id)
+        .filter(LineFeatures.device.in_(device_ids))
         .filter(LineFeatures.num == 1)
     )
 
-    return query.first()
+    profiles = {}
+    for row in query:
+        profiles.setdefault(row.device, row)
+    return profiles
+
 
+def sip_lines_for_devices(device_ids):
+    if not device_ids:
+        return {}
 
-def sip_lines_for_device(device_id):
     query = (
-        Session.query(LineFeatures, EndpointSIP, Extension)
+        Session.query(LineFeatures.device, LineFeatures, EndpointSIP, Extension)
         .join(LineFeatures.endpoint_sip)
         .join(LineFeatures.user_lines)
         .join(UserLine.main_user_rel)
         .join(LineFeatures.line_extensions)
         .join(LineExtension.main_extension_rel)
-        .filter(LineFeatures.device == device_id)
+        .filter(LineFeatures.device.in_(device_ids))
         .options(
-            Load(LineFeatures).load_only("id", "configregistrar"),
+            Load(LineFeatures).load_only("id", "num", "configregistrar"),
             Load(EndpointSIP).load_only(
                 "uuid", "name"
             ),  # TODO(pc-m): add the load_only
@@ -45,7 +55,97 @@ def sip_lines_for_device(device_id):
         )
     )
 
-    return query.all()
+    sip_lines = {}
+    for row in query:
+        sip_lines.setdefault(row.device, []).append(row)
+    return sip_lines
+
+
+def lines_for_devices(device_ids):
+    if not device_ids:
+        return {}
+
+    query = (
+        Session.query(LineFeatures, UserFeatures)
+        .outerjoin(
+            UserLine,
+            and_(
+                UserLine.line_id == LineFeatures.id,
+                UserLine.main_user == True,  # noqa
+            ),
+        )
+        .outerjoin(UserFeatures, UserFeatures.id == UserLine.user_id)
+        .filter(LineFeatures.device.in_(device_ids))
+    )
+
+    lines = {}
+    for line, main_user in query:
+        lines.setdefault(line.device, []).append((line, main_user))
+    return lines
+
+
+def devices_with_lines(device_ids):
+    if not device_ids:
+        return set()
+
+    query = (
+        Session.query(LineFeatures.device)
+        .filter(LineFeatures.device.in_(device_ids))
+        .distinct()
+    )
+    return {device_id for device_id, in query}
+
+
+def devices_for_template(template_id):
+    """Return the (device ID, line tenant) of the lines of the template users"""
+    query = (
+        Session.query(LineFeatures.device, LineFeatures.tenant_uuid)
+        .join(UserLine, UserLine.line_id == LineFeatures.id)
+        .join(UserFeatures, UserFeatures.id == UserLine.user_id)
+        .filter(
+            or_(
+                UserFeatures.func_key_template_id == template_id,
+                UserFeatures.func_key_private_template_id == template_id,
+            )
+        )
+        .filter(LineFeatures.device != None)  # noqa
+        .distinct()
+    )
+    return [(device_id, tenant_uuid) for device_id, tenant_uuid in query if device_id]
+
+
+def feature_extensions():
+    return Session.query(FeatureExtension).all()
+
+
+def main_extens_for_users(user_ids):
+    if not user_ids:
+        return {}
+
+    query = (
+        Session.query(UserLine.user_id, Extension.exten)
+        .join(LineExtension, LineExtension.line_id == UserLine.line_id)
+        .join(Extension, Extension.id == LineExtension.extension_id)
+        .filter(UserLine.user_id.in_(user_ids))
+        .filter(UserLine.main_user == True)  # noqa
+        .filter(LineExtension.main_extension == True)  # noqa
+        .order_by(UserLine.main_line.desc())
+    )
+
+    extens = {}
+    for user_id, exten in query:
+        extens.setdefault(user_id, exten)
+    return extens
+
+
+def extens_for_destinations(destinations):
+    if not destinations:
+        return {}
+
+    query = Session.query(Extension.type, Extension.typeval, Extension.exten).filter(
+        tuple_(Extension.type, Extension.typeval).in_(destinations)
+    )
+    return {(type_, typeval): exten for type_, typeval, exten in query}
 
 
 def associate_sccp_device(line, device):
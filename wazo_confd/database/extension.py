@@ -0,0 +1,10 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from xivo_dao.alchemy.extension import Extension
+from xivo_dao.helpers.db_manager import Session
+
+
+def find_all_extens(context):
+    query = Session.query(Extension.exten).filter(Extension.context == context)
+    return [exten for exten, in query]
@@ -0,0 +1,41 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from sqlalchemy.dialects.postgresql import insert
+
+from xivo_dao.alchemy.phone_number import PhoneNumber
+from xivo_dao.helpers.db_manager import Session
+
+CHUNK_SIZE = 5000
+
+
+def find_existing_numbers(tenant_uuid, numbers):
+    existing = set()
+    for chunk in _chunks(numbers):
+        query = Session.query(PhoneNumber.number).filter(
+            PhoneNumber.tenant_uuid == tenant_uuid,
+            PhoneNumber.number.in_(chunk),
+        )
+        existing.update(number for number, in query)
+    return existing
+
+
+def create_numbers(tenant_uuid, numbers):
+    """Insert the numbers, skipping the conflicting ones. Return the inserted numbers."""
+    created = []
+    for chunk in _chunks(numbers):
+        query = (
+            insert(PhoneNumber.__table__)
+            .values(
+                [{'tenant_uuid': tenant_uuid, 'number': number} for number in chunk]
+            )
+            .on_conflict_do_nothing()
+            .returning(PhoneNumber.number)
+        )
+        created.extend(number for number, in Session.execute(query))
+    return created
+
+
+def _chunks(numbers):
+    for start in range(0, len(numbers), CHUNK_SIZE):
+        yield numbers[start : start + CHUNK_SIZE]
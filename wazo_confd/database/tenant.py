@@ -0,0 +1,9 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from xivo_dao.alchemy.tenant import Tenant
+from xivo_dao.helpers.db_manager import Session
+
+
+def find_all_uuids():
+    return {uuid for uuid, in Session.query(Tenant.uuid)}
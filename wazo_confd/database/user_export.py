@@ -1,4 +1,4 @@
-# Copyright 2015-2021 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 
@@ -186,6 +186,7 @@ def export_query(tenant_uuid, separator=";"):
             grouped_call_permissions, User.id == grouped_call_permissions.c.user_id
         )
         .filter(User.tenant_uuid == tenant_uuid)
+        .order_by(User.uuid.collate('C'))
     )
 
     return COLUMNS, query
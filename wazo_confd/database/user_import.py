@@ -0,0 +1,65 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from sqlalchemy import Integer
+from sqlalchemy.sql import cast, tuple_
+
+from xivo_dao.alchemy.context import Context
+from xivo_dao.alchemy.extension import Extension
+from xivo_dao.alchemy.incall import Incall
+from xivo_dao.alchemy.rightcall import RightCall
+from xivo_dao.alchemy.voicemail import Voicemail
+from xivo_dao.helpers.db_manager import Session
+
+
+def find_contexts(tenant_uuid, names):
+    if not names:
+        return {}
+
+    query = Session.query(Context).filter(
+        Context.tenant_uuid == tenant_uuid, Context.name.in_(names)
+    )
+    return {context.name: context for context in query}
+
+
+def find_call_permissions(tenant_uuid, names):
+    if not names:
+        return {}
+
+    query = Session.query(RightCall).filter(
+        RightCall.tenant_uuid == tenant_uuid, RightCall.name.in_(names)
+    )
+    return {call_permission.name: call_permission for call_permission in query}
+
+
+def find_voicemails(number_contexts):
+    if not number_contexts:
+        return {}
+
+    query = Session.query(Voicemail).filter(
+        tuple_(Voicemail.number, Voicemail.context).in_(number_contexts)
+    )
+    return {(voicemail.number, voicemail.context): voicemail for voicemail in query}
+
+
+def find_extensions(exten_contexts):
+    if not exten_contexts:
+        return {}
+
+    query = Session.query(Extension).filter(
+        tuple_(Extension.exten, Extension.context).in_(exten_contexts)
+    )
+    return {(extension.exten, extension.context): extension for extension in query}
+
+
+def find_incalls(exten_contexts):
+    if not exten_contexts:
+        return {}
+
+    query = (
+        Session.query(Extension.exten, Extension.context, Incall)
+        .join(Incall, cast(Extension.typeval, Integer) == Incall.id)
+        .filter(Extension.type == 'incall')
+        .filter(tuple_(Extension.exten, Extension.context).in_(exten_contexts))
+    )
+    return {(exten, context): incall for exten, context, incall in query}
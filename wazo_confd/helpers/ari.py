@@ -1,4 +1,4 @@
-# Copyright 2017-2019 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2017-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import re
@@ -18,8 +18,15 @@ class AsteriskUnauthorized(HTTPError):
 
 class Client:
     def __init__(
-        self, host='localhost', port=5039, https=False, username=None, password=None
+        self,
+        host='localhost',
+        port=5039,
+        https=False,
+        username=None,
+        password=None,
+        http_pool=None,
     ):
+        self._http_pool = http_pool
         self._host = host
         self._port = port
         self._https = https
@@ -35,7 +42,7 @@ class Client:
     def get_sounds(self):
         url = '{base_url}/sounds'.format(base_url=self._base_url)
         try:
-            response = requests.get(url, params=self._params)
+            response = self._session().get(url, params=self._params)
         except RequestException as e:
             raise AsteriskUnreachable(e)
 
@@ -52,6 +59,11 @@ class Client:
                 results.append(result)
         return results
 
+    def _session(self):
+        if self._http_pool:
+            return self._http_pool.session()
+        return requests
+
     def _remove_non_standard_language(self, sound):
         result = dict(sound)
         result['formats'] = []
@@ -71,7 +83,7 @@ class Client:
             base_url=self._base_url, sound_id=sound_id
         )
         try:
-            response = requests.get(url, params=self._params)
+            response = self._session().get(url, params=self._params)
         except RequestException as e:
             raise AsteriskUnreachable(e)
 
@@ -98,8 +110,9 @@ class Client:
         sound['formats'] = formats_filtered
         return sound
 
-    def get_sounds_languages(self):
-        sounds = self.get_sounds()
+    def get_sounds_languages(self, sounds=None):
+        if sounds is None:
+            sounds = self.get_sounds()
         languages = self._extract_sounds_languages(sounds)
         sound_languages = [{'tag': language} for language in languages]
         sound_languages = self._remove_non_standard_tag(sound_languages)
@@ -1,9 +1,11 @@
-# Copyright 2018-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2018-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-import logging
 import gzip
+import hashlib
 import json
+import logging
+import threading
 
 from flask import request
 
@@ -111,56 +113,91 @@ class PJSIPDocError(APIException):
 
 
 class PJSIPDoc:
+    """Options of each PJSIP section, read from the Asterisk JSON documentation.
+
+    The file is read once, by `load_in_background` or on first use. Only the
+    option names of each section are kept to validate configurations, along
+    with the gzipped JSON document served by the API.
+    """
+
     _internal_fields = set(['type'])
 
+    # NOTE(fblackburn): Some sections are not documented and must be hardcoded
+    _undocumented_sections = {
+        'identify': ('match', 'endpoint', 'srv_lookups', 'match_header'),
+        'registration': (
+            'auth_rejection_permanent',
+            'client_uri',
+            'contact_user',
+            'contact_header_params',
+            'expiration',
+            'max_retries',
+            'outbound_proxy',
+            'retry_interval',
+            'server_uri',
+            'forbidden_retry_interval',
+            'fatal_retry_interval',
+            'line',
+            'server_uri',
+            'transport',
+            'support_path',
+            'support_outbound',
+        ),
+    }
+
     def __init__(self, filename):
         logger.debug('%s initialized with file %s', self.__class__.__name__, filename)
         self._filename = filename
-        self._content = None
+        self._index = None
+        self._lock = threading.Lock()
+
+    def load_in_background(self):
+        thread = threading.Thread(target=self._load_quietly, name='pjsip-doc')
+        thread.daemon = True
+        thread.start()
+        return thread
 
     def get(self):
-        return self.content
+        return json.loads(gzip.decompress(self.compressed()[1]))
+
+    def compressed(self):
+        """Return the ETag and the gzipped JSON of the documentation"""
+        index = self._get_index()
+        return index.etag, index.compressed
 
     def is_valid_in_section(self, section_name, variable):
         if section_name in ('aor', 'endpoint'):
             if variable.startswith('@'):
                 return True
 
-        return variable in self.get_section_variables(section_name)
+        if section_name in self._undocumented_sections:
+            return variable in self._undocumented_sections[section_name]
+        return variable in self._get_index().variable_sets.get(section_name, ())
 
     def get_section_variables(self, section_name):
-        # NOTE(fblackburn): Some sections are not documented and must be hardcoded
-        if section_name == 'identify':
-            return ['match', 'endpoint', 'srv_lookups', 'match_header']
-        if section_name == 'registration':
-            return [
-                'auth_rejection_permanent',
-                'client_uri',
-                'contact_user',
-                'contact_header_params',
-                'expiration',
-                'max_retries',
-                'outbound_proxy',
-                'retry_interval',
-                'server_uri',
-                'forbidden_retry_interval',
-                'fatal_retry_interval',
-                'line',
-                'server_uri',
-                'transport',
-                'support_path',
-                'support_outbound',
-            ]
-        return self.content.get(section_name, {}).keys()
+        if section_name in self._undocumented_sections:
+            return list(self._undocumented_sections[section_name])
+        return self._get_index().variables.get(section_name, ())
+
+    def _get_index(self):
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self._build_index()
+        return self._index
+
+    def _load_quietly(self):
+        try:
+            self._get_index()
+        except PJSIPDocError:
+            pass
 
-    @property
-    def content(self):
-        if self._content is None:
-            self._content = self._fetch()
-            for section_name in self._content.keys():
-                for field in self._internal_fields:
-                    self._content[section_name].pop(field, None)
-        return self._content
+    def _build_index(self):
+        content = self._fetch()
+        for section_name in content.keys():
+            for field in self._internal_fields:
+                content[section_name].pop(field, None)
+        return _PJSIPDocIndex(content)
 
     def _fetch(self):
         try:
@@ -176,6 +213,21 @@ class PJSIPDoc:
             raise PJSIPDocError('failed to read PJSIP JSON documentation')
 
 
+class _PJSIPDocIndex:
+    def __init__(self, content):
+        self.variables = {
+            section_name: tuple(variables)
+            for section_name, variables in content.items()
+        }
+        self.variable_sets = {
+            section_name: frozenset(variables)
+            for section_name, variables in self.variables.items()
+        }
+        body = json.dumps(content).encode()
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.compressed = gzip.compress(body, mtime=0)
+
+
 class PJSIPDocValidator(Validator):
     def __init__(self, field, section, pjsip_doc):
         self.field = field
@@ -1,4 +1,4 @@
-# Copyright 2013-2019 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
@@ -15,6 +15,9 @@ from xivo_dao.helpers.db_manager import Session
 from xivo_dao.helpers.exception import ServiceError, NotFoundError
 from wazo_provd_client.exceptions import ProvdError
 
+from wazo_confd._sysconfd import live_reload_state
+from wazo_confd._tenants import known_tenants
+
 logger = logging.getLogger(__name__)
 
 GENERIC_ERRORS = (ServiceError,)
@@ -70,6 +73,9 @@ def rollback():
     if bus:
         bus.rollback()
 
+    known_tenants.rolled_back()
+    live_reload_state.rolled_back()
+
 
 def decode_and_log_error(error, exc_info=False):
     error_message = str(error)
@@ -0,0 +1,143 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import fnmatch
+import glob
+import os
+import threading
+import time
+
+from collections import namedtuple
+
+from .upload import TEMPORARY_PREFIX
+
+DirectoryEntry = namedtuple('DirectoryEntry', ['name', 'is_dir', 'is_file'])
+
+
+class DirectoryIndex:
+    """In-memory listings of the directories read by the file storages.
+
+    A directory is read with one `os.scandir` and its listing is kept. The
+    listing is used as is for `check_interval` seconds, then kept as long as
+    the modification time of the directory is unchanged. Storages must call
+    `invalidate` after changing a directory.
+
+    `glob` follows the rules of `glob.glob`, using the kept listings. The
+    files being uploaded are not listed.
+    """
+
+    def __init__(self, check_interval=2):
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._listings = {}
+
+    def configure(self, check_interval):
+        self.check_interval = check_interval
+        self.invalidate()
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._listings.clear()
+                return
+
+            path = os.path.normpath(path)
+            prefix = path + os.sep
+            stale = [
+                key for key in self._listings if key == path or key.startswith(prefix)
+            ]
+            stale.append(os.path.dirname(path))
+            for key in stale:
+                self._listings.pop(key, None)
+
+    def scandir(self, path):
+        """Return the entries of the directory, raising OSError like os.scandir"""
+        return self._get_listing(path).entries.values()
+
+    def listdir(self, path):
+        return list(self._get_listing(path).entries)
+
+    def get(self, path):
+        directory, name = os.path.split(os.path.normpath(path))
+        try:
+            listing = self._get_listing(directory)
+        except OSError:
+            return None
+        return listing.entries.get(name)
+
+    def _get_listing(self, path):
+        path = os.path.normpath(path)
+        now = time.monotonic()
+        with self._lock:
+            listing = self._listings.get(path)
+
+        if listing and now - listing.checked_at < self.check_interval:
+            return listing
+
+        mtime = os.stat(path).st_mtime_ns
+        if listing and listing.mtime == mtime:
+            listing.checked_at = now
+            return listing
+
+        listing = _Listing(_scan(path), mtime, now)
+        with self._lock:
+            self._listings[path] = listing
+        return listing
+
+    def exists(self, path):
+        return self.get(path) is not None
+
+    def isdir(self, path):
+        entry = self.get(path)
+        return bool(entry and entry.is_dir)
+
+    def isfile(self, path):
+        entry = self.get(path)
+        return bool(entry and entry.is_file)
+
+    def glob(self, pattern):
+        directory, basename = os.path.split(pattern)
+        if not glob.has_magic(pattern):
+            return [pattern] if self.exists(pattern) else []
+
+        if glob.has_magic(directory):
+            directories = [path for path in self.glob(directory) if self.isdir(path)]
+        else:
+            directories = [directory]
+
+        result = []
+        for directory in directories:
+            if not glob.has_magic(basename):
+                if self.exists(os.path.join(directory, basename)):
+                    result.append(os.path.join(directory, basename))
+                continue
+
+            try:
+                entries = self.scandir(directory)
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name.startswith('.') and not basename.startswith('.'):
+                    continue
+                if fnmatch.fnmatchcase(entry.name, basename):
+                    result.append(os.path.join(directory, entry.name))
+        return result
+
+
+class _Listing:
+    def __init__(self, entries, mtime, checked_at):
+        self.entries = entries
+        self.mtime = mtime
+        self.checked_at = checked_at
+
+
+def _scan(path):
+    with os.scandir(path) as entries:
+        return {
+            entry.name: DirectoryEntry(entry.name, entry.is_dir(), entry.is_file())
+            for entry in entries
+            if not entry.name.startswith(TEMPORARY_PREFIX)
+        }
+
+
+directory_index = DirectoryIndex()
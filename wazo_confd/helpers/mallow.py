@@ -1,12 +1,18 @@
-# Copyright 2016-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2016-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import re
 
-from flask import url_for
+from flask import g, url_for
 from flask_restful import abort
 from marshmallow import EXCLUDE, Schema, fields, pre_load, validate
 from marshmallow.exceptions import ValidationError
+from werkzeug.routing import BuildError
+from werkzeug.urls import url_quote
+
+# Values accepted by the string, int and uuid converters of the routes
+URL_PLACEHOLDERS = ('__link_value__', 987654321987654321)
+URL_SAFE_VALUE = re.compile(r'^[A-Za-z0-9_.~:/-]*$')
 
 
 class BaseSchema(Schema):
@@ -48,6 +54,23 @@ class BaseSchema(Schema):
         unknown = EXCLUDE
 
 
+_dump_schemas = {}
+
+
+def dump_schema(schema_class):
+    """Return a shared instance of `schema_class` to dump resources.
+
+    Building a schema instantiates its fields and, on the first dump, its nested
+    schemas. Schemas are stateless once built, so list endpoints reuse one
+    instance per class instead of paying that cost on every request. Schemas
+    relying on `context` must keep being instantiated per request.
+    """
+    schema = _dump_schemas.get(schema_class)
+    if schema is None:
+        schema = _dump_schemas.setdefault(schema_class, schema_class())
+    return schema
+
+
 class Nested(fields.Nested):
     def _deserialize(self, value, attr, data, partial=None, **kwargs):
         # wazo-confd only support partial on first layer, not through nested fields
@@ -83,9 +106,19 @@ class Link(fields.Field):
     def _serialize(self, value, key, obj):
         value = self.extract_value(obj)
         if value:
+            return {'rel': self.resource, 'href': self.build_url(value)}
+
+    def build_url(self, value):
+        template = find_url_template(self.route, self.target)
+        if template is None:
             options = {self.target: value, '_external': True}
-            url = url_for(self.route, **options)
-            return {'rel': self.resource, 'href': url}
+            return url_for(self.route, **options)
+
+        value = str(value)
+        if not URL_SAFE_VALUE.match(value):
+            value = url_quote(value)
+        prefix, suffix = template
+        return prefix + value + suffix
 
     def extract_value(self, obj):
         if isinstance(obj, dict):
@@ -109,6 +142,33 @@ class ListLink(fields.Field):
         return output
 
 
+def find_url_template(route, target):
+    """Return the parts of the external URL of `route` around its `target` value.
+
+    Templates depend on the host and prefix of the request, they are compiled
+    once per request.
+    """
+    templates = g.setdefault('url_templates', {})
+    key = (route, target)
+    if key not in templates:
+        templates[key] = _compile_url_template(route, target)
+    return templates[key]
+
+
+def _compile_url_template(route, target):
+    for placeholder in URL_PLACEHOLDERS:
+        try:
+            url = url_for(route, **{target: placeholder, '_external': True})
+        except (BuildError, ValueError):
+            continue
+
+        placeholder = str(placeholder)
+        if url.count(placeholder) == 1:
+            prefix, suffix = url.split(placeholder)
+            return prefix, suffix
+    return None
+
+
 class PJSIPSectionOption(fields.List):
     DEFAULT_OPTION_REGEX = r"^[a-zA-Z0-9-_\/\.:,]*$"
 
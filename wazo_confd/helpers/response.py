@@ -0,0 +1,22 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import gzip
+
+from flask import Response, request
+
+
+def compressed_response(compressed, etag, mimetype):
+    """Build a conditional response from a gzipped body.
+
+    The body is sent as is to clients accepting gzip and decompressed for the
+    others.
+    """
+    if 'gzip' in request.accept_encodings:
+        response = Response(compressed, mimetype=mimetype)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(gzip.decompress(compressed), mimetype=mimetype)
+    response.vary.add('Accept-Encoding')
+    response.set_etag(etag, weak=True)
+    return response.make_conditional(request)
@@ -1,4 +1,4 @@
-# Copyright 2015-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from flask import request
@@ -9,10 +9,11 @@ import marshmallow
 from xivo.flask.auth_verifier import AuthVerifierFlask
 from xivo.mallow import fields, validate
 from xivo.tenant_flask_helpers import Tenant, token
-from xivo_dao import tenant_dao
 
+from wazo_confd._tenants import known_tenants, tenant_tree
+from wazo_confd._token_cache import token_cache
 from wazo_confd.helpers.common import handle_api_exception
-from wazo_confd.helpers.mallow import BaseSchema
+from wazo_confd.helpers.mallow import BaseSchema, dump_schema
 
 auth_verifier = AuthVerifierFlask()
 
@@ -34,7 +35,7 @@ class ListSchema(BaseSchema):
 class ConfdResource(ErrorCatchingResource):
     method_decorators = [
         auth_verifier.verify_tenant,
-        auth_verifier.verify_token,
+        token_cache.cached(auth_verifier.verify_token),
     ] + ErrorCatchingResource.method_decorators
 
     def _has_write_tenant_uuid(self):
@@ -67,10 +68,18 @@ class ConfdResource(ErrorCatchingResource):
         if not params.get('recurse', False):
             return [tenant_uuid]
 
-        return [tenant.uuid for tenant in token.visible_tenants(tenant_uuid)]
+        tenant_uuids = tenant_tree.visible_tenant_uuids(tenant_uuid)
+        if tenant_uuids is None:
+            tenant_uuids = [
+                tenant.uuid for tenant in token.visible_tenants(tenant_uuid)
+            ]
+        return tenant_uuids
 
 
 class ListResource(ConfdResource):
+    # Set to False when the schema must be instantiated for each request
+    shared_list_schema = True
+
     def __init__(self, service):
         super().__init__()
         self.service = service
@@ -83,7 +92,13 @@ class ListResource(ConfdResource):
             kwargs['tenant_uuids'] = tenant_uuids
 
         total, items = self.service.search(params, **kwargs)
-        return {'total': total, 'items': self.schema().dump(items, many=True)}
+        return {'total': total, 'items': self.list_schema().dump(items, many=True)}
+
+    def list_schema(self, schema_class=None):
+        schema_class = schema_class or self.schema
+        if self.shared_list_schema and isinstance(schema_class, type):
+            return dump_schema(schema_class)
+        return schema_class()
 
     def search_params(self):
         return ListSchema().load(request.args)
@@ -93,7 +108,7 @@ class ListResource(ConfdResource):
             return form
 
         tenant = Tenant.autodetect()
-        tenant_dao.find_or_create_tenant(tenant.uuid)
+        known_tenants.ensure(tenant.uuid)
         form['tenant_uuid'] = tenant.uuid
         return form
 
@@ -159,7 +174,7 @@ class ItemResource(ConfdResource):
 
 def build_tenant():
     tenant = Tenant.autodetect()
-    tenant_dao.find_or_create_tenant(tenant.uuid)
+    known_tenants.ensure(tenant.uuid)
     return tenant.uuid
 
 
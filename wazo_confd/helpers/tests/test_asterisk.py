@@ -1,4 +1,4 @@
-# Copyright 2020-2021 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2020-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import tempfile
@@ -6,7 +6,8 @@ import unittest
 import gzip
 import json
 
-from hamcrest import assert_that, calling, equal_to, has_properties
+from hamcrest import assert_that, calling, contains_exactly, equal_to, has_properties
+from unittest.mock import patch
 from wazo_test_helpers.hamcrest.raises import raises
 
 from ..asterisk import PJSIPDoc, PJSIPDocError
@@ -86,3 +87,58 @@ class TestPJSIPDoc(unittest.TestCase):
                     )
                 ),
             )
+
+
+class TestPJSIPDocIndex(unittest.TestCase):
+    def setUp(self):
+        self.file = tempfile.NamedTemporaryFile('w+b', suffix='.gz')
+        self.addCleanup(self.file.close)
+        body = {
+            'endpoint': {'100rel': {}, 'allow': {}, 'type': {}},
+            'aor': {'max_contacts': {}},
+        }
+        self.file.write(gzip.compress(json.dumps(body).encode()))
+        self.file.flush()
+        self.doc = PJSIPDoc(self.file.name)
+
+    def test_file_is_read_once(self):
+        with patch('gzip.open', wraps=gzip.open) as gzip_open:
+            self.doc.is_valid_in_section('endpoint', 'allow')
+            self.doc.is_valid_in_section('aor', 'max_contacts')
+            self.doc.compressed()
+
+        gzip_open.assert_called_once()
+
+    def test_is_valid_in_section(self):
+        assert_that(self.doc.is_valid_in_section('endpoint', 'allow'), equal_to(True))
+        assert_that(self.doc.is_valid_in_section('endpoint', 'type'), equal_to(False))
+        assert_that(self.doc.is_valid_in_section('endpoint', '@x'), equal_to(True))
+        assert_that(self.doc.is_valid_in_section('auth', 'allow'), equal_to(False))
+        assert_that(
+            self.doc.get_section_variables('endpoint'),
+            contains_exactly('100rel', 'allow'),
+        )
+
+    def test_undocumented_sections_do_not_read_the_file(self):
+        doc = PJSIPDoc('/no/such/file')
+
+        assert_that(doc.is_valid_in_section('identify', 'match'), equal_to(True))
+
+    def test_compressed_etag_is_stable(self):
+        etag, compressed = self.doc.compressed()
+
+        assert_that(PJSIPDoc(self.file.name).compressed(), equal_to((etag, compressed)))
+        assert_that(
+            json.loads(gzip.decompress(compressed)),
+            equal_to(
+                {'endpoint': {'100rel': {}, 'allow': {}}, 'aor': {'max_contacts': {}}}
+            ),
+        )
+
+    def test_load_in_background(self):
+        self.doc.load_in_background().join()
+
+        with patch('gzip.open') as gzip_open:
+            self.doc.get_section_variables('aor')
+
+        gzip_open.assert_not_called()
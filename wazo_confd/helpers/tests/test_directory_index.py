@@ -0,0 +1,91 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+
+from hamcrest import assert_that, contains_inanyorder, equal_to
+from unittest.mock import patch
+
+from ..directory_index import DirectoryIndex
+
+FILES = [
+    'foo.wav',
+    'foo',
+    '.hidden.wav',
+    'bar.tar.gz',
+    'fr_FR/foo.wav',
+    'fr_FR/baz.slin',
+    '.hidden/foo.wav',
+    'foo.dir/foo.wav',
+]
+
+
+class TestDirectoryIndex(unittest.TestCase):
+    def setUp(self):
+        self.base_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.base_path)
+        for filename in FILES:
+            self._create(filename)
+        self.index = DirectoryIndex(check_interval=10)
+
+    def _create(self, filename):
+        path = os.path.join(self.base_path, filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, 'w').close()
+
+    def test_glob_matches_glob_module(self):
+        for pattern in ('*', '*/*', 'foo.*', '*/foo.wav', 'fr_FR/*', '.*', 'foo'):
+            pattern = os.path.join(self.base_path, pattern)
+
+            assert_that(
+                self.index.glob(pattern), contains_inanyorder(*glob.glob(pattern))
+            )
+
+    def test_isfile(self):
+        assert_that(self.index.isfile(self._path('foo.wav')), equal_to(True))
+        assert_that(self.index.isfile(self._path('fr_FR')), equal_to(False))
+        assert_that(self.index.isfile(self._path('missing/foo')), equal_to(False))
+
+    def test_directory_is_scanned_once_during_check_interval(self):
+        self.index.listdir(self.base_path)
+        self._create('new.wav')
+
+        with patch('os.scandir') as scandir:
+            names = self.index.listdir(self.base_path)
+
+        scandir.assert_not_called()
+        assert_that('new.wav' in names, equal_to(False))
+
+    def test_directory_is_scanned_again_when_modified(self):
+        self.index.check_interval = 0
+        self.index.listdir(self.base_path)
+        self._create('new.wav')
+        os.utime(self.base_path, ns=(0, 0))
+
+        names = self.index.listdir(self.base_path)
+
+        assert_that('new.wav' in names, equal_to(True))
+
+    def test_invalidate_drops_the_directory_and_its_parent(self):
+        self.index.listdir(self.base_path)
+        self.index.listdir(self._path('fr_FR'))
+        self._create('fr_FR/new.wav')
+
+        self.index.invalidate(self._path('fr_FR/new.wav'))
+
+        assert_that(self.index.isfile(self._path('fr_FR/new.wav')), equal_to(True))
+
+    def test_files_being_uploaded_are_not_listed(self):
+        self._create('.upload-0123abcd')
+
+        names = self.index.listdir(self.base_path)
+
+        assert_that('.upload-0123abcd' in names, equal_to(False))
+        assert_that(self.index.exists(self._path('.upload-0123abcd')), equal_to(False))
+
+    def _path(self, filename):
+        return os.path.join(self.base_path, filename)
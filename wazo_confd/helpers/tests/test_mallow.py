@@ -1,11 +1,19 @@
-# Copyright 2016-2019 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2016-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import unittest
 
-from hamcrest import assert_that, calling, equal_to, raises
-from marshmallow import ValidationError
-from wazo_confd.helpers.mallow import StrictBoolean, AsteriskSection
+from flask import Flask, url_for
+from hamcrest import assert_that, calling, equal_to, not_, raises, same_instance
+from marshmallow import ValidationError, fields
+from unittest.mock import patch
+from wazo_confd.helpers.mallow import (
+    AsteriskSection,
+    BaseSchema,
+    Link,
+    StrictBoolean,
+    dump_schema,
+)
 
 
 class TestStrictBolean(unittest.TestCase):
@@ -43,3 +51,61 @@ class TestAsteriskSection(unittest.TestCase):
             assert_that(
                 calling(self.validator).with_args(value), raises(ValidationError)
             )
+
+
+class TestLink(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.add_url_rule('/users/<uuid:uuid>', 'users', lambda uuid: '')
+        self.app.add_url_rule('/lines/<int:id>', 'lines', lambda id: '')
+        self.app.add_url_rule('/devices/<id>', 'devices', lambda id: '')
+        self.app.add_url_rule(
+            '/lines/<int:line_id>/extensions', 'line_extensions', lambda line_id: ''
+        )
+
+    def test_href_is_the_same_as_url_for(self):
+        cases = [
+            (
+                Link('users', field='uuid'),
+                {'uuid': '8b0e4db8-2a53-4a9a-a7b3-4bf1a7a6e7d2'},
+            ),
+            (Link('lines'), {'id': 42}),
+            (Link('devices'), {'id': 'a b/c?d%'}),
+            (Link('line_extensions', field='id', target='line_id'), {'id': 42}),
+        ]
+
+        with self.app.test_request_context(base_url='https://example.com/api/confd'):
+            for link, obj in cases:
+                expected = url_for(
+                    link.route, _external=True, **{link.target: obj[link.field]}
+                )
+                result = link.serialize('links', obj)
+                assert_that(result, equal_to({'rel': link.resource, 'href': expected}))
+
+    def test_url_is_built_once_per_route(self):
+        link = Link('devices')
+
+        with self.app.test_request_context():
+            with patch('wazo_confd.helpers.mallow.url_for', wraps=url_for) as url_for_:
+                hrefs = [link.serialize('links', {'id': id_})['href'] for id_ in 'ab']
+
+        assert_that(url_for_.call_count, equal_to(1))
+        assert_that(
+            hrefs,
+            equal_to(['http://localhost/devices/a', 'http://localhost/devices/b']),
+        )
+
+
+class TestDumpSchema(unittest.TestCase):
+    def test_one_instance_per_schema_class(self):
+        class ASchema(BaseSchema):
+            id = fields.Integer()
+
+        class BSchema(BaseSchema):
+            id = fields.Integer()
+
+        schema = dump_schema(ASchema)
+
+        assert_that(dump_schema(ASchema), same_instance(schema))
+        assert_that(dump_schema(BSchema), not_(same_instance(schema)))
+        assert_that(schema.dump([{'id': 1}], many=True), equal_to([{'id': 1}]))
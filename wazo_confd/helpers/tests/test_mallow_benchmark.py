@@ -0,0 +1,165 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import importlib
+import os
+import pkgutil
+import time
+import unittest
+import uuid
+
+from flask import Flask
+from hamcrest import assert_that, equal_to
+from marshmallow import fields
+from xivo_dao.alchemy.endpoint_sip import EndpointSIP
+from xivo_dao.alchemy.extension import Extension
+from xivo_dao.alchemy.linefeatures import LineFeatures as Line
+from xivo_dao.alchemy.userfeatures import UserFeatures as User
+
+from wazo_confd import plugins
+
+from ..mallow import Link, ListLink, dump_schema
+
+BENCHMARK_ITEMS = int(os.environ.get('SCHEMA_DUMP_BENCHMARK_ITEMS') or 0)
+REPEAT = 50
+TENANT_UUID = '00000000-0000-4000-8000-000000000001'
+
+
+@unittest.skipUnless(BENCHMARK_ITEMS, 'SCHEMA_DUMP_BENCHMARK_ITEMS is not set')
+class TestDumpSchemaBenchmark(unittest.TestCase):
+    """Time the dump of a page of items with a new schema and a shared one"""
+
+    @classmethod
+    def setUpClass(cls):
+        # the nested schemas are found by name once their module is imported
+        for module in pkgutil.walk_packages(plugins.__path__, plugins.__name__ + '.'):
+            if module.name.endswith('.schema'):
+                importlib.import_module(module.name)
+
+        from wazo_confd.plugins.endpoint_sip.schema import EndpointSIPSchema
+        from wazo_confd.plugins.extension.schema import ExtensionSchema
+        from wazo_confd.plugins.line.schema import LineListSchema
+        from wazo_confd.plugins.user.schema import UserSchema
+
+        cls.app = Flask(__name__)
+        cls.schemas = {
+            'users': (UserSchema, build_users),
+            'lines': (LineListSchema, build_lines),
+            'endpoints/sip': (EndpointSIPSchema, build_sips),
+            'extensions': (ExtensionSchema, build_extensions),
+        }
+        for schema_class, _ in cls.schemas.values():
+            add_link_routes(cls.app, schema_class(), set())
+
+    def test_dump_page(self):
+        for name, (schema_class, build_items) in self.schemas.items():
+            items = build_items(BENCHMARK_ITEMS)
+
+            new_elapsed, new_dump = self._dump(lambda: schema_class(), items)
+            shared_elapsed, shared_dump = self._dump(
+                lambda: dump_schema(schema_class), items
+            )
+
+            assert_that(shared_dump, equal_to(new_dump))
+            print(
+                '{}: {} items dumped in {:.2f}ms with a new schema, '
+                '{:.2f}ms with the shared schema'.format(
+                    name,
+                    len(items),
+                    new_elapsed * 1000 / REPEAT,
+                    shared_elapsed * 1000 / REPEAT,
+                )
+            )
+
+    def _dump(self, get_schema, items):
+        elapsed = 0
+        for _ in range(REPEAT):
+            # the URL templates of the links are compiled once per request
+            with self.app.test_request_context():
+                start = time.perf_counter()
+                result = get_schema().dump(items, many=True)
+                elapsed += time.perf_counter() - start
+        return elapsed, result
+
+
+def add_link_routes(app, schema, seen):
+    if type(schema) in seen:
+        return
+    seen.add(type(schema))
+
+    for field in schema.fields.values():
+        if isinstance(field, fields.List):
+            field = field.inner
+        if isinstance(field, Link):
+            _add_route(app, field)
+        elif isinstance(field, ListLink):
+            for link in field.links:
+                _add_route(app, link)
+        elif isinstance(field, fields.Nested):
+            add_link_routes(app, field.schema, seen)
+
+
+def _add_route(app, link):
+    rule = '/1.1/{}/<{}>'.format(link.route.replace('_', '-'), link.target)
+    if not any(existing.rule == rule for existing in app.url_map.iter_rules()):
+        app.add_url_rule(rule, endpoint=link.route, view_func=_view)
+
+
+def _view(**kwargs):
+    return ''
+
+
+def build_sips(count):
+    return [
+        EndpointSIP(
+            uuid=str(uuid.uuid4()),
+            label='line {}'.format(number),
+            name='line{}'.format(number),
+            template=False,
+            tenant_uuid=TENANT_UUID,
+        )
+        for number in range(count)
+    ]
+
+
+def build_lines(count):
+    return [
+        Line(
+            id=number,
+            name='line{}'.format(number),
+            context='default',
+            provisioningid=100000 + number,
+            num=1,
+            tenant_uuid=TENANT_UUID,
+            endpoint_sip=sip,
+        )
+        for number, sip in enumerate(build_sips(count))
+    ]
+
+
+def build_extensions(count):
+    return [
+        Extension(
+            id=number,
+            exten=str(1000 + number),
+            context='default',
+            type='user',
+            typeval='0',
+            tenant_uuid=TENANT_UUID,
+        )
+        for number in range(count)
+    ]
+
+
+def build_users(count):
+    return [
+        User(
+            id=number,
+            uuid=str(uuid.uuid4()),
+            firstname='User',
+            lastname=str(number),
+            email='user{}@example.com'.format(number),
+            tenant_uuid=TENANT_UUID,
+        )
+        for number in range(count)
+    ]
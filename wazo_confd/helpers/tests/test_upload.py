@@ -0,0 +1,69 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from flask import Flask
+from hamcrest import assert_that, calling, equal_to, raises
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from ..upload import CHUNK_SIZE, save_file, upload_stream
+
+
+class TestSaveFile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'file.wav')
+
+    def test_bytes(self):
+        size = save_file(self.path, b'content')
+
+        assert_that(size, equal_to(7))
+        assert_that(self._read(), equal_to(b'content'))
+
+    def test_stream_is_read_by_chunks(self):
+        content = b'x' * (CHUNK_SIZE * 2 + 1)
+
+        save_file(self.path, io.BytesIO(content))
+
+        assert_that(self._read(), equal_to(content))
+        assert_that(os.listdir(self.directory), equal_to(['file.wav']))
+
+    def test_invalid_content_keeps_the_previous_file(self):
+        save_file(self.path, b'previous')
+
+        def validate(fobj):
+            assert_that(fobj.read(), equal_to(b'invalid'))
+            raise ValueError()
+
+        assert_that(
+            calling(save_file).with_args(self.path, b'invalid', validate),
+            raises(ValueError),
+        )
+        assert_that(self._read(), equal_to(b'previous'))
+        assert_that(os.listdir(self.directory), equal_to(['file.wav']))
+
+    def _read(self):
+        with open(self.path, 'rb') as fobj:
+            return fobj.read()
+
+
+class TestUploadStream(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['MAX_CONTENT_LENGTH'] = 4
+
+    def test_stream_is_not_read(self):
+        with self.app.test_request_context(method='PUT', data=b'1234'):
+            stream = upload_stream()
+
+            assert_that(stream.read(), equal_to(b'1234'))
+
+    def test_body_too_large(self):
+        with self.app.test_request_context(method='PUT', data=b'12345'):
+            assert_that(calling(upload_stream), raises(RequestEntityTooLarge))
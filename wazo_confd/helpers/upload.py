@@ -0,0 +1,55 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import uuid
+
+from flask import current_app, request
+from werkzeug.exceptions import RequestEntityTooLarge
+
+CHUNK_SIZE = 64 * 1024
+TEMPORARY_PREFIX = '.upload-'
+
+
+def upload_stream():
+    """Return the request body as a stream, without reading it in memory"""
+    max_length = current_app.config.get('MAX_CONTENT_LENGTH')
+    if max_length is not None and (request.content_length or 0) > max_length:
+        raise RequestEntityTooLarge()
+    return request.stream
+
+
+def save_file(path, content, validate=None, mode=0o660):
+    """Write `content` to `path`, replacing the file only once fully written.
+
+    `content` is either bytes or a file-like object read by chunks. The data
+    is written to a hidden file of the same directory, given opened for
+    reading to `validate`, then renamed over `path`. The hidden file is
+    removed if anything fails and is not listed by the directory index.
+    """
+    directory = os.path.dirname(path)
+    tmp_path = os.path.join(directory, TEMPORARY_PREFIX + uuid.uuid4().hex)
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode)
+    try:
+        with os.fdopen(fd, 'wb') as fobj:
+            size = _write(fobj, content)
+        if validate:
+            with open(tmp_path, 'rb') as fobj:
+                validate(fobj)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return size
+
+
+def _write(fobj, content):
+    if isinstance(content, bytes):
+        return fobj.write(content)
+
+    size = 0
+    while True:
+        chunk = content.read(CHUNK_SIZE)
+        if not chunk:
+            return size
+        size += fobj.write(chunk)
@@ -1,11 +1,11 @@
-# Copyright 2016-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2016-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import os
 import logging
 
 from xivo import wsgi
-from flask import Flask, g
+from flask import Flask, g, request
 from flask_cors import CORS
 from flask_restful import Api
 from sqlalchemy.exc import SQLAlchemyError
@@ -19,7 +19,10 @@ from xivo_dao.helpers.db_utils import session_scope
 from xivo_dao.resources.infos import dao as info_dao
 
 from ._bus import BusPublisher
-from ._sysconfd import SysconfdPublisher
+from ._metrics import metrics
+from ._query_detector import query_detector
+from ._sysconfd import SysconfdDispatcher, SysconfdPublisher, live_reload_state
+from ._tenants import known_tenants
 from .helpers.converter import FilenameConverter
 
 logger = logging.getLogger(__name__)
@@ -48,6 +51,8 @@ def log_requests():
 
 def after_request(response):
     commit_database()
+    known_tenants.committed()
+    live_reload_state.committed()
     flush_sysconfd()
     flush_bus()
     return http_helpers.log_request(response)
@@ -65,14 +70,28 @@ def commit_database():
 
 def flush_sysconfd():
     publisher = g.get('sysconfd_publisher')
-    if publisher:
+    if not publisher:
+        return
+
+    dispatcher = app.extensions.get('sysconfd_dispatcher')
+    if not dispatcher:
         publisher.flush()
+        return
+
+    wait = is_wait_requested()
+    job = publisher.dispatch(dispatcher, urgent=wait)
+    if wait:
+        dispatcher.wait(job, timeout=app.config['sysconfd']['wait_timeout'])
+
+
+def is_wait_requested():
+    return request.args.get('wait', default=False, type=lambda v: v.lower() == 'true')
 
 
 def flush_bus():
     publisher = g.get('bus_publisher')
     if publisher:
-        publisher.flush()
+        metrics.record_bus_events(publisher.flush())
 
 
 def load_uuid():
@@ -85,6 +104,10 @@ class HTTPServer:
         self.config = global_config['rest_api']
         http_helpers.add_logger(app, logger)
 
+        metrics.configure(**global_config['metrics'])
+        metrics.init_app(app)
+        query_detector.configure(**global_config['query_detector'])
+        query_detector.init_app(app)
         app.before_first_request(load_uuid)
         app.before_request(log_requests)
         app.after_request(after_request)
@@ -95,6 +118,11 @@ class HTTPServer:
         app.config.update(global_config)
         app.config['MAX_CONTENT_LENGTH'] = 40 * 1024 * 1024
 
+        self.sysconfd_dispatcher = None
+        if global_config['sysconfd']['async_dispatch']:
+            self.sysconfd_dispatcher = SysconfdDispatcher.from_config(global_config)
+            app.extensions['sysconfd_dispatcher'] = self.sysconfd_dispatcher
+
         self._load_cors()
         self.server = None
 
@@ -134,8 +162,12 @@ class HTTPServer:
         for route in http_helpers.list_routes(app):
             logger.debug(route)
 
+        if self.sysconfd_dispatcher:
+            self.sysconfd_dispatcher.start()
         self.server.start()
 
     def stop(self):
         if self.server:
             self.server.stop()
+        if self.sysconfd_dispatcher:
+            self.sysconfd_dispatcher.stop()
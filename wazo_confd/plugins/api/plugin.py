@@ -1,11 +1,16 @@
-# Copyright 2016-2019 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2016-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from .resource import SwaggerResource
+from .spec import APISpec
 
 
 class Plugin:
     def load(self, dependencies):
         api = dependencies['api']
 
-        api.add_resource(SwaggerResource, '/api/api.yml')
+        api.add_resource(
+            SwaggerResource,
+            '/api/api.yml',
+            resource_class_args=(APISpec(),),
+        )
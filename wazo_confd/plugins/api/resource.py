@@ -1,30 +1,23 @@
-# Copyright 2016-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2016-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
-import yaml
 
-from flask import make_response
 from flask_restful import Resource
-from xivo.chain_map import ChainMap
-from xivo.rest_api_helpers import load_all_api_specs
-from xivo.http_helpers import reverse_proxy_fix_api_spec
+
+from wazo_confd.helpers.response import compressed_response
 
 logger = logging.getLogger(__name__)
 
 
 class SwaggerResource(Resource):
-    api_filename = "api.yml"
+    def __init__(self, api_spec):
+        self._api_spec = api_spec
 
     def get(self):
-        api_spec = ChainMap(
-            *load_all_api_specs('wazo_confd.plugins', self.api_filename)
-        )
-
-        if not api_spec.get('info'):
+        rendering = self._api_spec.render()
+        if rendering is None:
             return {'error': "API spec does not exist"}, 404
 
-        reverse_proxy_fix_api_spec(api_spec)
-        return make_response(
-            yaml.dump(dict(api_spec)), 200, {'Content-Type': 'application/x-yaml'}
-        )
+        etag, compressed = rendering
+        return compressed_response(compressed, etag, 'application/x-yaml')
@@ -0,0 +1,71 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import copy
+import gzip
+import hashlib
+import logging
+import threading
+
+import yaml
+
+from flask import request
+from xivo.chain_map import ChainMap
+from xivo.http_helpers import reverse_proxy_fix_api_spec
+from xivo.rest_api_helpers import load_all_api_specs
+
+logger = logging.getLogger(__name__)
+
+
+class APISpec:
+    """The merged API specification of the plugins.
+
+    The plugin specifications are loaded and merged on first use only. The
+    YAML rendering is kept gzipped for each value of the X-Script-Name header,
+    which is the only part of the request changing the document.
+    """
+
+    max_renderings = 16
+
+    def __init__(self, package='wazo_confd.plugins', filename='api.yml'):
+        self._package = package
+        self._filename = filename
+        self._spec = None
+        self._renderings = {}
+        self._lock = threading.Lock()
+
+    def render(self):
+        """Return the ETag and the gzipped YAML of the specification, or None"""
+        spec = self._get_spec()
+        if not spec.get('info'):
+            return None
+
+        script_name = request.headers.get('X-Script-Name', '')
+        rendering = self._renderings.get(script_name)
+        if rendering is None:
+            rendering = self._render(spec)
+            with self._lock:
+                if len(self._renderings) >= self.max_renderings:
+                    self._renderings.clear()
+                self._renderings[script_name] = rendering
+        return rendering
+
+    def _get_spec(self):
+        if self._spec is None:
+            with self._lock:
+                if self._spec is None:
+                    logger.debug(
+                        'loading %s files of %s', self._filename, self._package
+                    )
+                    self._spec = dict(
+                        ChainMap(*load_all_api_specs(self._package, self._filename))
+                    )
+        return self._spec
+
+    def _render(self, spec):
+        api_spec = dict(spec)
+        if 'servers' in api_spec:
+            api_spec['servers'] = copy.deepcopy(api_spec['servers'])
+        reverse_proxy_fix_api_spec(api_spec)
+        body = yaml.dump(api_spec).encode()
+        return hashlib.sha1(body).hexdigest(), gzip.compress(body, mtime=0)
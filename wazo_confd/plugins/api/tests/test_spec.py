@@ -0,0 +1,74 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import gzip
+import unittest
+
+import yaml
+
+from flask import Flask, request
+from hamcrest import assert_that, equal_to, is_not, none
+from unittest.mock import patch
+
+from ..spec import APISpec
+
+SPECS = [
+    {'info': {'title': 'wazo-confd'}, 'basePath': '/1.1'},
+    {'paths': {'/users': {}}},
+]
+
+
+def fix_api_spec(api_spec):
+    script_name = request.headers.get('X-Script-Name')
+    if script_name:
+        api_spec['basePath'] = script_name + api_spec['basePath']
+
+
+@patch('wazo_confd.plugins.api.spec.reverse_proxy_fix_api_spec', fix_api_spec)
+@patch('wazo_confd.plugins.api.spec.load_all_api_specs')
+class TestAPISpec(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.api_spec = APISpec()
+
+    def test_specs_are_loaded_once(self, load_all_api_specs):
+        load_all_api_specs.return_value = SPECS
+
+        with self.app.test_request_context():
+            etag, compressed = self.api_spec.render()
+        with self.app.test_request_context(headers={'X-Script-Name': '/api/confd'}):
+            self.api_spec.render()
+
+        load_all_api_specs.assert_called_once_with('wazo_confd.plugins', 'api.yml')
+        assert_that(
+            yaml.safe_load(gzip.decompress(compressed)),
+            equal_to({**SPECS[0], **SPECS[1]}),
+        )
+
+    def test_reverse_proxy_prefix(self, load_all_api_specs):
+        load_all_api_specs.return_value = SPECS
+
+        with self.app.test_request_context(headers={'X-Script-Name': '/api/confd'}):
+            etag, compressed = self.api_spec.render()
+        with self.app.test_request_context():
+            other_etag, _ = self.api_spec.render()
+
+        spec = yaml.safe_load(gzip.decompress(compressed))
+        assert_that(spec['basePath'], equal_to('/api/confd/1.1'))
+        assert_that(etag, is_not(equal_to(other_etag)))
+
+    def test_renderings_are_bounded(self, load_all_api_specs):
+        load_all_api_specs.return_value = SPECS
+        self.api_spec.max_renderings = 2
+
+        for script_name in ('/a', '/b', '/c'):
+            with self.app.test_request_context(headers={'X-Script-Name': script_name}):
+                self.api_spec.render()
+
+        assert_that(len(self.api_spec._renderings), equal_to(1))
+
+    def test_no_info(self, load_all_api_specs):
+        load_all_api_specs.return_value = [{'paths': {}}]
+
+        with self.app.test_request_context():
+            assert_that(self.api_spec.render(), none())
@@ -1,6 +1,10 @@
-# Copyright 2016-2019 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2016-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+from wazo_bus.resources.configuration.event import LiveReloadEditedEvent
+
+from wazo_confd._sysconfd import live_reload_state
+
 from .resource import LiveReloadResource
 from .service import build_service
 
@@ -8,8 +12,15 @@ from .service import build_service
 class Plugin:
     def load(self, dependencies):
         api = dependencies['api']
+        bus_consumer = dependencies['bus_consumer']
+        config = dependencies['config']
         service = build_service()
 
+        live_reload_state.configure(config['sysconfd']['live_reload_ttl'])
+        bus_consumer.subscribe(
+            LiveReloadEditedEvent.name, lambda event: live_reload_state.invalidate()
+        )
+
         api.add_resource(
             LiveReloadResource,
             '/configuration/live_reload',
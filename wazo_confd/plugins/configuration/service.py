@@ -1,23 +1,26 @@
-# Copyright 2016-2019 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2016-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from xivo_dao.resources.configuration import dao as configuration_dao
 
+from wazo_confd._sysconfd import live_reload_state
 from wazo_confd.plugins.configuration.notifier import build_notifier
 
 
 class LiveReloadService:
-    def __init__(self, dao, notifier):
+    def __init__(self, dao, notifier, state):
         self.dao = dao
         self.notifier = notifier
+        self.state = state
 
     def get(self):
         return {'enabled': self.dao.is_live_reload_enabled()}
 
     def edit(self, live_reload):
         self.dao.set_live_reload_status(live_reload)
+        self.state.edited(live_reload['enabled'])
         self.notifier.edited(live_reload)
 
 
 def build_service():
-    return LiveReloadService(configuration_dao, build_notifier())
+    return LiveReloadService(configuration_dao, build_notifier(), live_reload_state)
@@ -1,55 +1,61 @@
-# Copyright 2023-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2023-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
 import logging
 from operator import itemgetter
-from typing import Iterator, Literal
+from typing import Iterable, Literal
 
 from xivo_dao.resources.context import dao as context_dao
-from xivo_dao.resources.extension import dao as extension_dao
 from xivo_dao.alchemy.context import Context, ContextNumbers
 
+from wazo_confd.database import extension as extension_db
+
 logger = logging.getLogger(__name__)
 
 RangeType = Literal['user', 'group', 'queue', 'conference', 'incall']
 Availability = Literal['available']
+Interval = tuple[int, int]
 
 
 class RangeFilter:
-    def __init__(
-        self, context, extension_dao, availability=None, search=None, **kwargs
-    ):
+    def __init__(self, context, extension_db, availability=None, search=None, **kwargs):
         self._context: Context = context
-        self._extension_dao = extension_dao
+        self._extension_db = extension_db
         self._availability: Availability | None = availability
         self._search = search
-        self._used_extensions: set[str] = set()
+        self._used_numbers: dict[int, list[int]] = {}
 
         if self._availability == 'available':
-            configured_extens = self._extension_dao.find_all_by(context=context.name)
-            self._used_extensions = set(e.exten for e in configured_extens)
+            configured_extens = self._extension_db.find_all_extens(context.name)
+            self._used_numbers = self._group_numbers_by_length(configured_extens)
 
     def get_ranges(self, range_type: RangeType):
         ranges = self._extract_ranges(self._context, range_type)
-        unfiltered_extens = self._list_exten_from_ranges(ranges)
-        filtered_extens = (
-            exten for exten in unfiltered_extens if self._include_exten(exten)
-        )
-        filtered_ranges = list(self._ranges_from_extens(filtered_extens))
+        filtered_ranges = []
+        for length, intervals in self._merge_ranges(ranges).items():
+            if self._availability == 'available':
+                used_numbers = self._used_numbers.get(length, [])
+                intervals = self._subtract_numbers(intervals, used_numbers)
+            if self._search:
+                filtered_ranges.extend(self._search_intervals(intervals, length))
+            else:
+                filtered_ranges.extend(self._format_intervals(intervals, length))
         count = len(filtered_ranges)
         return filtered_ranges, count
 
-    def _include_exten(self, exten: str):
-        if self._availability == 'available':
-            if exten in self._used_extensions:
-                return False
-        if self._search:
-            if self._search not in exten:
-                return False
-        return True
+    def _search_intervals(self, intervals: list[Interval], length: int):
+        if not self._search.isdigit():
+            return []
+        extens = (
+            exten
+            for exten in self._list_exten_from_intervals(intervals, length)
+            if self._search in exten
+        )
+        return self._ranges_from_extens(extens)
 
     def _extract_ranges(self, context: Context, range_type: RangeType):
         if range_type == 'user':
@@ -65,49 +71,71 @@ class RangeFilter:
         else:
             assert False, f'{range_type} is not supported'
 
+    @staticmethod
+    def _range_length(range: ContextNumbers) -> int:
+        return range.did_length if range.type == 'incall' else len(range.start)
+
     @classmethod
-    def _list_exten_from_ranges(cls, ranges: list[ContextNumbers]):
-        visited_ranges: set[tuple[int, int, int]] = set()
-        for r in cls._sort_ranges(ranges):
-            start = r.start
-            end = r.end
-            length = r.did_length if r.type == 'incall' else len(start)
-            exten_start = int(start[-length:])
-            exten_end = int(end[-length:])
-            assert exten_start <= exten_end
-
-            logger.debug(
-                'Generating range for extensions %d-%d of length %d',
-                exten_start,
-                exten_end,
-                length,
-            )
-            for exten in range(exten_start, exten_end + 1):
-                if any(
-                    visited_start <= exten <= visited_end
-                    for visited_start, visited_end, visited_length in visited_ranges
-                    if length == visited_length
-                ):
-                    # exten already covered by previously visited range of same length
-                    continue
-                formatted_exten = str(exten).rjust(length, '0')
-                yield formatted_exten
-
-            visited_ranges.add((exten_start, exten_end, length))
+    def _merge_ranges(cls, ranges: list[ContextNumbers]) -> dict[int, list[Interval]]:
+        intervals_by_len = defaultdict(list)
+        for range in ranges:
+            length = cls._range_length(range)
+            start = int(range.start[-length:])
+            end = int(range.end[-length:])
+            assert start <= end
+            intervals_by_len[length].append((start, end))
+
+        merged_by_len = {}
+        for length in sorted(intervals_by_len.keys()):
+            merged: list[Interval] = []
+            for start, end in sorted(intervals_by_len[length]):
+                if merged and start <= merged[-1][1] + 1:
+                    if end > merged[-1][1]:
+                        merged[-1] = (merged[-1][0], end)
+                else:
+                    merged.append((start, end))
+            merged_by_len[length] = merged
+        return merged_by_len
 
     @staticmethod
-    def _sort_ranges(ranges: list[ContextNumbers]) -> Iterator[ContextNumbers]:
-        ranges_by_len = defaultdict(list)
-        for range in ranges:
-            rlen = range.did_length if range.type == 'incall' else len(range.start)
-            ranges_by_len[rlen].append(range)
+    def _group_numbers_by_length(extens: Iterable[str]) -> dict[int, list[int]]:
+        numbers_by_len = defaultdict(set)
+        for exten in extens:
+            if exten and exten.isdigit():
+                numbers_by_len[len(exten)].add(int(exten))
+        return {length: sorted(numbers) for length, numbers in numbers_by_len.items()}
+
+    @staticmethod
+    def _subtract_numbers(
+        intervals: list[Interval], numbers: list[int]
+    ) -> list[Interval]:
+        # numbers must be sorted and unique
+        result = []
+        for start, end in intervals:
+            current = start
+            first = bisect_left(numbers, start)
+            last = bisect_right(numbers, end)
+            for number in numbers[first:last]:
+                if number > current:
+                    result.append((current, number - 1))
+                current = number + 1
+            if current <= end:
+                result.append((current, end))
+        return result
 
-        for length in sorted(ranges_by_len.keys()):
-            early_range_first = sorted(
-                ranges_by_len[length], key=lambda r: r.start[-length:]
-            )
-            for range in early_range_first:
-                yield range
+    @staticmethod
+    def _format_intervals(intervals: list[Interval], length: int):
+        for start, end in intervals:
+            yield {
+                'start': str(start).rjust(length, '0'),
+                'end': str(end).rjust(length, '0'),
+            }
+
+    @staticmethod
+    def _list_exten_from_intervals(intervals: list[Interval], length: int):
+        for start, end in intervals:
+            for exten in range(start, end + 1):
+                yield str(exten).rjust(length, '0')
 
     @staticmethod
     def _ranges_from_extens(extensions):
@@ -152,14 +180,14 @@ class RangeSorter:
 
 
 class ContextRangeService:
-    def __init__(self, context_dao, extension_dao):
+    def __init__(self, context_dao, extension_db):
         self._context_dao = context_dao
-        self._extension_dao = extension_dao
+        self._extension_db = extension_db
 
     def search(self, context_id, range_type, tenant_uuids=None, **parameters):
         context = self._context_dao.get(context_id, tenant_uuids=tenant_uuids)
 
-        filter = RangeFilter(context, self._extension_dao, **parameters)
+        filter = RangeFilter(context, self._extension_db, **parameters)
         paginator = RangePaginator(**parameters)
         sorter = RangeSorter(**parameters)
 
@@ -171,4 +199,4 @@ class ContextRangeService:
 
 
 def build_service():
-    return ContextRangeService(context_dao, extension_dao)
+    return ContextRangeService(context_dao, extension_db)
@@ -1,11 +1,12 @@
-# Copyright 2023-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2023-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from __future__ import annotations
 
 from typing import NamedTuple
 from unittest import TestCase
-from hamcrest import assert_that, contains_exactly
+from unittest.mock import Mock
+from hamcrest import assert_that, contains_exactly, empty, equal_to, has_entries
 
 from ..service import RangeFilter
 
@@ -17,14 +18,19 @@ class Range(NamedTuple):
     did_length: int | None = None
 
 
-class TestListExtenFromRanges(TestCase):
+def list_extens(ranges):
+    for length, intervals in RangeFilter._merge_ranges(ranges).items():
+        yield from RangeFilter._list_exten_from_intervals(intervals, length)
+
+
+class TestListExtenFromIntervals(TestCase):
     def test_multiple_ranges(self):
         ranges = [
             Range('1000', '1002'),
             Range('1005', '1007'),
         ]
 
-        result = list(RangeFilter._list_exten_from_ranges(ranges))
+        result = list(list_extens(ranges))
 
         assert_that(
             result,
@@ -43,7 +49,7 @@ class TestListExtenFromRanges(TestCase):
             Range('0001', '0003'),
         ]
 
-        result = list(RangeFilter._list_exten_from_ranges(ranges))
+        result = list(list_extens(ranges))
 
         assert_that(
             result,
@@ -64,7 +70,7 @@ class TestListExtenFromRanges(TestCase):
             Range('11110000', '11110005', type='incall', did_length=4),
         ]
 
-        result = list(RangeFilter._list_exten_from_ranges(ranges))
+        result = list(list_extens(ranges))
 
         assert_that(
             result,
@@ -94,7 +100,7 @@ class TestListExtenFromRanges(TestCase):
             Range('12345680006', '12345680010', 'incall', did_length),
         ]
 
-        result = list(RangeFilter._list_exten_from_ranges(ranges))
+        result = list(list_extens(ranges))
 
         assert_that(
             result,
@@ -121,7 +127,7 @@ class TestListExtenFromRanges(TestCase):
             Range('1000', '1010'),
         ]
 
-        result = list(RangeFilter._list_exten_from_ranges(ranges))
+        result = list(list_extens(ranges))
 
         assert_that(
             result,
@@ -207,3 +213,133 @@ class TestRangesFromExtens(TestCase):
                 {'start': '00001', 'end': '00003'},
             ),
         )
+
+
+class TestMergeRanges(TestCase):
+    def test_overlapping_and_adjacent_ranges_are_merged(self):
+        ranges = [
+            Range('1005', '1007'),
+            Range('1000', '1003'),
+            Range('1004', '1004'),
+            Range('1010', '1020'),
+            Range('1012', '1015'),
+            Range('100', '105'),
+        ]
+
+        result = RangeFilter._merge_ranges(ranges)
+
+        assert_that(
+            result,
+            has_entries(
+                {
+                    3: contains_exactly((100, 105)),
+                    4: contains_exactly((1000, 1007), (1010, 1020)),
+                }
+            ),
+        )
+
+    def test_incall_ranges_use_did_length(self):
+        ranges = [
+            Range('12345670000', '12345670010', 'incall', 4),
+            Range('12345680005', '12345680020', 'incall', 4),
+        ]
+
+        result = RangeFilter._merge_ranges(ranges)
+
+        assert_that(result, has_entries({4: contains_exactly((0, 20))}))
+
+
+class TestSubtractNumbers(TestCase):
+    def test_numbers_split_intervals(self):
+        intervals = [(1000, 1010), (2000, 2002)]
+        numbers = [999, 1000, 1005, 1006, 1010, 2001, 3000]
+
+        result = RangeFilter._subtract_numbers(intervals, numbers)
+
+        assert_that(
+            result,
+            contains_exactly((1001, 1004), (1007, 1009), (2000, 2000), (2002, 2002)),
+        )
+
+    def test_fully_used_interval_is_removed(self):
+        result = RangeFilter._subtract_numbers([(1, 3)], [1, 2, 3])
+
+        assert_that(result, empty())
+
+
+class TestGetRanges(TestCase):
+    def setUp(self):
+        self.context = Mock(user_ranges=[])
+        self.extension_db = Mock()
+        self.extension_db.find_all_extens.return_value = []
+
+    def test_available_excludes_used_extensions(self):
+        self.context.user_ranges = [Range('1000', '1009'), Range('0100', '0105')]
+        self.extension_db.find_all_extens.return_value = [
+            '1000',
+            '1005',
+            '105',
+            '_XXXX',
+        ]
+        filter_ = RangeFilter(self.context, self.extension_db, 'available')
+
+        ranges, count = filter_.get_ranges('user')
+
+        assert_that(
+            ranges,
+            contains_exactly(
+                {'start': '0100', 'end': '0105'},
+                {'start': '1001', 'end': '1004'},
+                {'start': '1006', 'end': '1009'},
+            ),
+        )
+        assert_that(count, equal_to(3))
+        self.extension_db.find_all_extens.assert_called_once_with(self.context.name)
+
+    def test_all_does_not_load_extensions(self):
+        self.context.user_ranges = [Range('1000', '1009')]
+        filter_ = RangeFilter(self.context, self.extension_db, 'all')
+
+        ranges, count = filter_.get_ranges('user')
+
+        self.extension_db.find_all_extens.assert_not_called()
+        assert_that(ranges, contains_exactly({'start': '1000', 'end': '1009'}))
+
+    def test_search(self):
+        self.context.user_ranges = [Range('1000', '1030')]
+        filter_ = RangeFilter(self.context, self.extension_db, 'all', search='2')
+
+        ranges, count = filter_.get_ranges('user')
+
+        assert_that(
+            ranges,
+            contains_exactly(
+                {'start': '1002', 'end': '1002'},
+                {'start': '1012', 'end': '1012'},
+                {'start': '1020', 'end': '1029'},
+            ),
+        )
+
+    def test_search_non_digit(self):
+        self.context.user_ranges = [Range('1000', '1030')]
+        filter_ = RangeFilter(self.context, self.extension_db, 'all', search='a')
+
+        ranges, count = filter_.get_ranges('user')
+
+        assert_that(ranges, empty())
+
+    def test_million_numbers_range(self):
+        self.context.incall_ranges = [
+            Range('15550000000', '15550999999', 'incall', 7),
+            Range('15550500000', '15551499999', 'incall', 7),
+        ]
+        self.extension_db.find_all_extens.return_value = [
+            str(number).rjust(7, '0') for number in range(0, 1500000, 1000)
+        ]
+        filter_ = RangeFilter(self.context, self.extension_db, 'available')
+
+        ranges, count = filter_.get_ranges('incall')
+
+        assert_that(count, equal_to(1500))
+        assert_that(ranges[0], equal_to({'start': '0000001', 'end': '0000999'}))
+        assert_that(ranges[-1], equal_to({'start': '1499001', 'end': '1499999'}))
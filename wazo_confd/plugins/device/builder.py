@@ -1,11 +1,11 @@
-# Copyright 2015-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from xivo_dao.resources.feature_extension import dao as feature_extension_dao
+import threading
+
 from xivo_dao.resources.func_key_template import dao as template_dao
 from xivo_dao.resources.line import dao as line_dao
 from xivo_dao.resources.line_extension import dao as line_extension_dao
-from xivo_dao.resources.user import dao as user_dao
 from xivo_dao.resources.user_line import dao as user_line_dao
 
 from wazo_confd import bus, sysconfd
@@ -13,7 +13,8 @@ from wazo_confd.database import (
     device as device_db,
     func_key_template as func_key_template_db,
 )
-from wazo_confd.plugins.device.funckey import build_converters
+from wazo_confd.plugins.device.funckey import build_converters, build_lookup
+from wazo_confd.plugins.device.index import device_index
 from wazo_confd.plugins.device.generators import (
     ConfigGenerator,
     ExtensionGenerator,
@@ -38,13 +39,16 @@ from .dao import DeviceDao
 from .notifier import DeviceNotifier
 from .validator import build_validator
 
+_device_updaters = {}
+_device_updaters_lock = threading.Lock()
+
 
 def build_dao(provd_client):
     return DeviceDao(provd_client)
 
 
 def build_service(device_dao, provd_client):
-    search_engine = SearchEngine(device_dao)
+    search_engine = SearchEngine(device_dao, device_index)
     device_validator = build_validator(device_dao, line_dao)
     device_notifier = DeviceNotifier(bus)
     device_updater = build_device_updater(provd_client)
@@ -66,12 +70,20 @@ def build_service(device_dao, provd_client):
 
 
 def build_device_updater(provd_client):
+    """Return the device updater of `provd_client`, shared by all plugins"""
+    with _device_updaters_lock:
+        if provd_client not in _device_updaters:
+            _device_updaters[provd_client] = _build_device_updater(provd_client)
+        return _device_updaters[provd_client]
+
+
+def _build_device_updater(provd_client):
     device_dao = build_dao(provd_client)
     registrar_dao = RegistrarDao(provd_client)
     generator = build_generators(device_dao, registrar_dao)
-    provd_updater = ProvdUpdater(device_dao, generator, line_dao)
+    provd_updater = ProvdUpdater(device_dao, generator, device_db)
     return DeviceUpdater(
-        user_dao,
+        device_db,
         line_dao,
         user_line_dao,
         line_extension_dao,
@@ -83,7 +95,7 @@ def build_device_updater(provd_client):
 def build_generators(device_dao, registrar_dao):
     converters = build_converters()
     funckey_generator = FuncKeyGenerator(
-        user_dao, line_dao, user_line_dao, template_dao, device_dao, converters
+        device_db, template_dao, converters, build_lookup
     )
 
     sip_generator = SipGenerator(registrar_dao, device_db)
@@ -92,7 +104,7 @@ def build_generators(device_dao, registrar_dao):
 
     user_generator = UserGenerator(device_db)
 
-    extension_generator = ExtensionGenerator(feature_extension_dao)
+    extension_generator = ExtensionGenerator(device_db)
 
     raw_config_generator = RawConfigGenerator(
         [
@@ -1,4 +1,4 @@
-# Copyright 2015-2019 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
@@ -7,6 +7,7 @@ from xivo_dao.helpers import errors
 
 from wazo_provd_client.exceptions import ProvdError
 
+from wazo_confd.plugins.device.index import device_index
 from wazo_confd.plugins.device.model import Device
 
 logger = logging.getLogger(__name__)
@@ -40,6 +41,34 @@ class DeviceDao:
             provd_config = None
         return Device(provd_device, provd_config)
 
+    def build_devices(self, provd_devices):
+        config_ids = [
+            device['config'] for device in provd_devices if 'config' in device
+        ]
+        configs = self.find_configs(config_ids)
+        return [
+            Device(dict(provd_device), configs.get(provd_device.get('config')))
+            for provd_device in provd_devices
+        ]
+
+    def find_configs(self, config_ids):
+        if not config_ids:
+            return {}
+
+        try:
+            provd_configs = self.configs.list({'id': {'$in': config_ids}})['configs']
+        except ProvdError as e:
+            logger.debug('could not list configs %s: %s', config_ids, e)
+            provd_configs = []
+        configs = {config['id']: config for config in provd_configs}
+
+        for config_id in set(config_ids) - set(configs):
+            try:
+                configs[config_id] = self.configs.get(config_id)
+            except ProvdError:
+                continue
+        return configs
+
     def find_by(self, tenant_uuid=None, **criteria):
         kwargs = {}
         if tenant_uuid is None:
@@ -78,10 +107,12 @@ class DeviceDao:
             if e.status_code != 404:
                 raise
             self.configs.create(device.config)
+        device_index.invalidate()
 
     def edit(self, device, tenant_uuid=None):
         self.devices.update(device.device, tenant_uuid=tenant_uuid)
         self.configs.update(device.config)
+        device_index.invalidate()
 
     def delete(self, device, tenant_uuid=None):
         try:
@@ -90,6 +121,7 @@ class DeviceDao:
             if e.status_code != 404:
                 raise
         self._remove_config(device._config)
+        device_index.invalidate()
 
     def reset_autoprov(self, device, tenant_uuid=None):
         old_config = device._config
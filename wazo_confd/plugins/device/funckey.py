@@ -1,49 +1,150 @@
-# Copyright 2015-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import abc
 
 from xivo.xivo_helpers import fkey_extension
-from xivo_dao.resources.extension import dao as extension_dao_module
-from xivo_dao.resources.feature_extension import dao as feature_extension_dao_module
+from xivo_dao.helpers import errors
 from xivo_dao.resources.features import dao as features_dao_module
-from xivo_dao.resources.line import dao as line_dao_module
-from xivo_dao.resources.line_extension import dao as line_extension_dao_module
 from xivo_dao.resources.paging import dao as paging_dao_module
 from xivo_dao.resources.parking_lot import dao as parking_lot_dao_module
-from xivo_dao.resources.user_line import dao as user_line_dao_module
+
+from wazo_confd.database import device as device_db
 
 
 def build_converters():
     return {
-        'agent': AgentConverter(feature_extension_dao_module),
-        'bsfilter': BSFilterConverter(feature_extension_dao_module),
-        'conference': ConferenceConverter(extension_dao_module),
+        'agent': AgentConverter(),
+        'bsfilter': BSFilterConverter(),
+        'conference': ConferenceConverter(),
         'custom': CustomConverter(),
-        'forward': ForwardConverter(feature_extension_dao_module),
-        'group': GroupConverter(extension_dao_module),
-        'groupmember': GroupMemberConverter(feature_extension_dao_module),
-        'onlinerec': OnlineRecordingConverter(features_dao_module),
-        'paging': PagingConverter(feature_extension_dao_module, paging_dao_module),
+        'forward': ForwardConverter(),
+        'group': GroupConverter(),
+        'groupmember': GroupMemberConverter(),
+        'onlinerec': OnlineRecordingConverter(),
+        'paging': PagingConverter(),
         'park_position': ParkPositionConverter(),
-        'parking': ParkingConverter(parking_lot_dao_module),
-        'queue': QueueConverter(extension_dao_module),
-        'service': ServiceConverter(feature_extension_dao_module),
-        'transfer': TransferConverter(features_dao_module),
-        'user': UserConverter(
-            line_dao_module,
-            user_line_dao_module,
-            line_extension_dao_module,
-            extension_dao_module,
-        ),
+        'parking': ParkingConverter(),
+        'queue': QueueConverter(),
+        'service': ServiceConverter(),
+        'transfer': TransferConverter(),
+        'user': UserConverter(),
+    }
+
+
+def build_lookup():
+    return FuncKeyLookup(
+        device_db, features_dao_module, paging_dao_module, parking_lot_dao_module
+    )
+
+
+class FuncKeyLookup:
+    """Values needed by the funckeys of a batch of devices.
+
+    Feature extensions and the extensions of users, groups, queues and
+    conferences are loaded once by `preload`. Other destinations are cached
+    when first used.
+    """
+
+    EXTENSION_DESTINATIONS = {
+        'conference': 'conference_id',
+        'group': 'group_id',
+        'queue': 'queue_id',
     }
 
+    def __init__(self, device_db, features_dao, paging_dao, parking_lot_dao):
+        self.device_db = device_db
+        self.features_dao = features_dao
+        self.paging_dao = paging_dao
+        self.parking_lot_dao = parking_lot_dao
+        self._feature_extensions = None
+        self._user_extens = {}
+        self._extens = {}
+        self._features = {}
+        self._pagings = {}
+        self._parking_lots = {}
+
+    def preload(self, funckeys):
+        user_ids = set()
+        destinations = set()
+        for funckey in funckeys:
+            destination = funckey.destination
+            if destination.type == 'user':
+                user_ids.add(destination.user_id)
+            elif destination.type in self.EXTENSION_DESTINATIONS:
+                attribute = self.EXTENSION_DESTINATIONS[destination.type]
+                typeval = str(getattr(destination, attribute))
+                destinations.add((destination.type, typeval))
+
+        self._load_user_extens(user_ids)
+        self._load_extens(destinations)
+
+    def feature_extension(self, feature):
+        for extension in self._load_feature_extensions():
+            if extension.feature == feature:
+                return extension
+        raise errors.not_found('FeatureExtension', feature=feature)
+
+    def feature_extension_by_uuid(self, uuid):
+        for extension in self._load_feature_extensions():
+            if str(extension.uuid) == str(uuid):
+                return extension
+        raise errors.not_found('FeatureExtension', uuid=uuid)
+
+    def user_exten(self, user_id):
+        self._load_user_extens({user_id})
+        return self._user_extens[user_id]
+
+    def destination_exten(self, type_, typeval):
+        key = (type_, str(typeval))
+        self._load_extens({key})
+        exten = self._extens[key]
+        if exten is None:
+            raise errors.not_found('Extension', type=type_, typeval=key[1])
+        return exten
+
+    def feature_value(self, feature_id):
+        if feature_id not in self._features:
+            self._features[feature_id] = self.features_dao.get_value(feature_id)
+        return self._features[feature_id]
+
+    def paging(self, paging_id):
+        if paging_id not in self._pagings:
+            self._pagings[paging_id] = self.paging_dao.get(paging_id)
+        return self._pagings[paging_id]
+
+    def parking_lot(self, parking_lot_id):
+        if parking_lot_id not in self._parking_lots:
+            self._parking_lots[parking_lot_id] = self.parking_lot_dao.get(
+                parking_lot_id
+            )
+        return self._parking_lots[parking_lot_id]
+
+    def _load_feature_extensions(self):
+        if self._feature_extensions is None:
+            self._feature_extensions = self.device_db.feature_extensions()
+        return self._feature_extensions
+
+    def _load_user_extens(self, user_ids):
+        missing = [user_id for user_id in user_ids if user_id not in self._user_extens]
+        if missing:
+            extens = self.device_db.main_extens_for_users(missing)
+            for user_id in missing:
+                self._user_extens[user_id] = extens.get(user_id)
+
+    def _load_extens(self, destinations):
+        missing = [key for key in destinations if key not in self._extens]
+        if missing:
+            extens = self.device_db.extens_for_destinations(missing)
+            for key in missing:
+                self._extens[key] = extens.get(key)
+
 
 class FuncKeyConverter(metaclass=abc.ABCMeta):
     INVALID_CHARS = "\n\r\t;"
 
     @abc.abstractmethod
-    def build(self, user, line, position, funckey):
+    def build(self, user, line, position, funckey, lookup):
         return
 
     def provd_funckey(self, line, position, funckey, value):
@@ -71,61 +172,27 @@ class FuncKeyConverter(metaclass=abc.ABCMeta):
 
 
 class UserConverter(FuncKeyConverter):
-    def __init__(self, line_dao, user_line_dao, line_extension_dao, extension_dao):
-        self.line_dao = line_dao
-        self.user_line_dao = user_line_dao
-        self.line_extension_dao = line_extension_dao
-        self.extension_dao = extension_dao
-
-    def build(self, user, line, position, funckey):
-        funckey_line = self.find_user_line(funckey.destination.user_id)
-        if not funckey_line:
-            return {}
-
-        extension = self.find_extension(funckey_line)
-        if not extension:
+    def build(self, user, line, position, funckey, lookup):
+        exten = lookup.user_exten(funckey.destination.user_id)
+        if not exten:
             return {}
 
-        return self.provd_funckey(line, position, funckey, extension.exten)
-
-    def find_user_line(self, user_id):
-        user_lines = self.user_line_dao.find_all_by_user_id(user_id)
-        main_users = [ul for ul in user_lines if ul.main_user]
-
-        if not main_users:
-            return None
-
-        return self.line_dao.get(main_users[0].line_id)
-
-    def find_extension(self, line):
-        line_extension = self.line_extension_dao.find_by_line_id(line.id)
-        if not line_extension:
-            return None
-
-        return self.extension_dao.get(line_extension.extension_id)
+        return self.provd_funckey(line, position, funckey, exten)
 
 
 class GroupConverter(FuncKeyConverter):
-    def __init__(self, extension_dao):
-        self.extension_dao = extension_dao
-
-    def build(self, user, line, position, funckey):
-        extension = self.extension_dao.get_by(
-            type='group', typeval=str(funckey.destination.group_id)
-        )
-        return self.provd_funckey(line, position, funckey, extension.exten)
+    def build(self, user, line, position, funckey, lookup):
+        exten = lookup.destination_exten('group', funckey.destination.group_id)
+        return self.provd_funckey(line, position, funckey, exten)
 
     def determine_type(self, funckey):
         return 'speeddial'
 
 
 class GroupMemberConverter(FuncKeyConverter):
-    def __init__(self, feature_extension_dao):
-        self.feature_extension_dao = feature_extension_dao
-
-    def build(self, user, line, position, funckey):
-        prog_exten = self.feature_extension_dao.get_by(feature='phoneprogfunckey')
-        action_exten = self.feature_extension_dao.get(
+    def build(self, user, line, position, funckey, lookup):
+        prog_exten = lookup.feature_extension('phoneprogfunckey')
+        action_exten = lookup.feature_extension_by_uuid(
             funckey.destination.feature_extension_uuid
         )
 
@@ -137,38 +204,26 @@ class GroupMemberConverter(FuncKeyConverter):
 
 
 class QueueConverter(FuncKeyConverter):
-    def __init__(self, extension_dao):
-        self.extension_dao = extension_dao
-
-    def build(self, user, line, position, funckey):
-        extension = self.extension_dao.get_by(
-            type='queue', typeval=str(funckey.destination.queue_id)
-        )
-        return self.provd_funckey(line, position, funckey, extension.exten)
+    def build(self, user, line, position, funckey, lookup):
+        exten = lookup.destination_exten('queue', funckey.destination.queue_id)
+        return self.provd_funckey(line, position, funckey, exten)
 
     def determine_type(self, funckey):
         return 'speeddial'
 
 
 class ConferenceConverter(FuncKeyConverter):
-    def __init__(self, extension_dao):
-        self.extension_dao = extension_dao
-
-    def build(self, user, line, position, funckey):
-        extension = self.extension_dao.get_by(
-            type='conference', typeval=str(funckey.destination.conference_id)
+    def build(self, user, line, position, funckey, lookup):
+        exten = lookup.destination_exten(
+            'conference', funckey.destination.conference_id
         )
-        return self.provd_funckey(line, position, funckey, extension.exten)
+        return self.provd_funckey(line, position, funckey, exten)
 
 
 class PagingConverter(FuncKeyConverter):
-    def __init__(self, feature_extension_dao, paging_dao):
-        self.feature_extension_dao = feature_extension_dao
-        self.paging_dao = paging_dao
-
-    def build(self, user, line, position, funckey):
-        prefix_exten = self.feature_extension_dao.get_by(feature='paging')
-        extension = self.paging_dao.get(funckey.destination.paging_id).number
+    def build(self, user, line, position, funckey, lookup):
+        prefix_exten = lookup.feature_extension('paging')
+        extension = lookup.paging(funckey.destination.paging_id).number
         value = '{}{}'.format(prefix_exten.clean_exten(), extension)
         return self.provd_funckey(line, position, funckey, value)
 
@@ -179,16 +234,13 @@ class PagingConverter(FuncKeyConverter):
 class ServiceConverter(FuncKeyConverter):
     PROGFUNCKEYS = ('callrecord', 'incallfilter', 'enablednd', 'enablevm')
 
-    def __init__(self, feature_extension_dao):
-        self.feature_extension_dao = feature_extension_dao
-
-    def build(self, user, line, position, funckey):
-        extension = self.feature_extension_dao.get(
+    def build(self, user, line, position, funckey, lookup):
+        extension = lookup.feature_extension_by_uuid(
             funckey.destination.feature_extension_uuid
         )
 
         if funckey.destination.service in self.PROGFUNCKEYS:
-            prog_exten = self.feature_extension_dao.get_by(feature='phoneprogfunckey')
+            prog_exten = lookup.feature_extension('phoneprogfunckey')
             value = self.progfunckey(
                 prog_exten.exten, user.id, extension.clean_exten(), None
             )
@@ -204,17 +256,14 @@ class ServiceConverter(FuncKeyConverter):
 
 
 class CustomConverter(FuncKeyConverter):
-    def build(self, user, line, position, funckey):
+    def build(self, user, line, position, funckey, lookup):
         return self.provd_funckey(line, position, funckey, funckey.destination.exten)
 
 
 class ForwardConverter(FuncKeyConverter):
-    def __init__(self, feature_extension_dao):
-        self.feature_extension_dao = feature_extension_dao
-
-    def build(self, user, line, position, funckey):
-        prog_exten = self.feature_extension_dao.get_by(feature='phoneprogfunckey')
-        fwd_exten = self.feature_extension_dao.get(
+    def build(self, user, line, position, funckey, lookup):
+        prog_exten = lookup.feature_extension('phoneprogfunckey')
+        fwd_exten = lookup.feature_extension_by_uuid(
             funckey.destination.feature_extension_uuid
         )
 
@@ -226,27 +275,21 @@ class ForwardConverter(FuncKeyConverter):
 
 
 class TransferConverter(FuncKeyConverter):
-    def __init__(self, features_dao):
-        self.features_dao = features_dao
-
-    def build(self, user, line, position, funckey):
-        exten = self.features_dao.get_value(funckey.destination.feature_id)
+    def build(self, user, line, position, funckey, lookup):
+        exten = lookup.feature_value(funckey.destination.feature_id)
         return self.provd_funckey(line, position, funckey, exten)
 
 
 class ParkPositionConverter(FuncKeyConverter):
-    def build(self, user, line, position, funckey):
+    def build(self, user, line, position, funckey, lookup):
         return self.provd_funckey(
             line, position, funckey, str(funckey.destination.position)
         )
 
 
 class ParkingConverter(FuncKeyConverter):
-    def __init__(self, parking_lot_dao):
-        self.parking_lot_dao = parking_lot_dao
-
-    def build(self, user, line, position, funckey):
-        parking_lot = self.parking_lot_dao.get(funckey.destination.parking_lot_id)
+    def build(self, user, line, position, funckey, lookup):
+        parking_lot = lookup.parking_lot(funckey.destination.parking_lot_id)
         return self.provd_funckey(line, position, funckey, parking_lot.exten)
 
     def determine_type(self, funckey):
@@ -254,11 +297,8 @@ class ParkingConverter(FuncKeyConverter):
 
 
 class BSFilterConverter(FuncKeyConverter):
-    def __init__(self, extension_dao):
-        self.feature_extension_dao = extension_dao
-
-    def build(self, user, line, position, funckey):
-        prefix = self.feature_extension_dao.get_by(feature='bsfilter')
+    def build(self, user, line, position, funckey, lookup):
+        prefix = lookup.feature_extension('bsfilter')
 
         value = '{}{}'.format(
             prefix.clean_exten(), funckey.destination.filter_member_id
@@ -268,12 +308,9 @@ class BSFilterConverter(FuncKeyConverter):
 
 
 class AgentConverter(FuncKeyConverter):
-    def __init__(self, extension_dao):
-        self.feature_extension_dao = extension_dao
-
-    def build(self, user, line, position, funckey):
-        prog_exten = self.feature_extension_dao.get_by(feature='phoneprogfunckey')
-        action_exten = self.feature_extension_dao.get(
+    def build(self, user, line, position, funckey, lookup):
+        prog_exten = lookup.feature_extension('phoneprogfunckey')
+        action_exten = lookup.feature_extension_by_uuid(
             funckey.destination.feature_extension_uuid
         )
 
@@ -288,11 +325,8 @@ class AgentConverter(FuncKeyConverter):
 
 
 class OnlineRecordingConverter(FuncKeyConverter):
-    def __init__(self, features_dao):
-        self.features_dao = features_dao
-
-    def build(self, user, line, position, funckey):
-        exten = self.features_dao.get_value(funckey.destination.feature_id)
+    def build(self, user, line, position, funckey, lookup):
+        exten = lookup.feature_value(funckey.destination.feature_id)
         return self.provd_funckey(line, position, funckey, exten)
 
     def determine_type(self, funckey):
@@ -1,19 +1,31 @@
-# Copyright 2016-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2016-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import abc
+
 
 class ConfigGenerator:
     def __init__(self, raw_generator):
         self.raw_generator = raw_generator
 
     def generate(self, device):
+        return self.generate_many([device])[device.id]
+
+    def generate_many(self, devices):
+        raw_configs = self.raw_generator.generate_many(devices)
+        return {
+            device.id: self.build_config(device, raw_configs[device.id])
+            for device in devices
+        }
+
+    def build_config(self, device, raw_config):
         configdevice = device.template_id or 'defaultconfigdevice'
         config = {
             'id': device.id,
             'configdevice': configdevice,
             'parent_ids': ['base', configdevice],
             'deletable': True,
-            'raw_config': self.raw_generator.generate(device),
+            'raw_config': raw_config,
         }
 
         return config
@@ -24,118 +36,158 @@ class RawConfigGenerator:
         self.generators = generators
 
     def generate(self, device):
-        raw_config = {'X_key': '', 'config_version': 1}
+        return self.generate_many([device])[device.id]
+
+    def generate_many(self, devices):
+        raw_configs = {
+            device.id: {'X_key': '', 'config_version': 1} for device in devices
+        }
 
         for generator in self.generators:
-            section = generator.generate(device)
-            if section:
-                raw_config.update(section)
+            sections = generator.generate_many(devices)
+            for device_id, section in sections.items():
+                if section:
+                    raw_configs[device_id].update(section)
 
-        return raw_config
+        return raw_configs
 
 
-class UserGenerator:
+class SectionGenerator(metaclass=abc.ABCMeta):
+    def generate(self, device):
+        return self.generate_many([device]).get(device.id)
+
+    @abc.abstractmethod
+    def generate_many(self, devices):
+        return
+
+
+class UserGenerator(SectionGenerator):
     def __init__(self, device_db):
         self.device_db = device_db
 
-    def generate(self, device):
-        row = self.device_db.profile_for_device(device.id)
-        if row:
-            return {
+    def generate_many(self, devices):
+        rows = self.device_db.profiles_for_devices([device.id for device in devices])
+        return {
+            device_id: {
                 'X_xivo_user_uuid': row.uuid,
                 'X_xivo_phonebook_profile': row.context,
             }
+            for device_id, row in rows.items()
+        }
 
 
-class ExtensionGenerator:
-    def __init__(self, feature_extension_dao):
-        self.feature_extension_dao = feature_extension_dao
+class ExtensionGenerator(SectionGenerator):
+    FEATURES = {
+        'exten_dnd': 'enablednd',
+        'exten_fwd_unconditional': 'fwdunc',
+        'exten_fwd_no_answer': 'fwdrna',
+        'exten_fwd_busy': 'fwdbusy',
+        'exten_fwd_disable_all': 'fwdundoall',
+        'exten_park': None,
+        'exten_pickup_group': 'pickupexten',
+        'exten_pickup_call': 'pickup',
+        'exten_voicemail': 'vmusermsg',
+    }
 
-    def generate(self, device):
-        return {
-            'exten_dnd': self.find_exten('enablednd'),
-            'exten_fwd_unconditional': self.find_exten('fwdunc'),
-            'exten_fwd_no_answer': self.find_exten('fwdrna'),
-            'exten_fwd_busy': self.find_exten('fwdbusy'),
-            'exten_fwd_disable_all': self.find_exten('fwdundoall'),
-            'exten_park': None,
-            'exten_pickup_group': self.find_exten('pickupexten'),
-            'exten_pickup_call': self.find_exten('pickup'),
-            'exten_voicemail': self.find_exten('vmusermsg'),
-        }
+    def __init__(self, device_db):
+        self.device_db = device_db
 
-    def find_exten(self, feature):
-        extension = self.feature_extension_dao.find_by(feature=feature)
-        if extension:
-            return extension.clean_exten()
+    def generate_many(self, devices):
+        if not devices:
+            return {}
 
+        extens = {}
+        for extension in self.device_db.feature_extensions():
+            extens.setdefault(extension.feature, extension.clean_exten())
 
-class FuncKeyGenerator:
-    def __init__(
-        self, user_dao, line_dao, user_line_dao, template_dao, device_dao, converters
-    ):
-        self.user_dao = user_dao
-        self.line_dao = line_dao
-        self.user_line_dao = user_line_dao
-        self.device_dao = device_dao
+        section = {key: extens.get(feature) for key, feature in self.FEATURES.items()}
+        return {device.id: dict(section) for device in devices}
+
+
+class FuncKeyGenerator(SectionGenerator):
+    def __init__(self, device_db, template_dao, converters, build_lookup):
+        self.device_db = device_db
         self.template_dao = template_dao
         self.converters = converters
+        self.build_lookup = build_lookup
+
+    def generate_many(self, devices):
+        lines = self.device_db.lines_for_devices([device.id for device in devices])
+        templates = {}
+        keyboards = {}
+        for device_id, device_lines in lines.items():
+            user, line = self.user_line_for_device(device_lines)
+            if user and line:
+                template = self.get_unified_template(user, templates)
+                keyboards[device_id] = (user, line, template)
+
+        lookup = self.build_lookup()
+        lookup.preload(
+            funckey
+            for _, _, template in keyboards.values()
+            for funckey in template.keys.values()
+        )
 
-    def generate(self, device):
-        user, line = self.user_line_for_device(device.id)
-        if user and line:
-            template = self.get_unified_template(user)
-            funckeys = self.convert_funckeys(user, line, template)
-            return {'funckeys': funckeys}
-
-    def user_line_for_device(self, device_id):
-        lines = self.line_dao.find_all_by(device=device_id)
+        return {
+            device_id: {'funckeys': self.convert_funckeys(user, line, template, lookup)}
+            for device_id, (user, line, template) in keyboards.items()
+        }
+
+    def user_line_for_device(self, device_lines):
         try:
-            line = min(lines, key=lambda x: x.position)
+            line, main_user = min(device_lines, key=lambda x: x[0].position)
         except ValueError:
             return None, None
 
-        main_user_line = self.user_line_dao.find_main_user_line(line.id)
-        if main_user_line:
-            user = self.user_dao.get(main_user_line.user_id)
-            return user, line
+        if main_user:
+            return main_user, line
         return None, None
 
-    def get_unified_template(self, user):
-        private_template = self.template_dao.get(user.private_template_id)
+    def get_unified_template(self, user, templates=None):
+        templates = {} if templates is None else templates
+        private_template = self._get_template(user.private_template_id, templates)
         if user.func_key_template_id:
-            public_template = self.template_dao.get(user.func_key_template_id)
+            public_template = self._get_template(user.func_key_template_id, templates)
             return public_template.merge(private_template)
         return private_template
 
-    def convert_funckeys(self, user, line, template):
+    def _get_template(self, template_id, templates):
+        if template_id not in templates:
+            templates[template_id] = self.template_dao.get(template_id)
+        return templates[template_id]
+
+    def convert_funckeys(self, user, line, template, lookup):
         funckeys = {}
         for pos, funckey in template.keys.items():
             converter = self.converters[funckey.destination.type]
-            funckeys.update(converter.build(user, line, pos, funckey))
+            funckeys.update(converter.build(user, line, pos, funckey, lookup))
         return funckeys
 
 
-class SipGenerator:
+class SipGenerator(SectionGenerator):
     def __init__(self, registrar_dao, device_db):
         self.registrar_dao = registrar_dao
         self.device_db = device_db
 
-    def generate(self, device):
-        sip_lines = {}
-        rows = self.device_db.sip_lines_for_device(device.id)
-        for row in rows:
-            pos = row.LineFeatures.position
-            sip_lines[pos] = self.generate_sip_line(row)
-
-        if len(sip_lines) > 0:
-            return {'protocol': 'SIP', 'sip_lines': sip_lines}
-
-    def generate_sip_line(self, row):
+    def generate_many(self, devices):
+        sections = {}
+        registrars = {}
+        device_ids = [device.id for device in devices]
+        for device_id, rows in self.device_db.sip_lines_for_devices(device_ids).items():
+            sip_lines = {}
+            for row in rows:
+                pos = row.LineFeatures.position
+                sip_lines[pos] = self.generate_sip_line(row, registrars)
+
+            if len(sip_lines) > 0:
+                sections[device_id] = {'protocol': 'SIP', 'sip_lines': sip_lines}
+        return sections
+
+    def generate_sip_line(self, row, registrars=None):
         line = row.LineFeatures
         sip = row.EndpointSIP
         extension = row.Extension
-        registrar = self.registrar_dao.get(line.configregistrar)
+        registrar = _get_registrar(self.registrar_dao, line.configregistrar, registrars)
         username, password = '', ''
         if sip._auth_section:
             for _, value in sip._auth_section.find('username'):
@@ -175,17 +227,28 @@ class SipGenerator:
         return config
 
 
-class SccpGenerator:
+class SccpGenerator(SectionGenerator):
     def __init__(self, registrar_dao, line_dao):
         self.registrar_dao = registrar_dao
         self.line_dao = line_dao
 
-    def generate(self, device):
+    def generate_many(self, devices):
+        registrars = {}
+        sections = {}
+        for device in devices:
+            section = self.generate_device(device, registrars)
+            if section:
+                sections[device.id] = section
+        return sections
+
+    def generate_device(self, device, registrars):
         call_managers = {}
 
         line = self.line_dao.find_by(device=device.id, protocol='sccp')
         if line:
-            registrar = self.registrar_dao.get(line.configregistrar)
+            registrar = _get_registrar(
+                self.registrar_dao, line.configregistrar, registrars
+            )
             proxy_backup = registrar.proxy_backup_host
 
             call_managers['1'] = {'ip': registrar.proxy_main_host}
@@ -194,3 +257,11 @@ class SccpGenerator:
 
         if len(call_managers) > 0:
             return {'protocol': 'SCCP', 'sccp_call_managers': call_managers}
+
+
+def _get_registrar(registrar_dao, registrar_id, registrars=None):
+    if registrars is None:
+        return registrar_dao.get(registrar_id)
+    if registrar_id not in registrars:
+        registrars[registrar_id] = registrar_dao.get(registrar_id)
+    return registrars[registrar_id]
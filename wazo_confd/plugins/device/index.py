@@ -0,0 +1,122 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEVICE_KEYS = [
+    'id',
+    'ip',
+    'mac',
+    'sn',
+    'plugin',
+    'vendor',
+    'model',
+    'version',
+    'description',
+]
+
+
+class DeviceIndex:
+    """In-memory copy of the provd devices, by tenant, used to search devices.
+
+    An entry is fetched from provd when first searched and kept `ttl` seconds,
+    since devices are also created and updated by provd itself. Every device
+    written by wazo-confd invalidates all entries.
+    """
+
+    SEARCH_SEPARATOR = '\x00'
+
+    def __init__(self, ttl=10):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._generation = 0
+
+    def configure(self, ttl):
+        self.ttl = ttl
+        self.invalidate()
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def get(self, fetch, tenant_uuid=None, recurse=False):
+        key = (tenant_uuid, recurse)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            generation = self._generation
+        if entry and now - entry.fetched_at < self.ttl:
+            return entry
+
+        logger.debug('refreshing device index of tenant %s', tenant_uuid)
+        entry = DeviceIndexEntry(fetch(), now)
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = entry
+        return entry
+
+
+class DeviceIndexEntry:
+    def __init__(self, devices, fetched_at):
+        self.devices = devices
+        self.fetched_at = fetched_at
+        self._search_texts = None
+        self._orders = {}
+        self._lock = threading.Lock()
+
+    def find(self, criteria, search=None, order='ip', direction='asc'):
+        devices = self.sorted(order, direction)
+
+        if criteria:
+            devices = [
+                device
+                for device in devices
+                if all(device.get(key) == value for key, value in criteria.items())
+            ]
+
+        if search is not None:
+            search = search.lower()
+            search_texts = self.search_texts()
+            devices = [
+                device for device in devices if search in search_texts[device['id']]
+            ]
+
+        return devices
+
+    def sorted(self, order, direction='asc'):
+        with self._lock:
+            key = (order, direction)
+            if key not in self._orders:
+                # devices without a value are listed last in both directions
+                present, missing = [], []
+                for device in self.devices:
+                    if device.get(order) is None:
+                        missing.append(device)
+                    else:
+                        present.append(device)
+                present.sort(
+                    key=lambda device: str(device[order]),
+                    reverse=direction == 'desc',
+                )
+                self._orders[key] = present + missing
+            return self._orders[key]
+
+    def search_texts(self):
+        with self._lock:
+            if self._search_texts is None:
+                self._search_texts = {
+                    device['id']: DeviceIndex.SEARCH_SEPARATOR.join(
+                        str(device[key]).lower() for key in DEVICE_KEYS if key in device
+                    )
+                    for device in self.devices
+                }
+            return self._search_texts
+
+
+device_index = DeviceIndex()
@@ -1,8 +1,6 @@
-# Copyright 2016-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2016-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from wazo_provd_client import Client as ProvdClient
-
 from .builder import build_dao, build_service
 from .middleware import DeviceMiddleWare
 from .resource import (
@@ -13,20 +11,29 @@ from .resource import (
     DeviceAutoprov,
     DeviceSynchronize,
 )
+from .index import device_index
+from .update import device_update_pool
 
 
 class Plugin:
     def load(self, dependencies):
         api = dependencies['api']
         config = dependencies['config']
-        token_changed_subscribe = dependencies['token_changed_subscribe']
         middleware_handle = dependencies['middleware_handle']
+        status_aggregator = dependencies['status_aggregator']
+
+        device_update_pool.configure(
+            config['device_updates']['max_workers'],
+            config['device_updates']['async'],
+        )
+        status_aggregator.add_provider(device_update_pool.provide_status)
+        device_index.configure(config['device_index']['ttl'])
 
-        provd_client = ProvdClient(**config['provd'])
-        token_changed_subscribe(provd_client.set_token)
+        provd_client = dependencies['provd_client']
+        lazy = dependencies['lazy']
 
         dao = build_dao(provd_client)
-        service = build_service(dao, provd_client)
+        service = lazy(build_service, dao, provd_client)
 
         device_middleware = DeviceMiddleWare(service)
         middleware_handle.register('device', device_middleware)
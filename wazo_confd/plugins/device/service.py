@@ -1,12 +1,16 @@
-# Copyright 2015-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+from functools import partial
+
 from xivo_dao.resources.utils.search import SearchResult
 from xivo_dao.helpers import errors
 
 from wazo_confd.helpers.resource import CRUDService
 from xivo_dao.helpers.db_manager import Session
 
+from .index import DEVICE_KEYS
+
 
 class DeviceService(CRUDService):
     def __init__(self, dao, validator, notifier, search_engine, line_dao, line_device):
@@ -48,30 +52,20 @@ class DeviceService(CRUDService):
 
 
 class SearchEngine:
-    PROVD_DEVICE_KEYS = [
-        'id',
-        'ip',
-        'mac',
-        'sn',
-        'plugin',
-        'vendor',
-        'model',
-        'version',
-        'description',
-    ]
+    PROVD_DEVICE_KEYS = DEVICE_KEYS
 
     DIRECTION = ['asc', 'desc']
 
     DEFAULT_ORDER = 'ip'
     DEFAULT_DIRECTION = 'asc'
 
-    def __init__(self, dao):
+    def __init__(self, dao, index):
         self.dao = dao
+        self.index = index
 
     def search(self, parameters, tenant_uuid=None):
         self.validate_parameters(parameters)
         provd_devices = self.find_all_devices(parameters, tenant_uuid=tenant_uuid)
-        provd_devices = self.filter_devices(provd_devices, parameters.get('search'))
         total = len(provd_devices)
 
         provd_devices = self.paginate_devices(
@@ -80,7 +74,7 @@ class SearchEngine:
             parameters.get('limit'),
         )
 
-        items = [self.dao.build_device(provd_device) for provd_device in provd_devices]
+        items = self.dao.build_devices(provd_devices)
 
         return SearchResult(total=total, items=items)
 
@@ -96,35 +90,28 @@ class SearchEngine:
                 )
 
     def find_all_devices(self, parameters, tenant_uuid=None):
-        query = {
+        criteria = {
             key: value
             for key, value in parameters.items()
             if key in self.PROVD_DEVICE_KEYS
         }
-        order = parameters.get('order', self.DEFAULT_ORDER)
-        direction = parameters.get('direction', self.DEFAULT_DIRECTION)
         recurse = parameters.get('recurse', False)
-        return self.dao.devices.list(
-            search=query,
-            order=order,
-            direction=direction,
+        entry = self.index.get(
+            partial(self.fetch_devices, tenant_uuid, recurse),
             tenant_uuid=tenant_uuid,
             recurse=recurse,
-        )['devices']
-
-    def filter_devices(self, devices, search=None):
-        if search is None:
-            return devices
-
-        search = search.lower()
-
-        return [device for device in devices if self._matches_search(device, search)]
+        )
+        return entry.find(
+            criteria,
+            search=parameters.get('search'),
+            order=parameters.get('order', self.DEFAULT_ORDER),
+            direction=parameters.get('direction', self.DEFAULT_DIRECTION),
+        )
 
-    def _matches_search(self, device, search_lowered):
-        for key in self.PROVD_DEVICE_KEYS:
-            if key in device and search_lowered in str(device[key]).lower():
-                return True
-        return False
+    def fetch_devices(self, tenant_uuid, recurse):
+        return self.dao.devices.list(
+            search={}, tenant_uuid=tenant_uuid, recurse=recurse
+        )['devices']
 
     def paginate_devices(self, devices, offset=0, limit=None):
         if limit:
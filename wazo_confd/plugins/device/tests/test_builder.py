@@ -0,0 +1,19 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+
+from hamcrest import assert_that, is_not, same_instance
+from unittest.mock import Mock
+
+from ..builder import build_device_updater
+
+
+class TestBuildDeviceUpdater(unittest.TestCase):
+    def test_updater_is_shared_by_provd_client(self):
+        provd_client = Mock()
+
+        updater = build_device_updater(provd_client)
+
+        assert_that(build_device_updater(provd_client), same_instance(updater))
+        assert_that(build_device_updater(Mock()), is_not(same_instance(updater)))
@@ -0,0 +1,153 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+
+from hamcrest import assert_that, calling, equal_to, has_entries, raises
+from unittest.mock import Mock, sentinel as s
+
+from xivo_dao.helpers.exception import NotFoundError
+
+from ..funckey import FuncKeyLookup
+from ..generators import (
+    ExtensionGenerator,
+    FuncKeyGenerator,
+    RawConfigGenerator,
+    SipGenerator,
+)
+
+
+def _funckey(type_, **destination):
+    return Mock(destination=Mock(type=type_, **destination))
+
+
+class TestRawConfigGenerator(unittest.TestCase):
+    def test_generate_many_merges_sections_by_device(self):
+        generator = Mock()
+        generator.generate_many.return_value = {'d1': {'foo': 'bar'}, 'd2': None}
+        raw_generator = RawConfigGenerator([generator])
+
+        raw_configs = raw_generator.generate_many([Mock(id='d1'), Mock(id='d2')])
+
+        generator.generate_many.assert_called_once()
+        assert_that(
+            raw_configs,
+            has_entries(
+                d1={'X_key': '', 'config_version': 1, 'foo': 'bar'},
+                d2={'X_key': '', 'config_version': 1},
+            ),
+        )
+
+
+class TestExtensionGenerator(unittest.TestCase):
+    def test_feature_extensions_are_loaded_once(self):
+        device_db = Mock()
+        dnd = Mock(feature='enablednd')
+        dnd.clean_exten.return_value = '*25'
+        device_db.feature_extensions.return_value = [dnd]
+        generator = ExtensionGenerator(device_db)
+
+        sections = generator.generate_many([Mock(id='d1'), Mock(id='d2')])
+
+        device_db.feature_extensions.assert_called_once_with()
+        assert_that(sections['d1'], has_entries(exten_dnd='*25', exten_park=None))
+        assert_that(sections['d2'], equal_to(sections['d1']))
+
+
+class TestSipGenerator(unittest.TestCase):
+    def test_registrars_are_fetched_once_per_batch(self):
+        registrar_dao = Mock()
+        device_db = Mock()
+        row = Mock()
+        row.EndpointSIP._auth_section = None
+        row.LineFeatures.configregistrar = 'default'
+        device_db.sip_lines_for_devices.return_value = {'d1': [row], 'd2': [row]}
+        generator = SipGenerator(registrar_dao, device_db)
+
+        sections = generator.generate_many([Mock(id='d1'), Mock(id='d2')])
+
+        registrar_dao.get.assert_called_once_with('default')
+        assert_that(sections, has_entries(d1=has_entries(protocol='SIP')))
+
+
+class TestFuncKeyGenerator(unittest.TestCase):
+    def setUp(self):
+        self.device_db = Mock()
+        self.template_dao = Mock()
+        self.lookup = Mock()
+        self.converter = Mock()
+        self.converter.build.return_value = {1: s.funckey}
+        self.generator = FuncKeyGenerator(
+            self.device_db,
+            self.template_dao,
+            {'custom': self.converter},
+            lambda: self.lookup,
+        )
+
+    def test_templates_are_fetched_once_per_batch(self):
+        funckey = _funckey('custom')
+        template = Mock(keys={1: funckey})
+        template.merge.return_value = template
+        self.template_dao.get.return_value = template
+        user1 = Mock(private_template_id=1, func_key_template_id=10)
+        user2 = Mock(private_template_id=2, func_key_template_id=10)
+        self.device_db.lines_for_devices.return_value = {
+            'd1': [(Mock(position=1), user1)],
+            'd2': [(Mock(position=1), user2)],
+        }
+
+        sections = self.generator.generate_many([Mock(id='d1'), Mock(id='d2')])
+
+        assert_that(self.template_dao.get.call_count, equal_to(3))
+        assert_that(list(self.lookup.preload.call_args[0][0]), equal_to([funckey] * 2))
+        assert_that(sections, has_entries(d1={'funckeys': {1: s.funckey}}))
+
+    def test_first_line_without_main_user_has_no_funckeys(self):
+        self.device_db.lines_for_devices.return_value = {
+            'd1': [(Mock(position=1), None), (Mock(position=2), Mock())],
+        }
+
+        sections = self.generator.generate_many([Mock(id='d1')])
+
+        assert_that(sections, equal_to({}))
+        self.template_dao.get.assert_not_called()
+
+
+class TestFuncKeyLookup(unittest.TestCase):
+    def setUp(self):
+        self.device_db = Mock()
+        self.lookup = FuncKeyLookup(self.device_db, Mock(), Mock(), Mock())
+
+    def test_preload_queries_destinations_once(self):
+        self.device_db.main_extens_for_users.return_value = {1: '1001'}
+        self.device_db.extens_for_destinations.return_value = {('group', '3'): '2003'}
+
+        self.lookup.preload(
+            [
+                _funckey('user', user_id=1),
+                _funckey('user', user_id=2),
+                _funckey('group', group_id=3),
+            ]
+        )
+
+        assert_that(self.lookup.user_exten(1), equal_to('1001'))
+        assert_that(self.lookup.user_exten(2), equal_to(None))
+        assert_that(self.lookup.destination_exten('group', 3), equal_to('2003'))
+        self.device_db.main_extens_for_users.assert_called_once()
+        self.device_db.extens_for_destinations.assert_called_once_with([('group', '3')])
+
+    def test_feature_extensions_are_loaded_once(self):
+        paging = Mock(feature='paging', uuid=s.uuid)
+        self.device_db.feature_extensions.return_value = [paging]
+
+        assert_that(self.lookup.feature_extension('paging'), equal_to(paging))
+        assert_that(self.lookup.feature_extension_by_uuid(s.uuid), equal_to(paging))
+        self.device_db.feature_extensions.assert_called_once_with()
+
+    def test_unknown_destination_raises(self):
+        self.device_db.extens_for_destinations.return_value = {}
+
+        assert_that(
+            calling(self.lookup.destination_exten).with_args('queue', 4),
+            raises(NotFoundError),
+        )
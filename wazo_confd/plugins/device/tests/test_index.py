@@ -0,0 +1,120 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+
+from hamcrest import assert_that, contains_exactly, equal_to
+from unittest.mock import Mock, patch
+
+from ..dao import DeviceDao
+from ..index import DeviceIndex
+from ..service import SearchEngine
+
+DEVICES = [
+    {'id': 'd1', 'ip': '10.0.0.2', 'mac': 'aa:bb', 'config': 'c1'},
+    {'id': 'd2', 'ip': '10.0.0.1', 'mac': 'cc:dd', 'model': 'T46', 'config': 'c2'},
+    {'id': 'd3', 'mac': 'ee:ff', 'model': 'T46', 'config': 'c3'},
+]
+
+
+class TestDeviceIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = DeviceIndex(ttl=10)
+        self.fetch = Mock(return_value=DEVICES)
+
+    def test_entry_is_fetched_once_per_tenant(self):
+        self.index.get(self.fetch, tenant_uuid='t1')
+        self.index.get(self.fetch, tenant_uuid='t1')
+        self.index.get(self.fetch, tenant_uuid='t2')
+
+        assert_that(self.fetch.call_count, equal_to(2))
+
+    def test_entry_is_fetched_again_after_ttl(self):
+        with patch('time.monotonic', side_effect=[0, 5, 11]):
+            self.index.get(self.fetch)
+            self.index.get(self.fetch)
+            self.index.get(self.fetch)
+
+        assert_that(self.fetch.call_count, equal_to(2))
+
+    def test_invalidate_discards_entries(self):
+        self.index.get(self.fetch)
+
+        self.index.invalidate()
+        self.index.get(self.fetch)
+
+        assert_that(self.fetch.call_count, equal_to(2))
+
+    def test_find_orders_with_missing_values_last(self):
+        entry = self.index.get(self.fetch)
+
+        devices = entry.find({}, order='ip')
+
+        assert_that([d['id'] for d in devices], contains_exactly('d2', 'd1', 'd3'))
+
+    def test_find_orders_with_missing_values_last_in_desc(self):
+        entry = self.index.get(self.fetch)
+
+        devices = entry.find({}, order='ip', direction='desc')
+
+        assert_that([d['id'] for d in devices], contains_exactly('d1', 'd2', 'd3'))
+
+    def test_find_orders_with_missing_values_in_listing_order(self):
+        entry = self.index.get(self.fetch)
+
+        asc = entry.find({}, order='model')
+        desc = entry.find({}, order='model', direction='desc')
+
+        assert_that([d['id'] for d in asc], contains_exactly('d2', 'd3', 'd1'))
+        assert_that([d['id'] for d in desc], contains_exactly('d2', 'd3', 'd1'))
+
+    def test_find_filters_on_exact_values(self):
+        entry = self.index.get(self.fetch)
+
+        assert_that(entry.find({'model': 't46'}), equal_to([]))
+        assert_that(entry.find({'model': 'T4'}), equal_to([]))
+        assert_that(entry.find({'ip': '10.0.0.3'}), equal_to([]))
+
+    def test_find_filters_criteria_and_search(self):
+        entry = self.index.get(self.fetch)
+
+        devices = entry.find({'model': 'T46'}, search='EE:', direction='desc')
+
+        assert_that([d['id'] for d in devices], contains_exactly('d3'))
+
+
+class TestSearchEngine(unittest.TestCase):
+    def setUp(self):
+        self.dao = Mock()
+        self.dao.devices.list.return_value = {'devices': DEVICES}
+        self.engine = SearchEngine(self.dao, DeviceIndex())
+
+    def test_only_the_page_is_built(self):
+        self.dao.build_devices.return_value = [Mock()]
+
+        result = self.engine.search({'order': 'mac', 'limit': 1, 'offset': 1})
+
+        assert_that(result.total, equal_to(3))
+        self.dao.build_devices.assert_called_once_with([DEVICES[1]])
+
+    def test_devices_are_listed_once(self):
+        self.engine.search({'search': 'aa'}, tenant_uuid='t1')
+        self.engine.search({'search': 'cc'}, tenant_uuid='t1')
+
+        self.dao.devices.list.assert_called_once_with(
+            search={}, tenant_uuid='t1', recurse=False
+        )
+
+
+class TestDeviceDao(unittest.TestCase):
+    def test_build_devices_fetches_configs_in_one_request(self):
+        client = Mock()
+        client.configs.list.return_value = {'configs': [{'id': 'c1'}]}
+        client.configs.get.return_value = {'id': 'c2'}
+        dao = DeviceDao(client)
+
+        devices = dao.build_devices(DEVICES[:2])
+
+        client.configs.list.assert_called_once_with({'id': {'$in': ['c1', 'c2']}})
+        client.configs.get.assert_called_once_with('c2')
+        assert_that([d.config for d in devices], equal_to([{'id': 'c1'}, {'id': 'c2'}]))
@@ -0,0 +1,150 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+
+from flask import Flask, Response
+from hamcrest import assert_that, equal_to
+from unittest.mock import Mock, call, patch, sentinel as s
+
+from .. import update
+from ..update import DeviceUpdatePool, DeviceUpdater, ProvdUpdater
+
+SESSION = 'wazo_confd.helpers.common.Session'
+
+
+class TestProvdUpdater(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.dao = Mock()
+        self.device = Mock(id=s.device_id)
+        self.device.is_autoprov.return_value = False
+        self.dao.get.return_value = self.device
+        self.device_db = Mock()
+        self.device_db.devices_with_lines.side_effect = lambda device_ids: set(
+            device_ids
+        )
+        self.generator = Mock()
+        self.generator.generate_many.side_effect = lambda devices: {
+            device.id: s.config for device in devices
+        }
+        self.updater = ProvdUpdater(self.dao, self.generator, self.device_db)
+        self.pool = DeviceUpdatePool(max_workers=1)
+        patcher = patch.object(update, 'device_update_pool', self.pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_update_outside_request_is_immediate(self):
+        self.updater.update(s.device_id, tenant_uuid=s.tenant_uuid)
+
+        self.dao.edit.assert_called_once_with(self.device, tenant_uuid=s.tenant_uuid)
+
+    def test_update_in_request_is_sent_once_at_the_end(self):
+        with self.app.test_request_context():
+            self.updater.update(s.device_id)
+            self.updater.update(s.device_id, tenant_uuid=s.tenant_uuid)
+            self.updater.update(s.device_id)
+            self.dao.edit.assert_not_called()
+
+            response = self.app.process_response(Response())
+
+        assert_that(response.status_code, equal_to(200))
+        self.dao.get.assert_called_once_with(s.device_id)
+        self.generator.generate_many.assert_called_once_with([self.device])
+        self.device.update_config.assert_called_once_with(s.config)
+        self.dao.edit.assert_called_once_with(self.device, tenant_uuid=s.tenant_uuid)
+
+    def test_update_in_failed_request_is_not_sent(self):
+        with self.app.test_request_context():
+            self.updater.update(s.device_id)
+
+            self.app.process_response(Response(status=400))
+
+        self.dao.get.assert_not_called()
+        self.dao.edit.assert_not_called()
+
+    def test_update_without_lines_resets_autoprov(self):
+        self.device_db.devices_with_lines.side_effect = None
+        self.device_db.devices_with_lines.return_value = set()
+
+        with self.app.test_request_context():
+            self.updater.update(s.device_id, tenant_uuid=s.tenant_uuid)
+            self.app.process_response(Response())
+
+        self.device.update_config.assert_not_called()
+        self.dao.reset_autoprov.assert_called_once_with(
+            self.device, tenant_uuid=s.tenant_uuid
+        )
+
+    def test_lines_of_all_devices_are_found_in_one_query(self):
+        devices = {
+            s.device_1: Mock(id=s.device_1),
+            s.device_2: Mock(id=s.device_2),
+        }
+        for device in devices.values():
+            device.is_autoprov.return_value = False
+        self.dao.get.side_effect = devices.get
+        self.device_db.devices_with_lines.side_effect = lambda device_ids: {s.device_1}
+
+        with self.app.test_request_context():
+            self.updater.update(s.device_1)
+            self.updater.update(s.device_2)
+            self.app.process_response(Response())
+
+        self.device_db.devices_with_lines.assert_called_once_with(
+            [s.device_1, s.device_2]
+        )
+        self.dao.edit.assert_called_once_with(devices[s.device_1], tenant_uuid=None)
+        self.dao.reset_autoprov.assert_called_once_with(
+            devices[s.device_2], tenant_uuid=None
+        )
+
+    def test_update_error_replaces_response(self):
+        self.dao.edit.side_effect = Exception('provd is down')
+
+        with self.app.test_request_context(), patch(SESSION):
+            self.updater.update(s.device_id)
+            response = self.app.process_response(Response())
+
+        assert_that(response.status_code, equal_to(500))
+        assert_that(self.pool._errors_count, equal_to(1))
+
+    def test_asynchronous_update_is_pushed_when_response_is_closed(self):
+        self.pool.asynchronous = True
+
+        with self.app.test_request_context():
+            self.updater.update(s.device_id)
+            response = self.app.process_response(Response())
+
+        self.dao.edit.assert_not_called()
+        response.close()
+        self.pool._executor.shutdown(wait=True)
+        self.dao.edit.assert_called_once_with(self.device, tenant_uuid=None)
+
+
+class TestDeviceUpdater(unittest.TestCase):
+    def test_update_for_template_updates_the_devices_of_its_users(self):
+        device_db = Mock()
+        device_db.devices_for_template.return_value = [
+            (s.device_1, s.tenant_1),
+            (s.device_2, s.tenant_2),
+        ]
+        user_line_dao = Mock()
+        provd_updater = Mock()
+        updater = DeviceUpdater(
+            device_db, Mock(), user_line_dao, Mock(), Mock(), provd_updater
+        )
+
+        updater.update_for_template(Mock(id=s.template_id))
+
+        device_db.devices_for_template.assert_called_once_with(s.template_id)
+        user_line_dao.find_all_by_user_id.assert_not_called()
+        assert_that(
+            provd_updater.update.call_args_list,
+            equal_to(
+                [
+                    call(s.device_1, tenant_uuid=s.tenant_1),
+                    call(s.device_2, tenant_uuid=s.tenant_2),
+                ]
+            ),
+        )
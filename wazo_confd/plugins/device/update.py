@@ -1,18 +1,32 @@
-# Copyright 2016-2020 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2016-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import logging
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from flask import after_this_request, g, has_request_context, jsonify
+from xivo.status import Status
+from xivo_dao.helpers.exception import NotFoundError
+
+from wazo_confd.helpers.common import handle_api_exception
+
+logger = logging.getLogger(__name__)
+
 
 class DeviceUpdater:
     def __init__(
         self,
-        user_dao,
+        device_db,
         line_dao,
         user_line_dao,
         line_extension_dao,
         func_key_template_db,
         provd_updater,
     ):
-        self.user_dao = user_dao
+        self.device_db = device_db
         self.line_dao = line_dao
         self.user_line_dao = user_line_dao
         self.line_extension_dao = line_extension_dao
@@ -20,12 +34,8 @@ class DeviceUpdater:
         self.provd_updater = provd_updater
 
     def update_for_template(self, template):
-        private_users = self.user_dao.find_all_by(
-            func_key_private_template_id=template.id
-        )
-        public_users = self.user_dao.find_all_by(func_key_template_id=template.id)
-        for user in private_users + public_users:
-            self.update_for_user(user)
+        for device_id, tenant_uuid in self.device_db.devices_for_template(template.id):
+            self.provd_updater.update(device_id, tenant_uuid=tenant_uuid)
 
     def update_for_extension(self, extension):
         line_extensions = self.line_extension_dao.find_all_by(extension_id=extension.id)
@@ -70,35 +80,198 @@ class DeviceUpdater:
 
 
 class ProvdUpdater:
-    def __init__(self, dao, config_generator, line_dao):
+    def __init__(self, dao, config_generator, device_db):
         self.dao = dao
         self.config_generator = config_generator
-        self.line_dao = line_dao
+        self.device_db = device_db
 
     def update(self, device_id, tenant_uuid=None):
+        if has_request_context():
+            _defer_update(self, device_id, tenant_uuid)
+            return
+
         device = self.dao.get(device_id)
-        has_lines = self.device_has_lines(device)
+        push = self.prepare_update(device, tenant_uuid=tenant_uuid)
+        push()
 
-        if device.is_autoprov() and has_lines:
-            self.create_device(device, tenant_uuid=tenant_uuid)
-        elif has_lines:
-            self.update_device(device, tenant_uuid=tenant_uuid)
-        else:
-            self.reset_autoprov(device, tenant_uuid=tenant_uuid)
+    def prepare_updates(self, devices):
+        device_ids = [device_id for device_id, _ in devices]
+        found = device_update_pool.map(self._find_device, device_ids)
 
-    def device_has_lines(self, device):
-        lines = self.line_dao.find_all_by(device_id=device.id)
-        return len(lines) > 0
+        found = [
+            (device, tenant_uuid)
+            for device, (_, tenant_uuid) in zip(found, devices)
+            if device
+        ]
+        return self._prepare_pushes(found)
 
-    def create_device(self, device, tenant_uuid=None):
+    def _find_device(self, device_id):
+        try:
+            return self.dao.get(device_id)
+        except NotFoundError:
+            logger.debug('device %s was deleted, skipping its update', device_id)
+            return None
+
+    def prepare_update(self, device, tenant_uuid=None):
+        return self._prepare_pushes([(device, tenant_uuid)])[0]
+
+    def _prepare_pushes(self, devices):
+        with_lines = self.device_db.devices_with_lines(
+            [device.id for device, _ in devices]
+        )
+        provisioned = [device for device, _ in devices if device.id in with_lines]
+        autoprov_ids = {device.id for device in provisioned if device.is_autoprov()}
+        configs = self.config_generator.generate_many(provisioned)
+
+        pushes = []
+        for device, tenant_uuid in devices:
+            if device.id not in configs:
+                push = partial(self.dao.reset_autoprov, device, tenant_uuid=tenant_uuid)
+            elif device.id in autoprov_ids:
+                device.update_config(configs[device.id])
+                push = partial(
+                    self.dao.create_or_update, device, tenant_uuid=tenant_uuid
+                )
+            else:
+                device.update_config(configs[device.id])
+                push = partial(self.dao.edit, device, tenant_uuid=tenant_uuid)
+            pushes.append(push)
+        return pushes
+
+    def generate_config(self, device):
         config = self.config_generator.generate(device)
         device.update_config(config)
+
+    def create_device(self, device, tenant_uuid=None):
+        self.generate_config(device)
         self.dao.create_or_update(device, tenant_uuid=tenant_uuid)
 
     def update_device(self, device, tenant_uuid=None):
-        config = self.config_generator.generate(device)
-        device.update_config(config)
+        self.generate_config(device)
         self.dao.edit(device, tenant_uuid=tenant_uuid)
 
     def reset_autoprov(self, device, tenant_uuid=None):
         self.dao.reset_autoprov(device, tenant_uuid=tenant_uuid)
+
+
+class DeviceUpdatePool:
+    """Talk to provd for device updates from a bounded pool of threads.
+
+    In asynchronous mode, the configurations generated by a request are pushed
+    once its response is sent and their progress is reported in the status.
+    """
+
+    def __init__(self, max_workers=4, asynchronous=False):
+        self.max_workers = max_workers
+        self.asynchronous = asynchronous
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending_count = 0
+        self._pushed_count = 0
+        self._errors_count = 0
+
+    def configure(self, max_workers, asynchronous):
+        self.max_workers = max_workers
+        self.asynchronous = asynchronous
+
+    def map(self, func, items):
+        if len(items) <= 1 or self.max_workers <= 1:
+            return [func(item) for item in items]
+        return list(self._get_executor().map(func, items))
+
+    def push(self, pushes):
+        with self._lock:
+            self._pending_count += len(pushes)
+        for _ in self.map(self._push, pushes):
+            pass
+
+    def submit(self, pushes):
+        with self._lock:
+            self._pending_count += len(pushes)
+        executor = self._get_executor()
+        for push in pushes:
+            future = executor.submit(self._push, push)
+            future.add_done_callback(self._log_error)
+
+    def provide_status(self, status):
+        status['device_updates'].update(
+            {
+                'status': Status.ok,
+                'asynchronous': self.asynchronous,
+                'pending': self._pending_count,
+                'pushed': self._pushed_count,
+                'errors': self._errors_count,
+            }
+        )
+
+    def _push(self, push):
+        try:
+            push()
+        except Exception:
+            self._count(errors=1)
+            raise
+        self._count(pushed=1)
+
+    def _count(self, pushed=0, errors=0):
+        with self._lock:
+            self._pending_count -= pushed + errors
+            self._pushed_count += pushed
+            self._errors_count += errors
+
+    def _log_error(self, future):
+        error = future.exception()
+        if error:
+            logger.error('device update failed: %s', error)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(self.max_workers, 1),
+                    thread_name_prefix='device-update',
+                )
+            return self._executor
+
+
+device_update_pool = DeviceUpdatePool()
+
+
+def _defer_update(provd_updater, device_id, tenant_uuid):
+    pending = g.get('pending_device_updates')
+    if pending is None:
+        pending = g.pending_device_updates = {}
+        after_this_request(_flush_device_updates)
+
+    # a device is updated once per request, keep the first known tenant
+    if pending.get(device_id, (None, None))[1] is None:
+        pending[device_id] = (provd_updater, tenant_uuid)
+
+
+def _flush_device_updates(response):
+    pending = g.pop('pending_device_updates', None)
+    if not pending or response.status_code >= 400:
+        return response
+
+    batches = {}
+    for device_id, (provd_updater, tenant_uuid) in pending.items():
+        batches.setdefault(provd_updater, []).append((device_id, tenant_uuid))
+
+    error = handle_api_exception(_update_devices)(batches, response)
+    if error is None:
+        return response
+
+    message, code = error
+    error_response = jsonify(message)
+    error_response.status_code = code
+    return error_response
+
+
+def _update_devices(batches, response):
+    pushes = []
+    for provd_updater, devices in batches.items():
+        pushes.extend(provd_updater.prepare_updates(devices))
+
+    if device_update_pool.asynchronous:
+        response.call_on_close(partial(device_update_pool.submit, pushes))
+    else:
+        device_update_pool.push(pushes)
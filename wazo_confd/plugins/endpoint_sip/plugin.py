@@ -1,8 +1,6 @@
-# Copyright 2015-2022 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from wazo_provd_client import Client as ProvdClient
-
 from xivo_dao.resources.endpoint_sip import dao as sip_dao
 from xivo_dao.resources.pjsip_transport import dao as transport_dao
 
@@ -14,16 +12,14 @@ from .middleware import EndpointSIPMiddleWare, TemplateSIPMiddleWare
 class Plugin:
     def load(self, dependencies):
         api = dependencies['api']
-        config = dependencies['config']
-        token_changed_subscribe = dependencies['token_changed_subscribe']
         middleware_handle = dependencies['middleware_handle']
 
-        provd_client = ProvdClient(**config['provd'])
-        token_changed_subscribe(provd_client.set_token)
+        provd_client = dependencies['provd_client']
         pjsip_doc = dependencies['pjsip_doc']
+        lazy = dependencies['lazy']
 
-        endpoint_service = build_endpoint_service(provd_client, pjsip_doc)
-        template_service = build_template_service(provd_client, pjsip_doc)
+        endpoint_service = lazy(build_endpoint_service, provd_client, pjsip_doc)
+        template_service = lazy(build_template_service, provd_client, pjsip_doc)
 
         endpoint_sip_middleware = EndpointSIPMiddleWare(endpoint_service)
         template_sip_middleware = TemplateSIPMiddleWare(template_service)
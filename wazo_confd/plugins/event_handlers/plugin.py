@@ -1,4 +1,4 @@
-# Copyright 2020-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2020-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
@@ -16,10 +16,12 @@ logger = logging.getLogger(__name__)
 
 
 class TenantEventHandler:
-    def __init__(self, tenant_dao, service, sysconfd):
+    def __init__(self, tenant_dao, service, sysconfd, tenant_tree, known_tenants):
         self.tenant_dao = tenant_dao
         self.service = service
         self.sysconfd = sysconfd
+        self.tenant_tree = tenant_tree
+        self.known_tenants = known_tenants
 
     def subscribe(self, bus_consumer):
         bus_consumer.subscribe('auth_tenant_added', self._auth_tenant_added)
@@ -28,12 +30,16 @@ class TenantEventHandler:
     def _auth_tenant_added(self, event):
         tenant_uuid = event['uuid']
         slug = event['slug']
+        self.tenant_tree.add(tenant_uuid, event.get('parent_uuid'))
         with session_scope():
             tenant = self.tenant_dao.find_or_create_tenant(tenant_uuid)
             self.service.generate_sip_templates(tenant)
             self.service.copy_slug(tenant, slug)
+        self.known_tenants.add(tenant_uuid)
 
     def _auth_tenant_deleted(self, event):
+        self.tenant_tree.remove(event['uuid'])
+        self.known_tenants.discard(event['uuid'])
         remove_tenant(event['uuid'], self.sysconfd)
 
 
@@ -41,6 +47,8 @@ class Plugin:
     def load(self, dependencies):
         bus_consumer = dependencies['bus_consumer']
         config = dependencies['config']
+        tenant_tree = dependencies['tenant_tree']
+        known_tenants = dependencies['known_tenants']
 
         service = DefaultSIPTemplateService(sip_dao, transport_dao)
         sysconfd = SysconfdPublisher.from_config(config)
@@ -48,5 +56,7 @@ class Plugin:
             tenant_dao,
             service,
             sysconfd,
+            tenant_tree,
+            known_tenants,
         )
         tenant_event_handler.subscribe(bus_consumer)
@@ -1,8 +1,6 @@
-# Copyright 2016-2022 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2016-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from wazo_provd_client import Client as ProvdClient
-
 from .middleware import ExtensionMiddleWare
 from .resource import ExtensionItem, ExtensionList
 from .service import build_service
@@ -11,14 +9,12 @@ from .service import build_service
 class Plugin:
     def load(self, dependencies):
         api = dependencies['api']
-        config = dependencies['config']
-        token_changed_subscribe = dependencies['token_changed_subscribe']
         middleware_handle = dependencies['middleware_handle']
 
-        provd_client = ProvdClient(**config['provd'])
-        token_changed_subscribe(provd_client.set_token)
+        provd_client = dependencies['provd_client']
+        lazy = dependencies['lazy']
 
-        service = build_service(provd_client)
+        service = lazy(build_service, provd_client)
         extension_middleware = ExtensionMiddleWare(service)
         middleware_handle.register('extension', extension_middleware)
 
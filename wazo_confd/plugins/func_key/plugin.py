@@ -1,9 +1,8 @@
-# Copyright 2016-2022 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2016-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from xivo_dao.resources.user import dao as user_dao
 from xivo_dao.resources.func_key_template import dao as template_dao
-from wazo_provd_client import Client as ProvdClient
 
 from .middleware import UserFuncKeyTemplateAssociationMiddleWare
 from .resource import (
@@ -23,15 +22,13 @@ from .service import build_service, build_user_funckey_template_service
 class Plugin:
     def load(self, dependencies):
         api = dependencies['api']
-        config = dependencies['config']
-        token_changed_subscribe = dependencies['token_changed_subscribe']
         middleware_handle = dependencies['middleware_handle']
 
-        provd_client = ProvdClient(**config['provd'])
-        token_changed_subscribe(provd_client.set_token)
+        provd_client = dependencies['provd_client']
+        lazy = dependencies['lazy']
 
-        service = build_service(provd_client)
-        service_association = build_user_funckey_template_service(provd_client)
+        service = lazy(build_service, provd_client)
+        service_association = lazy(build_user_funckey_template_service, provd_client)
         user_funckey_template_association_middleware = (
             UserFuncKeyTemplateAssociationMiddleWare(service_association)
         )
@@ -1,4 +1,4 @@
-# Copyright 2016-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2016-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from flask import request
@@ -7,6 +7,7 @@ from xivo_dao.alchemy.queuemember import QueueMember
 from xivo_dao.helpers import errors
 from xivo_dao.helpers.exception import NotFoundError
 
+from wazo_confd._query_detector import query_budget
 from wazo_confd.auth import required_acl
 from wazo_confd.helpers.restful import ConfdResource
 
@@ -19,6 +20,13 @@ class Extension:
         self.context = context
 
 
+def _users_in_payload(*args, **kwargs):
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return []
+    return payload.get('users') or []
+
+
 class GroupMemberItem(ConfdResource):
     def __init__(self, service, group_dao):
         super().__init__()
@@ -35,6 +43,7 @@ class GroupMemberUserItem(GroupMemberItem):
         self.user_dao = user_dao
 
     @required_acl('confd.groups.{group_uuid}.members.users.update')
+    @query_budget(20, per_item=4, items=_users_in_payload)
     def put(self, group_uuid):
         tenant_uuids = self._build_tenant_list({'recurse': True})
 
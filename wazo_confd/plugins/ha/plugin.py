@@ -1,8 +1,6 @@
-# Copyright 2019-2020 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2019-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from wazo_provd_client import Client as ProvdClient
-
 from wazo_confd import bus, sysconfd
 from wazo_confd.plugins.registrar import builder as registrar_builder
 
@@ -14,11 +12,8 @@ from .service import HAService
 class Plugin:
     def load(self, dependencies):
         api = dependencies['api']
-        config = dependencies['config']
-        token_changed_subscribe = dependencies['token_changed_subscribe']
 
-        provd_client = ProvdClient(**config['provd'])
-        token_changed_subscribe(provd_client.set_token)
+        provd_client = dependencies['provd_client']
         registrar_dao = registrar_builder.build_dao(provd_client)
         registrar_service = registrar_builder.build_service(registrar_dao, provd_client)
 
@@ -1,8 +1,7 @@
-# Copyright 2016-2022 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2016-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from xivo_dao.resources.line import dao as line_dao
-from wazo_provd_client import Client as ProvdClient
 
 from wazo_confd.plugins.device.builder import (
     build_dao as build_device_dao,
@@ -17,16 +16,14 @@ from .service import build_service
 class Plugin:
     def load(self, dependencies):
         api = dependencies['api']
-        config = dependencies['config']
-        token_changed_subscribe = dependencies['token_changed_subscribe']
         middleware_handle = dependencies['middleware_handle']
 
-        provd_client = ProvdClient(**config['provd'])
-        token_changed_subscribe(provd_client.set_token)
+        provd_client = dependencies['provd_client']
+        lazy = dependencies['lazy']
 
         device_dao = build_device_dao(provd_client)
         device_updater = build_device_updater(provd_client)
-        service = build_service(provd_client, device_updater)
+        service = lazy(build_service, provd_client, device_updater)
 
         line_device_association_middleware = LineDeviceAssociationMiddleWare(
             service, device_dao
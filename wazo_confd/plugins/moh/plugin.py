@@ -1,8 +1,10 @@
-# Copyright 2017-2021 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2017-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from xivo_dao.resources.tenant import dao as tenant_dao
 
+from wazo_confd.helpers.directory_index import directory_index
+
 from .resource import MohItem, MohList, MohFileItem
 from .service import build_service
 
@@ -10,6 +12,8 @@ from .service import build_service
 class Plugin:
     def load(self, dependencies):
         api = dependencies['api']
+        config = dependencies['config']
+        directory_index.configure(config['directory_index']['check_interval'])
         service = build_service()
 
         api.add_resource(MohList, '/moh', resource_class_args=(tenant_dao, service))
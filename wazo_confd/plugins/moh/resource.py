@@ -1,4 +1,4 @@
-# Copyright 2017-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2017-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from flask import request, url_for
@@ -8,6 +8,7 @@ from xivo_dao.alchemy.moh import MOH
 
 from wazo_confd.auth import required_acl
 from wazo_confd.helpers.restful import ConfdResource, ItemResource, ListResource
+from wazo_confd.helpers.upload import upload_stream
 
 from .schema import MohFileUploadSchema, MohSchema, MohSchemaPUT
 
@@ -80,10 +81,10 @@ class MohFileItem(ConfdResource):
     def put(self, uuid, filename):
         tenant_uuids = self._build_tenant_list({'recurse': True})
         moh = self.service.get(uuid, tenant_uuids=tenant_uuids)
-        uploaded_file = request.data
+        validate = None
         if moh.mode == 'files':
-            uploaded_file = self.schema().load(uploaded_file)['wav_file']
-        self.service.save_file(moh, filename, uploaded_file)
+            validate = self.schema().load
+        self.service.save_file(moh, filename, upload_stream(), validate)
         return '', 204
 
     @required_acl('confd.moh.{uuid}.files.{filename}.delete')
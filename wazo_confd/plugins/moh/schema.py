@@ -1,4 +1,4 @@
-# Copyright 2017-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2017-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import io
@@ -56,7 +56,7 @@ class MohFileUploadSchema(BaseSchema):
 
     @validates('wav_file')
     def validate_moh(self, data, **kwargs):
-        wav_stream = io.BytesIO(data)
+        wav_stream = data if hasattr(data, 'read') else io.BytesIO(data)
         try:
             with wave.open(wav_stream, 'rb') as f:
                 if f.getnchannels() > 1:
@@ -69,5 +69,5 @@ class MohFileUploadSchema(BaseSchema):
                     raise ValidationError(
                         'Audio file should have bit depth of no more than 16 bits'
                     )
-        except wave.Error as e:
+        except (wave.Error, EOFError) as e:
             raise ValidationError(f'Not able to read audio file: "{e}"')
@@ -1,4 +1,4 @@
-# Copyright 2017-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2017-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from xivo_dao.resources.moh import dao as moh_dao
@@ -42,8 +42,8 @@ class MohService(CRUDService):
     def load_file(self, resource, filename):
         return self._storage.load_file(resource, filename)
 
-    def save_file(self, resource, filename, content):
-        self._storage.save_file(resource, filename, content)
+    def save_file(self, resource, filename, content, validate=None):
+        self._storage.save_file(resource, filename, content, validate)
         self.notifier.files_changed(resource)
 
     def delete_file(self, resource, filename):
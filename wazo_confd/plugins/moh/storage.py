@@ -1,4 +1,4 @@
-# Copyright 2017-2019 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2017-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import errno
@@ -9,6 +9,9 @@ import shutil
 from flask import send_file
 from xivo_dao.helpers import errors
 
+from wazo_confd.helpers.directory_index import directory_index
+from wazo_confd.helpers.upload import save_file
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,8 +20,9 @@ def build_storage(base_path='/var/lib/asterisk/moh'):
 
 
 class _MohFilesystemStorage:
-    def __init__(self, base_path):
+    def __init__(self, base_path, index=directory_index):
         self._base_path = base_path
+        self._index = index
 
     def _directory_path(self, moh):
         return os.path.join(self._base_path, moh.name)
@@ -41,6 +45,8 @@ class _MohFilesystemStorage:
                     )
             else:
                 logger.error('Could not create MOH directory %s: %s', path, e)
+        finally:
+            self._index.invalidate(path)
 
     def remove_directory(self, moh):
         path = self._directory_path(moh)
@@ -51,11 +57,13 @@ class _MohFilesystemStorage:
                 logger.info('MOH directory %s already removed', path)
             else:
                 logger.error('Could not remove MOH directory %s: %s', path, e)
+        finally:
+            self._index.invalidate(path)
 
     def list_files(self, moh):
         path = self._directory_path(moh)
         try:
-            filenames = os.listdir(path)
+            filenames = self._index.listdir(path)
         except OSError as e:
             if e.errno == errno.ENOENT:
                 logger.info('MOH directory %s doesn\'t exist', path)
@@ -72,14 +80,19 @@ class _MohFilesystemStorage:
         path = self._filename_path(moh, filename)
         if not os.path.isfile(path):
             raise _moh_file_not_found(path, moh, filename)
-        return send_file(path, mimetype='application/octet-stream', as_attachment=True)
-
-    def save_file(self, moh, filename, content):
+        return send_file(
+            path,
+            mimetype='application/octet-stream',
+            as_attachment=True,
+            conditional=True,
+        )
+
+    def save_file(self, moh, filename, content, validate=None):
         path = self._filename_path(moh, filename)
-        with os.fdopen(
-            os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o660), 'wb'
-        ) as fobj:
-            return fobj.write(content)
+        try:
+            return save_file(path, content, validate)
+        finally:
+            self._index.invalidate(path)
 
     def remove_file(self, moh, filename):
         path = self._filename_path(moh, filename)
@@ -89,6 +102,8 @@ class _MohFilesystemStorage:
             if e.errno == errno.ENOENT:
                 raise _moh_file_not_found(path, moh, filename)
             raise
+        finally:
+            self._index.invalidate(path)
 
 
 def _moh_file_not_found(path, moh, filename):
@@ -0,0 +1,71 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import NamedTuple
+
+from xivo_dao.resources.phone_number import dao as phone_number_dao
+
+logger = logging.getLogger(__name__)
+
+
+class CallerIDNumbers(NamedTuple):
+    main: str | None
+    shared: tuple[str, ...]
+    fetched_at: float
+
+
+class TenantCallerIDNumbers:
+    """Main and shared phone numbers of each tenant, read at most once every
+    `ttl` seconds.
+
+    They are listed by every `GET /users/{id}/callerids/outgoing`, which
+    softphones call at login. Phone number writes invalidate them.
+    """
+
+    def __init__(self, dao=phone_number_dao, ttl=60):
+        self._dao = dao
+        self.ttl = ttl
+        self._entries = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def configure(self, ttl):
+        self.ttl = ttl
+        self.invalidate()
+
+    def invalidate(self, tenant_uuid=None):
+        with self._lock:
+            self._generation += 1
+            if tenant_uuid is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(tenant_uuid, None)
+
+    def get(self, tenant_uuid) -> CallerIDNumbers:
+        entry = self._entries.get(tenant_uuid)
+        if entry and time.monotonic() - entry.fetched_at < self.ttl:
+            return entry
+
+        generation = self._generation
+        logger.debug('fetching caller ID numbers of tenant %s', tenant_uuid)
+        main = self._dao.find_by(main=True, tenant_uuids=[tenant_uuid])
+        shared = self._dao.find_all_by(
+            shared=True, main=False, tenant_uuids=[tenant_uuid]
+        )
+        entry = CallerIDNumbers(
+            main.number if main else None,
+            tuple(phone_number.number for phone_number in shared),
+            time.monotonic(),
+        )
+        with self._lock:
+            # numbers read before an invalidation may already be outdated
+            if generation == self._generation:
+                self._entries[tenant_uuid] = entry
+        return entry
+
+
+tenant_callerid_numbers = TenantCallerIDNumbers()
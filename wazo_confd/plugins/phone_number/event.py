@@ -0,0 +1,20 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from wazo_bus.resources.common.event import TenantEvent
+
+
+# NOTE: to be moved to wazo_bus.resources.phone_number.event
+class PhoneNumberRangeCreatedEvent(TenantEvent):
+    service = 'confd'
+    name = 'phone_number_range_created'
+    routing_key_fmt = 'config.phone_number.range.created'
+
+    def __init__(self, start_number, end_number, created_count, tenant_uuid):
+        content = {
+            'start_number': start_number,
+            'end_number': end_number,
+            'created_count': created_count,
+            'tenant_uuid': str(tenant_uuid),
+        }
+        super().__init__(content, tenant_uuid)
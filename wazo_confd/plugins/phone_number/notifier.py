@@ -1,4 +1,4 @@
-# Copyright 2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2024-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 from __future__ import annotations
 
@@ -11,27 +11,40 @@ from wazo_bus.resources.phone_number.event import (
 
 from wazo_confd import bus
 
+from .cache import tenant_callerid_numbers
+from .event import PhoneNumberRangeCreatedEvent
 from .schema import phone_number_schema
 
 
 class PhoneNumberNotifier:
-    def __init__(self, bus):
+    def __init__(self, bus, callerid_numbers=tenant_callerid_numbers):
         self.bus = bus
+        self.callerid_numbers = callerid_numbers
 
     def created(self, resource):
         phone_number_serialized = phone_number_schema.dump(resource)
         event = PhoneNumberCreatedEvent(phone_number_serialized, resource.tenant_uuid)
         self.bus.queue_event(event)
+        self.callerid_numbers.invalidate(resource.tenant_uuid)
 
     def edited(self, resource):
         phone_number_serialized = phone_number_schema.dump(resource)
         event = PhoneNumberEditedEvent(phone_number_serialized, resource.tenant_uuid)
         self.bus.queue_event(event)
+        self.callerid_numbers.invalidate(resource.tenant_uuid)
 
     def deleted(self, resource):
         phone_number_serialized = phone_number_schema.dump(resource)
         event = PhoneNumberDeletedEvent(phone_number_serialized, resource.tenant_uuid)
         self.bus.queue_event(event)
+        self.callerid_numbers.invalidate(resource.tenant_uuid)
+
+    def range_created(self, range_spec, created_count: int, tenant_uuid: str):
+        event = PhoneNumberRangeCreatedEvent(
+            range_spec.start_number, range_spec.end_number, created_count, tenant_uuid
+        )
+        self.bus.queue_event(event)
+        self.callerid_numbers.invalidate(tenant_uuid)
 
     def main_updated(
         self, current_main_uuid: str | None, new_main_uuid: str | None, tenant_uuid: str
@@ -40,6 +53,7 @@ class PhoneNumberNotifier:
             current_main_uuid, new_main_uuid, tenant_uuid
         )
         self.bus.queue_event(event)
+        self.callerid_numbers.invalidate(tenant_uuid)
 
 
 def build_notifier():
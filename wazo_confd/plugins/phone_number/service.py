@@ -1,4 +1,4 @@
-# Copyright 2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2024-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 from __future__ import annotations
 
@@ -7,7 +7,7 @@ from typing import Literal
 
 from xivo_dao.resources.phone_number import dao
 from xivo_dao.alchemy.phone_number import PhoneNumber
-from xivo_dao.helpers.errors import ResourceError
+from wazo_confd.database import phone_number as phone_number_db
 from wazo_confd.helpers.resource import CRUDService
 
 from .utils import (
@@ -26,8 +26,9 @@ class PhoneNumberService(CRUDService):
     dao: Literal[dao] = dao
     notifier: PhoneNumberNotifier
 
-    def __init__(self, dao: dao, validator, notifier):
+    def __init__(self, dao: dao, validator, notifier, phone_number_db=phone_number_db):
         super().__init__(dao, validator, notifier)
+        self.phone_number_db = phone_number_db
 
     def find_all_by(self, **criteria) -> list[PhoneNumber]:
         return self.dao.find_all_by(**criteria)
@@ -35,32 +36,34 @@ class PhoneNumberService(CRUDService):
     def create_range(
         self, range_spec: PhoneNumberRangeSpec, tenant_uuid: str
     ) -> tuple[list[PhoneNumber], list[PhoneNumber]]:
-        register_phone_numbers = []
-        _redundant_phone_numbers = []
-        for number in generate_phone_number_range(
-            range_spec.start_number, range_spec.end_number
-        ):
-            try:
-                phone_number = self.create(
-                    PhoneNumber(
-                        number=number,
-                        tenant_uuid=tenant_uuid,
-                    )
-                )
-            except ResourceError as ex:
-                if "already exists" in str(ex):
-                    _redundant_phone_numbers.append(number)
-                    continue
-                else:
-                    raise
-
-            register_phone_numbers.append(phone_number)
-
-        redundant_phone_numbers = self.find_all_by(
-            number_in=_redundant_phone_numbers,
-            tenant_uuids=[tenant_uuid],
+        numbers = list(
+            generate_phone_number_range(range_spec.start_number, range_spec.end_number)
+        )
+        existing = self.phone_number_db.find_existing_numbers(tenant_uuid, numbers)
+        created = set(
+            self.phone_number_db.create_numbers(
+                tenant_uuid, [number for number in numbers if number not in existing]
+            )
         )
 
+        positions = {number: position for position, number in enumerate(numbers)}
+        phone_numbers = sorted(
+            self.find_all_by(number_in=numbers, tenant_uuids=[tenant_uuid]),
+            key=lambda phone_number: positions[phone_number.number],
+        )
+        register_phone_numbers = []
+        redundant_phone_numbers = []
+        for phone_number in phone_numbers:
+            if phone_number.number in created:
+                register_phone_numbers.append(phone_number)
+            else:
+                redundant_phone_numbers.append(phone_number)
+
+        if register_phone_numbers:
+            self.notifier.range_created(
+                range_spec, len(register_phone_numbers), tenant_uuid
+            )
+
         logger.info(
             'Registered %d new phone numbers (out of %d total) from range (%s - %s)',
             len(register_phone_numbers),
@@ -0,0 +1,63 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from hamcrest import assert_that, contains_exactly, equal_to, none
+
+from ..cache import TenantCallerIDNumbers
+
+
+class TestTenantCallerIDNumbers(unittest.TestCase):
+    def setUp(self):
+        self.dao = Mock()
+        self.dao.find_by.return_value = SimpleNamespace(number='5555551234')
+        self.dao.find_all_by.return_value = [SimpleNamespace(number='5555551235')]
+        self.numbers = TenantCallerIDNumbers(self.dao, ttl=60)
+
+    def test_numbers_are_read_once(self):
+        self.numbers.get('tenant')
+        numbers = self.numbers.get('tenant')
+
+        assert_that(numbers.main, equal_to('5555551234'))
+        assert_that(numbers.shared, contains_exactly('5555551235'))
+        self.dao.find_by.assert_called_once_with(main=True, tenant_uuids=['tenant'])
+        self.dao.find_all_by.assert_called_once_with(
+            shared=True, main=False, tenant_uuids=['tenant']
+        )
+
+    def test_no_main_number(self):
+        self.dao.find_by.return_value = None
+
+        assert_that(self.numbers.get('tenant').main, none())
+
+    @patch('wazo_confd.plugins.phone_number.cache.time')
+    def test_numbers_are_read_again_after_ttl(self, time):
+        time.monotonic.return_value = 100
+        self.numbers.get('tenant')
+        time.monotonic.return_value = 161
+        self.numbers.get('tenant')
+
+        assert_that(self.dao.find_by.call_count, equal_to(2))
+
+    def test_invalidate_tenant(self):
+        self.numbers.get('tenant')
+        self.numbers.get('other')
+        self.numbers.invalidate('tenant')
+        self.numbers.get('tenant')
+        self.numbers.get('other')
+
+        assert_that(self.dao.find_by.call_count, equal_to(3))
+
+    def test_numbers_read_during_invalidation_are_not_kept(self):
+        def find_by(**kwargs):
+            self.numbers.invalidate('tenant')
+            return None
+
+        self.dao.find_by.side_effect = find_by
+        self.numbers.get('tenant')
+        self.numbers.get('tenant')
+
+        assert_that(self.dao.find_by.call_count, equal_to(2))
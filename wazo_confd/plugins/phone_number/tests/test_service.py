@@ -1,10 +1,39 @@
 import unittest
+from types import SimpleNamespace
 from unittest.mock import Mock
 from uuid import uuid4
 
 from wazo_confd.plugins.phone_number.utils import PhoneNumberRangeSpec
 from wazo_confd.plugins.phone_number.service import PhoneNumberService
-from xivo_dao.helpers.errors import ResourceError
+
+
+class FakePhoneNumberDB:
+    def __init__(self, dao, existing_numbers=()):
+        self.dao = dao
+        self.phone_numbers = {
+            number: self._build(number, '1234') for number in existing_numbers
+        }
+        self.dao.find_all_by.side_effect = self.find_all_by
+
+    def find_existing_numbers(self, tenant_uuid, numbers):
+        return {number for number in numbers if number in self.phone_numbers}
+
+    def create_numbers(self, tenant_uuid, numbers):
+        for number in numbers:
+            self.phone_numbers[number] = self._build(number, tenant_uuid)
+        return numbers
+
+    def find_all_by(self, number_in, tenant_uuids):
+        return [
+            self.phone_numbers[number]
+            for number in reversed(number_in)
+            if number in self.phone_numbers
+        ]
+
+    def _build(self, number, tenant_uuid):
+        return SimpleNamespace(
+            number=number, uuid=uuid4(), caller_id_name=None, tenant_uuid=tenant_uuid
+        )
 
 
 class TestPhoneNumberService(unittest.TestCase):
@@ -15,43 +44,44 @@ class TestPhoneNumberService(unittest.TestCase):
             delete=Mock(return_value=Mock()),
             find_by=Mock(return_value=Mock()),
         )
+        self.notifier = Mock()
+        self.phone_number_db = FakePhoneNumberDB(self.dao)
         self.service = PhoneNumberService(
-            dao=self.dao, validator=Mock(), notifier=Mock()
+            dao=self.dao,
+            validator=Mock(),
+            notifier=self.notifier,
+            phone_number_db=self.phone_number_db,
         )
 
     def test_create_range(self):
+        range_spec = PhoneNumberRangeSpec(
+            start_number='15550000000',
+            end_number='15550000999',
+        )
         created_numbers, redundant_numbers = self.service.create_range(
-            range_spec=PhoneNumberRangeSpec(
-                start_number='15550000000',
-                end_number='15550000999',
-            ),
+            range_spec=range_spec,
             tenant_uuid='1234',
         )
 
         assert (
             created_numbers and len(created_numbers) == 1000
         ), f'len(created_numbers)={len(created_numbers)}'
+        assert created_numbers[0].number == '15550000000'
+        assert created_numbers[-1].number == '15550000999'
 
         assert not redundant_numbers
+        self.dao.create.assert_not_called()
+        self.notifier.created.assert_not_called()
+        self.notifier.range_created.assert_called_once_with(range_spec, 1000, '1234')
 
     def test_create_range_idempotency(self):
-        redundant_numbers = [
-            Mock(
-                number=str(number),
-                uuid=uuid4(),
-                caller_id_name=None,
-                tenant_uuid='1234',
-            )
-            for number in range(15550000500, 15550001000)
-        ]
-        self.dao.find_all_by.return_value = redundant_numbers
-
-        def reject_redundant_numbers(resource):
-            if resource.number in set(num.number for num in redundant_numbers):
-                raise ResourceError("number already exists")
-            return resource
-
-        self.dao.create.side_effect = reject_redundant_numbers
+        self.phone_number_db = FakePhoneNumberDB(
+            self.dao,
+            existing_numbers=[
+                str(number) for number in range(15550000500, 15550001000)
+            ],
+        )
+        self.service.phone_number_db = self.phone_number_db
 
         created_numbers, redundant_numbers = self.service.create_range(
             range_spec=PhoneNumberRangeSpec(
@@ -64,3 +94,43 @@ class TestPhoneNumberService(unittest.TestCase):
             len(created_numbers) == 500
         ), f'len(created_numbers)={len(created_numbers)}'
         assert len(redundant_numbers) == 500
+        assert redundant_numbers[0].number == '15550000500'
+
+    def test_create_existing_range_sends_no_event(self):
+        self.service.create_range(
+            PhoneNumberRangeSpec('15550000000', '15550000009'), tenant_uuid='1234'
+        )
+        self.notifier.reset_mock()
+
+        created_numbers, redundant_numbers = self.service.create_range(
+            PhoneNumberRangeSpec('15550000000', '15550000009'), tenant_uuid='1234'
+        )
+
+        assert not created_numbers
+        assert len(redundant_numbers) == 10
+        self.notifier.range_created.assert_not_called()
+
+
+class TestCreateLargeRange(unittest.TestCase):
+    """The database is called once per step of a range, not once per number"""
+
+    def _create_range(self, size):
+        dao = Mock()
+        phone_number_db = Mock(wraps=FakePhoneNumberDB(dao))
+        service = PhoneNumberService(dao, Mock(), Mock(), phone_number_db)
+        start = 15550000000
+
+        created_numbers, _ = service.create_range(
+            PhoneNumberRangeSpec(str(start), str(start + size - 1)), tenant_uuid='1234'
+        )
+
+        assert len(created_numbers) == size
+        phone_number_db.find_existing_numbers.assert_called_once()
+        phone_number_db.create_numbers.assert_called_once()
+        dao.find_all_by.assert_called_once()
+
+    def test_range_of_10_000_numbers(self):
+        self._create_range(10**4)
+
+    def test_range_of_100_000_numbers(self):
+        self._create_range(10**5)
@@ -1,4 +1,4 @@
-# Copyright 2020-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2020-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from flask import url_for, request
@@ -6,6 +6,7 @@ from xivo_dao.alchemy.pjsip_transport import PJSIPTransport
 from wazo_confd.auth import required_acl, required_master_tenant
 from wazo_confd.helpers.restful import ConfdResource, ItemResource, ListResource
 from wazo_confd.helpers.asterisk import AsteriskConfigurationList
+from wazo_confd.helpers.response import compressed_response
 from .schema import (
     PJSIPTransportSchema,
     PJSIPTransportDeleteRequestSchema,
@@ -18,7 +19,8 @@ class PJSIPDocList(ConfdResource):
 
     @required_acl('confd.asterisk.pjsip.doc.read')
     def get(self):
-        return self._pjsip_doc.get()
+        etag, compressed = self._pjsip_doc.compressed()
+        return compressed_response(compressed, etag, 'application/json')
 
 
 class PJSIPGlobalList(AsteriskConfigurationList):
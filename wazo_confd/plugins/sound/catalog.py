@@ -0,0 +1,78 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import logging
+import threading
+import time
+
+from .converter import convert_ari_sounds_to_model
+from .model import SoundFile
+
+logger = logging.getLogger(__name__)
+
+
+class SoundCatalog:
+    """Asterisk system sounds, fetched from ARI at most once every `ttl` seconds.
+
+    System sounds only change when Asterisk sound packages are installed, so
+    the converted files and their languages are kept between requests.
+    """
+
+    def __init__(self, ari_client=None, ttl=300):
+        self._ari_client = ari_client
+        self.ttl = ttl
+        self._entry = None
+        self._lock = threading.Lock()
+
+    def configure(self, ari_client, ttl):
+        self._ari_client = ari_client
+        self.ttl = ttl
+        self.invalidate()
+
+    def invalidate(self):
+        self._entry = None
+
+    def files(self):
+        return list(self._get().files.values())
+
+    def find_file(self, name, format_=None, language=None):
+        sound_file = self._get().files.get(name)
+        if sound_file is None:
+            return None
+
+        formats = [
+            sound_format
+            for sound_format in sound_file.formats
+            if (not format_ or sound_format.format == format_)
+            and (not language or sound_format.language == language)
+        ]
+        return SoundFile(name=sound_file.name, formats=formats)
+
+    def languages(self):
+        return list(self._get().languages)
+
+    def _get(self):
+        entry = self._entry
+        if entry and time.monotonic() - entry.fetched_at < self.ttl:
+            return entry
+
+        with self._lock:
+            if self._entry is entry:
+                logger.debug('fetching Asterisk system sounds')
+                sounds = self._ari_client.get_sounds()
+                self._entry = SoundCatalogEntry(
+                    convert_ari_sounds_to_model(sounds),
+                    self._ari_client.get_sounds_languages(sounds),
+                    time.monotonic(),
+                )
+            return self._entry
+
+
+class SoundCatalogEntry:
+    def __init__(self, files, languages, fetched_at):
+        self.files = {sound_file.name: sound_file for sound_file in files}
+        self.languages = languages
+        self.fetched_at = fetched_at
+
+
+sound_catalog = SoundCatalog()
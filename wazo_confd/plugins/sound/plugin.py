@@ -1,8 +1,10 @@
-# Copyright 2017-2021 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2017-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from wazo_confd.helpers.ari import Client as ARIClient
+from wazo_confd.helpers.directory_index import directory_index
 
+from .catalog import sound_catalog
 from .resource import SoundItem, SoundList, SoundFileItem
 from .service import build_service
 
@@ -11,7 +13,10 @@ class Plugin:
     def load(self, dependencies):
         api = dependencies['api']
         config = dependencies['config']
-        ari_client = ARIClient(**config['ari'])
+        http_pools = dependencies['http_pools']
+        ari_client = ARIClient(http_pool=http_pools.get('ari'), **config['ari'])
+        sound_catalog.configure(ari_client, config['sound_catalog']['ttl'])
+        directory_index.configure(config['directory_index']['check_interval'])
         service = build_service(ari_client)
 
         api.add_resource(SoundList, '/sounds', resource_class_args=(service,))
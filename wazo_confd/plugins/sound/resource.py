@@ -1,4 +1,4 @@
-# Copyright 2017-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2017-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from flask import request, url_for
@@ -6,6 +6,7 @@ from xivo.tenant_flask_helpers import Tenant
 
 from wazo_confd.auth import required_acl
 from wazo_confd.helpers.restful import ConfdResource, ItemResource, ListResource
+from wazo_confd.helpers.upload import upload_stream
 
 from .model import SoundCategory, SoundFile, SoundFormat
 from .schema import SoundSchema, SoundQueryParametersSchema
@@ -79,7 +80,7 @@ class SoundFileItem(ConfdResource):
             ],
         )
         sound.files = [sound_file]
-        self.service.save_first_file(sound, request.data)
+        self.service.save_first_file(sound, upload_stream())
         return '', 204
 
     @required_acl('confd.sounds.{category}.files.{filename}.delete')
@@ -1,4 +1,4 @@
-# Copyright 2017-2021 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2017-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
@@ -7,6 +7,7 @@ from requests import HTTPError
 
 from xivo_dao.helpers import errors
 
+from .catalog import sound_catalog
 from .model import SoundCategory
 from .notifier import build_notifier
 from .schema import ASTERISK_CATEGORY
@@ -22,9 +23,17 @@ class SoundService:
     CATEGORY_SORTABLE_FIELDS = (DEFAULT_ORDER,)
 
     def __init__(
-        self, ari_client, storage, asterisk_storage, validator, validator_file, notifier
+        self,
+        ari_client,
+        catalog,
+        storage,
+        asterisk_storage,
+        validator,
+        validator_file,
+        notifier,
     ):
         self._ari_client = ari_client
+        self._catalog = catalog
         self._storage = storage
         self._asterisk_storage = asterisk_storage
         self.validator = validator
@@ -83,22 +92,31 @@ class SoundService:
         sound = SoundCategory(name='system')
         if with_files:
             if 'file_name' in parameters:
-                try:
-                    ari_sounds = [
-                        self._ari_client.get_sound(parameters['file_name'], parameters)
-                    ]
-                except HTTPError as e:
-                    if e.response.status_code == 404:
-                        raise errors.not_found(
-                            'Sound', name='system', file_name=parameters['file_name']
-                        )
-                    raise
+                sound.files = [self._get_asterisk_sound_file(parameters)]
             else:
-                ari_sounds = self._ari_client.get_sounds()
-
-            sound.files = convert_ari_sounds_to_model(ari_sounds)
+                sound.files = self._catalog.files()
         return sound
 
+    def _get_asterisk_sound_file(self, parameters):
+        file_name = parameters['file_name']
+        sound_file = self._catalog.find_file(
+            file_name, parameters.get('format'), parameters.get('language')
+        )
+        if sound_file:
+            return sound_file
+
+        try:
+            ari_sound = self._ari_client.get_sound(file_name, parameters)
+        except HTTPError as e:
+            if e.response.status_code == 404:
+                raise errors.not_found('Sound', name='system', file_name=file_name)
+            raise
+
+        if ari_sound['formats']:
+            # the sound was added since the catalog was fetched
+            self._catalog.invalidate()
+        return convert_ari_sounds_to_model([ari_sound])[0]
+
     def create(self, sound):
         logger.debug('Creating %s', sound)
         self._storage.create_directory(sound)
@@ -133,6 +151,7 @@ class SoundService:
 def build_service(ari_client):
     return SoundService(
         ari_client,
+        sound_catalog,
         build_storage(),
         build_storage(base_path='/usr/share/asterisk/sounds'),
         build_validator(),
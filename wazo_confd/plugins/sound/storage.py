@@ -1,8 +1,7 @@
-# Copyright 2017-2019 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2017-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import errno
-import glob
 import logging
 import os
 import shutil
@@ -11,6 +10,9 @@ from contextlib import contextmanager
 from flask import send_file
 from xivo_dao.helpers import errors
 
+from wazo_confd.helpers.directory_index import directory_index
+from wazo_confd.helpers.upload import save_file
+
 from .model import SoundCategory, SoundFormat, SoundFile
 
 logger = logging.getLogger(__name__)
@@ -24,8 +26,9 @@ def build_storage(base_path='/var/lib/wazo/sounds'):
 
 
 class _SoundFilesystemStorage:
-    def __init__(self, base_path):
+    def __init__(self, base_path, index=directory_index):
         self._base_path = base_path
+        self._index = index
 
     def _build_path(self, *fragments):
         fragments = [fragment for fragment in fragments if fragment]
@@ -67,17 +70,16 @@ class _SoundFilesystemStorage:
 
     def _list_directories(self, tenant_uuid):
         return [
-            name
-            for name in os.listdir(self._build_path('tenants', tenant_uuid))
-            if os.path.isdir(self._build_path('tenants', tenant_uuid, name))
-            and name not in RESERVED_DIRECTORIES
+            entry.name
+            for entry in self._index.scandir(self._build_path('tenants', tenant_uuid))
+            if entry.is_dir and entry.name not in RESERVED_DIRECTORIES
         ]
 
     def get_directory(self, tenant_uuid, directory, parameters, with_files=True):
         if directory in RESERVED_DIRECTORIES:
             raise errors.not_found('Sound', name=directory)
 
-        if not os.path.exists(self._build_path('tenants', tenant_uuid, directory)):
+        if not self._index.exists(self._build_path('tenants', tenant_uuid, directory)):
             raise errors.not_found('Sound', name=directory, **parameters)
 
         sound = SoundCategory(name=directory, tenant_uuid=tenant_uuid)
@@ -96,6 +98,8 @@ class _SoundFilesystemStorage:
                     raise errors.resource_exists(sound, name=sound.name)
                 else:
                     logger.error('Could not create sound directory %s: %s', path, e)
+            finally:
+                self._index.invalidate(path)
 
     def remove_directory(self, sound):
         path = self._build_path('tenants', sound.tenant_uuid, sound.name)
@@ -106,6 +110,8 @@ class _SoundFilesystemStorage:
                 logger.info('Sound directory %s already removed', path)
             else:
                 logger.error('Could not remove sound directory %s: %s', path, e)
+        finally:
+            self._index.invalidate(path)
 
     def _populate_files(self, sound, parameters):
         language_filter = parameters.get('language')
@@ -259,8 +265,8 @@ class _SoundFilesystemStorage:
         return sound
 
     def _find_and_populate_sound(self, sound, path, extract_language=False):
-        for file_ in glob.glob(path):
-            if not os.path.isfile(file_):
+        for file_ in self._index.glob(path):
+            if not self._index.isfile(file_):
                 continue
             sound_file = self._create_sound_file(
                 sound.tenant_uuid, file_, extract_language=extract_language
@@ -288,15 +294,20 @@ class _SoundFilesystemStorage:
         path = self._get_first_file_path(sound)
         if not os.path.isfile(path):
             raise errors.not_found('Sound file', name=sound.name, path=path)
-        return send_file(path, mimetype='application/octet-stream', as_attachment=True)
+        return send_file(
+            path,
+            mimetype='application/octet-stream',
+            as_attachment=True,
+            conditional=True,
+        )
 
     def save_first_file(self, sound, content):
         path = self._get_first_file_path(sound)
         self._ensure_directory(os.path.dirname(path))
-        with os.fdopen(
-            os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o660), 'wb'
-        ) as fobj:
-            return fobj.write(content)
+        try:
+            return save_file(path, content)
+        finally:
+            self._index.invalidate(path)
 
     def remove_files(self, sound):
         paths = self._get_file_paths(sound)
@@ -311,6 +322,7 @@ class _SoundFilesystemStorage:
                     )
                 else:
                     remove_errors.append(e)
+            self._index.invalidate(path)
 
         if len(remove_errors) == len(paths):
             for error in remove_errors:
@@ -371,6 +383,8 @@ class _SoundFilesystemStorage:
                         'Could not create sound language directory %s: %s', path, e
                     )
                     raise
+                finally:
+                    self._index.invalidate(path)
 
 
 @contextmanager
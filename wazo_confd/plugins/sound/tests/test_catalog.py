@@ -0,0 +1,67 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+
+from hamcrest import assert_that, contains_exactly, equal_to, has_length, none
+from unittest.mock import Mock, patch
+
+from ..catalog import SoundCatalog
+
+SOUNDS = [
+    {
+        'id': 'hello',
+        'text': 'Hello',
+        'formats': [
+            {'format': 'gsm', 'language': 'en_US'},
+            {'format': 'slin', 'language': 'fr_FR'},
+        ],
+    },
+    {'id': 'bye', 'formats': [{'format': 'gsm', 'language': 'fr_FR'}]},
+]
+
+
+class TestSoundCatalog(unittest.TestCase):
+    def setUp(self):
+        self.ari_client = Mock()
+        self.ari_client.get_sounds.return_value = SOUNDS
+        self.ari_client.get_sounds_languages.return_value = [{'tag': 'fr_FR'}]
+        self.catalog = SoundCatalog(self.ari_client, ttl=300)
+
+    def test_sounds_are_fetched_once(self):
+        self.catalog.files()
+        self.catalog.find_file('bye')
+        languages = self.catalog.languages()
+
+        assert_that(languages, equal_to([{'tag': 'fr_FR'}]))
+        self.ari_client.get_sounds.assert_called_once_with()
+        self.ari_client.get_sounds_languages.assert_called_once_with(SOUNDS)
+
+    def test_sounds_are_fetched_again_after_ttl(self):
+        with patch('time.monotonic', side_effect=[0, 100, 301, 301]):
+            self.catalog.files()
+            self.catalog.files()
+            self.catalog.files()
+
+        assert_that(self.ari_client.get_sounds.call_count, equal_to(2))
+
+    def test_invalidate(self):
+        self.catalog.files()
+
+        self.catalog.invalidate()
+        self.catalog.files()
+
+        assert_that(self.ari_client.get_sounds.call_count, equal_to(2))
+
+    def test_find_file_filters_formats(self):
+        sound_file = self.catalog.find_file('hello', language='en_US')
+
+        assert_that(sound_file.name, equal_to('hello'))
+        assert_that(
+            [(f.format, f.language, f.text) for f in sound_file.formats],
+            contains_exactly(('gsm', 'en_US', 'Hello')),
+        )
+        assert_that(self.catalog.find_file('hello').formats, has_length(2))
+
+    def test_find_unknown_file(self):
+        assert_that(self.catalog.find_file('unknown'), none())
@@ -1,7 +1,8 @@
-# Copyright 2017-2019 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2017-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from wazo_confd.helpers.ari import Client as ARIClient
+from wazo_confd.plugins.sound.catalog import sound_catalog
 
 from .resource import SoundLanguageList
 from .service import build_service
@@ -11,8 +12,10 @@ class Plugin:
     def load(self, dependencies):
         api = dependencies['api']
         config = dependencies['config']
-        ari_client = ARIClient(**config['ari'])
-        service = build_service(ari_client)
+        http_pools = dependencies['http_pools']
+        ari_client = ARIClient(http_pool=http_pools.get('ari'), **config['ari'])
+        sound_catalog.configure(ari_client, config['sound_catalog']['ttl'])
+        service = build_service(sound_catalog)
 
         api.add_resource(
             SoundLanguageList, '/sounds/languages', resource_class_args=(service,)
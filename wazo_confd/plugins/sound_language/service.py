@@ -1,15 +1,15 @@
-# Copyright 2017-2019 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2017-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 
 class SoundLanguageService:
-    def __init__(self, ari_client):
-        self.ari_client = ari_client
+    def __init__(self, catalog):
+        self.catalog = catalog
 
     def search(self, parameters):
-        result = self.ari_client.get_sounds_languages()
+        result = self.catalog.languages()
         return len(result), result
 
 
-def build_service(ari_client):
-    return SoundLanguageService(ari_client)
+def build_service(catalog):
+    return SoundLanguageService(catalog)
@@ -1,15 +1,16 @@
-# Copyright 2022 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2022-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from xivo.status import Status
 
-from .resource import StatusChecker
+from .resource import MetricsResource, StatusChecker
 
 
 class Plugin:
     def load(self, dependencies):
         api = dependencies['api']
         status_aggregator = dependencies['status_aggregator']
+        metrics = dependencies['metrics']
 
         status_aggregator.add_provider(provide_status)
 
@@ -18,6 +19,11 @@ class Plugin:
             '/status',
             resource_class_args=[status_aggregator],
         )
+        api.add_resource(
+            MetricsResource,
+            '/metrics',
+            resource_class_args=[metrics],
+        )
 
 
 def provide_status(status):
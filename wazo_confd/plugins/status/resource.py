@@ -1,4 +1,4 @@
-# Copyright 2022 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2022-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from xivo.auth_verifier import required_acl
@@ -12,3 +12,12 @@ class StatusChecker(ConfdResource):
     @required_acl('confd.status.read')
     def get(self):
         return self.status_aggregator.status(), 200
+
+
+class MetricsResource(ConfdResource):
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    @required_acl('confd.metrics.read')
+    def get(self):
+        return self.metrics.snapshot(), 200
@@ -1,8 +1,6 @@
-# Copyright 2015-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from wazo_provd_client import Client as ProvdClient
-
 from .middleware import UserMiddleWare
 from .resource import UserItem, UserList
 from .sub_resources.middleware import UserForwardMiddleWare
@@ -23,14 +21,13 @@ class Plugin:
     def load(self, dependencies):
         api = dependencies['api']
         config = dependencies['config']
-        token_changed_subscribe = dependencies['token_changed_subscribe']
         middleware_handle = dependencies['middleware_handle']
 
-        provd_client = ProvdClient(**config['provd'])
-        token_changed_subscribe(provd_client.set_token)
+        provd_client = dependencies['provd_client']
+        lazy = dependencies['lazy']
 
-        service = build_service(
-            provd_client, config['paginated_user_strategy_threshold']
+        service = lazy(
+            build_service, provd_client, config['paginated_user_strategy_threshold']
         )
         service_callservice = build_service_callservice()
         service_forward = build_service_forward()
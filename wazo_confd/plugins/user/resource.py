@@ -1,4 +1,4 @@
-# Copyright 2015-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from flask import url_for, request
@@ -49,7 +49,8 @@ class UserList(ListResource):
         view = params.get('view')
         schema = self.view_schemas.get(view, UserSchema)
         result = self.service.search_collated(params, tenant_uuids)
-        return {'total': result.total, 'items': schema().dump(result.items, many=True)}
+        items = self.list_schema(schema).dump(result.items, many=True)
+        return {'total': result.total, 'items': items}
 
 
 class UserItem(ItemResource):
@@ -1,15 +1,44 @@
-# Copyright 2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2024-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+from wazo_bus.resources.phone_number.event import (
+    PhoneNumberCreatedEvent,
+    PhoneNumberDeletedEvent,
+    PhoneNumberEditedEvent,
+    PhoneNumberMainUpdatedEvent,
+)
 from xivo_dao.resources.user import dao as user_dao
 
+from wazo_confd.plugins.phone_number.cache import tenant_callerid_numbers
+from wazo_confd.plugins.phone_number.event import PhoneNumberRangeCreatedEvent
+
 from .resource import UserCallerIDList
 from .service import build_service
 
+PHONE_NUMBER_EVENTS = (
+    PhoneNumberCreatedEvent,
+    PhoneNumberDeletedEvent,
+    PhoneNumberEditedEvent,
+    PhoneNumberMainUpdatedEvent,
+    PhoneNumberRangeCreatedEvent,
+)
+
+
+def invalidate_tenant_callerid_numbers(payload):
+    # without a tenant, the numbers of every tenant are invalidated
+    tenant_callerid_numbers.invalidate(payload.get('tenant_uuid'))
+
 
 class Plugin:
     def load(self, dependencies):
         api = dependencies['api']
+        bus_consumer = dependencies['bus_consumer']
+        config = dependencies['config']
+
+        # numbers edited by another wazo-confd
+        tenant_callerid_numbers.configure(config['callerid_numbers']['ttl'])
+        for event in PHONE_NUMBER_EVENTS:
+            bus_consumer.subscribe(event.name, invalidate_tenant_callerid_numbers)
 
         service = build_service()
 
@@ -1,15 +1,25 @@
-# Copyright 2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2024-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+from __future__ import annotations
+
 import phonenumbers
+from collections import defaultdict
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import NamedTuple
 
+from phonenumbers import NumberParseException, UNKNOWN_REGION
 from xivo_dao.resources.user import dao as user_dao
 from xivo_dao.resources.incall import dao as incall_dao
 from xivo_dao.resources.phone_number import dao as phone_number_dao
 
+from wazo_confd.plugins.phone_number.cache import tenant_callerid_numbers
+
 from .types import CallerIDType
 
+KEY_CACHE_SIZE = 8192
+
 
 class CallerIDAnonymous:
     type = 'anonymous'
@@ -32,34 +42,158 @@ def same_phone_number(number1: str, number2: str) -> bool:
     )
 
 
+class PhoneNumberKey(NamedTuple):
+    # fields identifying the number, None if it can not be parsed without a region
+    core: tuple | None
+    # region of the country code of E.164 numbers, None for the others
+    region: str | None
+
+
+def _core_fields(numobj) -> tuple:
+    # the fields compared by phonenumbers.is_number_match
+    leading_zeros = None
+    if numobj.italian_leading_zero:
+        leading_zeros = numobj.number_of_leading_zeros
+        if leading_zeros is None:
+            leading_zeros = 1
+    return (
+        numobj.country_code,
+        numobj.national_number,
+        numobj.extension or None,
+        bool(numobj.italian_leading_zero),
+        leading_zeros,
+    )
+
+
+def _without_country_code(core: tuple) -> tuple:
+    return (0,) + core[1:]
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def phone_number_key(number: str) -> PhoneNumberKey | None:
+    '''
+    parse a number once for all its comparisons, None if it is not a phone number
+    '''
+    try:
+        numobj = phonenumbers.parse(number, UNKNOWN_REGION)
+    except NumberParseException as e:
+        if e.error_type != NumberParseException.INVALID_COUNTRY_CODE:
+            return None
+    else:
+        region = phonenumbers.region_code_for_country_code(numobj.country_code)
+        return PhoneNumberKey(_core_fields(numobj), region)
+
+    try:
+        numobj = phonenumbers.parse(number, None, _check_region=False)
+    except NumberParseException:
+        return PhoneNumberKey(None, None)
+    return PhoneNumberKey(_core_fields(numobj), None)
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _regional_core(number: str, region: str) -> tuple | None:
+    try:
+        return _core_fields(phonenumbers.parse(number, region))
+    except NumberParseException:
+        return None
+
+
+class CallerIDNumberSet:
+    '''
+    numbers matched as same_phone_number does, without comparing them pairwise
+
+    A number without country code matches an E.164 number when it is the same
+    number in the region of its country code, so the numbers without country
+    code are also kept parsed in the region of each E.164 number added.
+    '''
+
+    def __init__(self, numbers=()):
+        self._e164 = defaultdict(set)
+        self._e164_without_country = set()
+        self._national = set()
+        self._national_numbers = []
+        self._national_by_region = {}
+        for number in numbers:
+            self.add(number)
+
+    def __contains__(self, number: str) -> bool:
+        key = phone_number_key(number)
+        if key is None:
+            return False
+
+        if key.region is not None:
+            if key.core in self._e164[key.region]:
+                return True
+            if key.region == UNKNOWN_REGION:
+                return _without_country_code(key.core) in self._national
+            return key.core in self._national_in(key.region)
+
+        for region, cores in self._e164.items():
+            if region != UNKNOWN_REGION and _regional_core(number, region) in cores:
+                return True
+        return key.core is not None and (
+            key.core in self._national or key.core in self._e164_without_country
+        )
+
+    def add(self, number: str) -> None:
+        key = phone_number_key(number)
+        if key is None:
+            return
+
+        if key.region is not None:
+            self._e164[key.region].add(key.core)
+            if key.region == UNKNOWN_REGION:
+                self._e164_without_country.add(_without_country_code(key.core))
+            return
+
+        self._national_numbers.append(number)
+        if key.core is not None:
+            self._national.add(key.core)
+        for region, cores in self._national_by_region.items():
+            cores.add(_regional_core(number, region))
+
+    def _national_in(self, region: str) -> set:
+        cores = self._national_by_region.get(region)
+        if cores is None:
+            cores = self._national_by_region[region] = {
+                _regional_core(number, region) for number in self._national_numbers
+            }
+        return cores
+
+
 class UserCallerIDService:
-    def __init__(self, user_dao, incall_dao, phone_number_dao):
+    def __init__(
+        self,
+        user_dao,
+        incall_dao,
+        phone_number_dao,
+        callerid_numbers=tenant_callerid_numbers,
+    ):
         self.user_dao = user_dao
         self.incall_dao = incall_dao
         self.phone_number_dao = phone_number_dao
+        self.callerid_numbers = callerid_numbers
 
     def search(self, user_id, tenant_uuid, parameters):
         callerids = []
-        if main_callerid := self.phone_number_dao.find_by(
-            main=True, tenant_uuids=[tenant_uuid]
-        ):
-            callerids.append(CallerID(type='main', number=main_callerid.number))
+        seen = CallerIDNumberSet()
+
+        def add(callerid):
+            if callerid.number not in seen:
+                callerids.append(callerid)
+                seen.add(callerid.number)
+
+        tenant_numbers = self.callerid_numbers.get(tenant_uuid)
+        if tenant_numbers.main:
+            callerids.append(CallerID(type='main', number=tenant_numbers.main))
+            seen.add(tenant_numbers.main)
 
         # consider "associated" caller ids from incalls
         # as having precedence over shared phone numbers
-        callerids.extend(
-            callerid
-            for callerid in self.user_dao.list_outgoing_callerid_associated(user_id)
-            if not any(same_phone_number(callerid.number, c.number) for c in callerids)
-        )
-        shared_callerids = self.phone_number_dao.find_all_by(
-            shared=True, main=False, tenant_uuids=[tenant_uuid]
-        )
-        callerids.extend(
-            CallerID(type='shared', number=callerid.number)
-            for callerid in shared_callerids
-            if not any(same_phone_number(callerid.number, c.number) for c in callerids)
-        )
+        for callerid in self.user_dao.list_outgoing_callerid_associated(user_id):
+            add(callerid)
+        for number in tenant_numbers.shared:
+            add(CallerID(type='shared', number=number))
         callerids.append(CallerIDAnonymous)
         return len(callerids), callerids
 
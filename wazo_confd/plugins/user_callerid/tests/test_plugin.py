@@ -0,0 +1,20 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest.mock import patch
+
+from ..plugin import invalidate_tenant_callerid_numbers
+
+
+@patch('wazo_confd.plugins.user_callerid.plugin.tenant_callerid_numbers')
+class TestInvalidateTenantCallerIDNumbers(unittest.TestCase):
+    def test_only_the_event_tenant_is_invalidated(self, numbers):
+        invalidate_tenant_callerid_numbers({'uuid': 'number', 'tenant_uuid': 'tenant'})
+
+        numbers.invalidate.assert_called_once_with('tenant')
+
+    def test_every_tenant_is_invalidated_without_tenant(self, numbers):
+        invalidate_tenant_callerid_numbers({'uuid': 'number'})
+
+        numbers.invalidate.assert_called_once_with(None)
@@ -1,6 +1,17 @@
 import unittest
+from unittest.mock import Mock, sentinel
 
-from ..service import same_phone_number
+from hamcrest import assert_that, contains_exactly, equal_to
+
+from wazo_confd.plugins.phone_number.cache import CallerIDNumbers
+
+from ..service import (
+    CallerID,
+    CallerIDAnonymous,
+    CallerIDNumberSet,
+    UserCallerIDService,
+    same_phone_number,
+)
 
 
 class TestSamePhoneNumber(unittest.TestCase):
@@ -23,3 +34,74 @@ class TestSamePhoneNumber(unittest.TestCase):
         number1 = '+11234567890'
         number2 = '21234567890'
         self.assertFalse(same_phone_number(number1, number2), (number1, number2))
+
+
+class TestCallerIDNumberSet(unittest.TestCase):
+    numbers = [
+        '5555551234',
+        '15555551234',
+        '+15555551234',
+        '+1 555 555 1234 ext. 12',
+        '5555551234 ext 12',
+        '+33612345678',
+        '0612345678',
+        '612345678',
+        '+390612345678',
+        '0612345678',
+        '+80012345678',
+        '80012345678',
+        '911',
+        '*10',
+        '',
+    ]
+
+    def test_same_numbers_as_same_phone_number(self):
+        for kept in self.numbers:
+            numbers = CallerIDNumberSet([kept])
+            for number in self.numbers:
+                self.assertEqual(
+                    number in numbers, same_phone_number(number, kept), (number, kept)
+                )
+
+    def test_keeps_the_same_numbers_as_pairwise_comparisons(self):
+        for start in range(len(self.numbers)):
+            candidates = self.numbers[start:] + self.numbers[:start]
+            kept, numbers = [], CallerIDNumberSet()
+            for number in candidates:
+                duplicate = any(same_phone_number(number, other) for other in kept)
+                self.assertEqual(number in numbers, duplicate, (number, kept))
+                if not duplicate:
+                    kept.append(number)
+                    numbers.add(number)
+
+
+class TestUserCallerIDService(unittest.TestCase):
+    def setUp(self):
+        self.user_dao = Mock()
+        self.callerid_numbers = Mock()
+        self.service = UserCallerIDService(
+            self.user_dao, Mock(), Mock(), self.callerid_numbers
+        )
+
+    def test_duplicates_are_removed(self):
+        self.callerid_numbers.get.return_value = CallerIDNumbers(
+            '+15555551234', ('5555551234', '5555551235', '+15555551236'), 0
+        )
+        self.user_dao.list_outgoing_callerid_associated.return_value = [
+            CallerID(type='associated', number='15555551234'),
+            CallerID(type='associated', number='5555551236'),
+        ]
+
+        total, callerids = self.service.search(42, sentinel.tenant_uuid, {})
+
+        assert_that(
+            callerids,
+            contains_exactly(
+                CallerID(type='main', number='+15555551234'),
+                CallerID(type='associated', number='5555551236'),
+                CallerID(type='shared', number='5555551235'),
+                CallerIDAnonymous,
+            ),
+        )
+        assert_that(total, equal_to(4))
+        self.callerid_numbers.get.assert_called_once_with(sentinel.tenant_uuid)
@@ -1,12 +1,12 @@
-# Copyright 2020-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2020-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from flask import url_for, request
 
 from xivo.tenant_flask_helpers import Tenant
-from xivo_dao import tenant_dao
 from xivo_dao.alchemy.user_external_app import UserExternalApp
 
+from wazo_confd._tenants import known_tenants
 from wazo_confd.auth import required_acl
 from wazo_confd.helpers.restful import ListResource, ItemResource
 
@@ -63,7 +63,7 @@ class UserExternalAppItem(ItemResource):
             return form
 
         tenant = Tenant.autodetect()
-        tenant_dao.find_or_create_tenant(tenant.uuid)
+        known_tenants.ensure(tenant.uuid)
         form['tenant_uuid'] = tenant.uuid
         return form
 
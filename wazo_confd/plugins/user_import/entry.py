@@ -1,17 +1,14 @@
-# Copyright 2015-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from __future__ import annotations
 
-from typing import TypedDict, TYPE_CHECKING
+from typing import TypedDict
 
 from xivo_dao.helpers import errors
 
 from .constants import VALID_ENDPOINT_TYPES
 
-if TYPE_CHECKING:
-    from .csvparse import CsvRow
-
 
 class UserDict(TypedDict):
     uuid: str
@@ -22,10 +19,106 @@ class UserDict(TypedDict):
     emails: list[str]
 
 
+class EntryLookup:
+    """Resources resolved once for all the rows of an import.
+
+    A key missing from a preloaded table means the resource does not exist yet.
+    Resources created during the import are added so later rows can find them.
+    """
+
+    def __init__(
+        self,
+        contexts=None,
+        voicemails=None,
+        extensions=None,
+        incalls=None,
+        call_permissions=None,
+    ):
+        extensions = extensions if extensions is not None else {}
+        self._tables = {
+            'context': contexts if contexts is not None else {},
+            'voicemail': voicemails if voicemails is not None else {},
+            'extension': extensions,
+            'extension_incall': extensions,
+            'incall': incalls if incalls is not None else {},
+        }
+        self._call_permissions = call_permissions if call_permissions else {}
+
+    @classmethod
+    def from_entry_dicts(cls, dao, entry_dicts, tenant_uuid):
+        context_names = set()
+        voicemail_keys = set()
+        extension_keys = set()
+        incall_keys = set()
+        call_permission_names = set()
+        for entry_dict in entry_dicts:
+            for resource, keys in (
+                ('context', context_names),
+                ('voicemail', voicemail_keys),
+                ('extension', extension_keys),
+                ('extension_incall', extension_keys),
+                ('incall', incall_keys),
+            ):
+                key = cls._key(resource, entry_dict[resource])
+                if key is not None:
+                    keys.add(key)
+            call_permission_names.update(
+                entry_dict['call_permissions'].get('names') or []
+            )
+
+        return cls(
+            contexts=dao.find_contexts(tenant_uuid, list(context_names)),
+            voicemails=dao.find_voicemails(list(voicemail_keys)),
+            extensions=dao.find_extensions(list(extension_keys)),
+            incalls=dao.find_incalls(list(incall_keys)),
+            call_permissions=dao.find_call_permissions(
+                tenant_uuid, list(call_permission_names)
+            ),
+        )
+
+    def find(self, resource, fields):
+        """Return (True, model) when the lookup can answer, (False, None) otherwise."""
+        if resource == 'call_permissions':
+            names = fields.get('names')
+            if names and all(name in self._call_permissions for name in names):
+                return True, [self._call_permissions[name] for name in names]
+            return False, None
+
+        key = self._key(resource, fields)
+        if key is None:
+            return False, None
+        model = self._tables[resource].get(key)
+        if model is None and resource == 'context':
+            # the creator raises the appropriate not found error
+            return False, None
+        return True, model
+
+    def add(self, resource, fields, model):
+        key = self._key(resource, fields)
+        if key is not None and model is not None:
+            self._tables[resource][key] = model
+
+    @staticmethod
+    def _key(resource, fields):
+        if resource == 'context':
+            return fields.get('context') or None
+        elif resource == 'voicemail':
+            number, context = fields.get('number'), fields.get('context')
+        elif resource in ('extension', 'extension_incall', 'incall'):
+            number, context = fields.get('exten'), fields.get('context')
+        else:
+            return None
+
+        if number and context:
+            return number, context
+        return None
+
+
 class Entry:
-    def __init__(self, number: int, entry_dict):
+    def __init__(self, number: int, entry_dict, lookup: EntryLookup | None = None):
         self.number = number
         self.entry_dict = entry_dict
+        self.lookup = lookup
         self.context = None
         self.user = None
         self.wazo_user: UserDict | None = None
@@ -72,7 +165,11 @@ class Entry:
             return True
 
         fields = self.entry_dict[resource]
-        model = creator.find(fields, tenant_uuid)
+        found = False
+        if self.lookup:
+            found, model = self.lookup.find(resource, fields)
+        if not found:
+            model = creator.find(fields, tenant_uuid)
         if model:
             setattr(self, resource, model)
             return True
@@ -80,7 +177,12 @@ class Entry:
 
     def create(self, resource, creator, tenant_uuid):
         fields = self.entry_dict[resource]
-        setattr(self, resource, creator.create(fields, tenant_uuid))
+        # creators may complete the fields, the lookup key must be taken before
+        lookup_fields = dict(fields)
+        model = creator.create(fields, tenant_uuid)
+        setattr(self, resource, model)
+        if self.lookup:
+            self.lookup.add(resource, lookup_fields, model)
 
     def find_or_create(self, resource, creator, tenant_uuid):
         if not self.find(resource, creator, tenant_uuid):
@@ -103,9 +205,7 @@ class EntryCreator:
     def __init__(self, creators):
         self.creators = creators
 
-    def create(self, row: CsvRow, tenant_uuid: str) -> Entry:
-        entry_dict = row.parse()
-        entry = Entry(row.position, entry_dict)
+    def create(self, entry: Entry, tenant_uuid: str) -> Entry:
         entry.find('context', self.creators['context'], tenant_uuid)
         entry.create('user', self.creators['user'], tenant_uuid)
         entry.create('wazo_user', self.creators['wazo_user'], tenant_uuid)
@@ -1,4 +1,4 @@
-# Copyright 2015-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from collections import OrderedDict
@@ -15,9 +15,9 @@ from xivo_dao.resources.user_call_permission import dao as user_call_permission_
 from xivo_dao.resources.user_line import dao as user_line_dao
 from xivo_dao.resources.user_voicemail import dao as user_voicemail_dao
 from xivo_dao.resources.voicemail import dao as voicemail_dao
-from wazo_provd_client import Client as ProvdClient
 
 from wazo_confd.database import user_export as user_export_dao
+from wazo_confd.database import user_import as user_import_dao
 from wazo_confd.plugins.call_permission.service import (
     build_service as build_call_permission_service,
 )
@@ -90,11 +90,9 @@ class Plugin:
         api = dependencies['api']
         config = dependencies['config']
         pjsip_doc = dependencies['pjsip_doc']
-        token_changed_subscribe = dependencies['token_changed_subscribe']
         set_auth_client_config(config['auth'])
 
-        provd_client = ProvdClient(**config['provd'])
-        token_changed_subscribe(provd_client.set_token)
+        provd_client = dependencies['provd_client']
 
         user_service = build_user_service(
             provd_client,
@@ -175,7 +173,9 @@ class Plugin:
 
         entry_updater = EntryUpdater(creators, associators, entry_finder)
 
-        import_service = ImportService(entry_creator, entry_associator, entry_updater)
+        import_service = ImportService(
+            entry_creator, entry_associator, entry_updater, user_import_dao
+        )
         api.add_resource(
             UserImportResource, '/users/import', resource_class_args=(import_service,)
         )
@@ -1,6 +1,7 @@
-# Copyright 2015-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+from flask import stream_with_context
 from xivo.tenant_flask_helpers import Tenant
 from xivo_dao.helpers.db_manager import Session
 
@@ -67,4 +68,4 @@ class UserExportResource(ConfdResource):
     def get(self):
         tenant = Tenant.autodetect()
         csv_header, users = self.service.export(tenant.uuid)
-        return {'headers': csv_header, 'content': users}
+        return {'headers': csv_header, 'content': stream_with_context(users)}
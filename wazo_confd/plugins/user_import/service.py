@@ -1,38 +1,73 @@
-# Copyright 2015-2022 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
+import time
 
 from marshmallow import ValidationError
 from xivo_dao import tenant_dao
+from xivo_dao.helpers.db_utils import session_scope
 from xivo_dao.helpers.exception import ServiceError
 
+from .entry import Entry, EntryLookup
+
 logger = logging.getLogger(__name__)
 
 
 class ImportService:
-    def __init__(self, entry_creator, entry_associator, entry_updater):
+    def __init__(self, entry_creator, entry_associator, entry_updater, user_import_dao):
         self.entry_creator = entry_creator
         self.entry_associator = entry_associator
         self.entry_updater = entry_updater
+        self.user_import_dao = user_import_dao
 
     def import_rows(self, parser, tenant_uuid):
+        start_time = time.monotonic()
         tenant_dao.find_or_create_tenant(tenant_uuid)
-        created = []
-        errors = []
 
-        for row in parser:
+        # Validate every row before touching the database
+        parsed_rows, errors = self.parse_rows(parser)
+        if errors:
+            return [], errors
+
+        lookup = EntryLookup.from_entry_dicts(
+            self.user_import_dao,
+            [entry_dict for _, entry_dict in parsed_rows],
+            tenant_uuid,
+        )
+
+        created = []
+        for row, entry_dict in parsed_rows:
+            entry = Entry(row.position, entry_dict, lookup)
             try:
-                entry = self.create_entry(row, tenant_uuid)
+                self.create_entry(entry, tenant_uuid)
                 created.append(entry)
             except (ServiceError, ValidationError) as e:
                 logger.warn("Error importing CSV row %s: %s", row.position, e)
                 errors.append(row.format_error(e))
 
+        elapsed = time.monotonic() - start_time
+        logger.info(
+            'Imported %s CSV rows in %.2fs (%.1f rows/s)',
+            len(created),
+            elapsed,
+            len(created) / elapsed if elapsed else 0,
+        )
         return created, errors
 
-    def create_entry(self, row, tenant_uuid):
-        entry = self.entry_creator.create(row, tenant_uuid=tenant_uuid)
+    def parse_rows(self, parser):
+        parsed_rows = []
+        errors = []
+        for row in parser:
+            try:
+                parsed_rows.append((row, row.parse()))
+            except (ServiceError, ValidationError) as e:
+                logger.warn("Error parsing CSV row %s: %s", row.position, e)
+                errors.append(row.format_error(e))
+        return parsed_rows, errors
+
+    def create_entry(self, entry, tenant_uuid):
+        self.entry_creator.create(entry, tenant_uuid)
         self.entry_associator.associate(entry)
         return entry
 
@@ -56,29 +91,54 @@ class ImportService:
 
 
 class ExportService:
-    def __init__(self, user_export_dao, auth_client):
+    def __init__(self, user_export_dao, auth_client, batch_size=1000):
         self._user_export_dao = user_export_dao
         self._auth_client = auth_client
+        self._batch_size = batch_size
 
     def export(self, tenant_uuid):
-        csv_header, users = self._user_export_dao.export_query(tenant_uuid)
-        users = list(self._format_users(csv_header, users))
-
-        wazo_users = self._auth_client.users.list(tenant_uuid=tenant_uuid)['items']
-        wazo_users = {user['uuid']: user for user in wazo_users}
+        csv_header = self._user_export_dao.COLUMNS + ('username',)
+        return csv_header, self._export_users(tenant_uuid)
+
+    def _export_users(self, tenant_uuid):
+        # Rows are produced while the response is streamed, after the request
+        # session has been removed. The query needs its own session.
+        with session_scope():
+            csv_header, users = self._user_export_dao.export_query(tenant_uuid)
+            users = self._format_users(csv_header, users.yield_per(self._batch_size))
+            yield from self._join_usernames(tenant_uuid, users)
+
+    def _join_usernames(self, tenant_uuid, users):
+        # users and wazo users are both ordered by uuid
+        wazo_users = self._list_wazo_users(tenant_uuid)
+        wazo_user = next(wazo_users, None)
         for user in users:
-            if user['uuid'] in wazo_users:
-                wazo_user = wazo_users[user['uuid']]
+            while wazo_user and wazo_user['uuid'] < user['uuid']:
+                wazo_user = next(wazo_users, None)
+
+            if wazo_user and wazo_user['uuid'] == user['uuid']:
                 user['username'] = wazo_user['username']
             else:
                 logger.warning(
                     "User '%s' has no wazo-auth user associated. Please create one with same uuid",
                     user['uuid'],
                 )
-
-        csv_header = csv_header + ('username',)
-
-        return csv_header, users
+            yield user
+
+    def _list_wazo_users(self, tenant_uuid):
+        offset = 0
+        while True:
+            wazo_users = self._auth_client.users.list(
+                tenant_uuid=tenant_uuid,
+                order='uuid',
+                direction='asc',
+                limit=self._batch_size,
+                offset=offset,
+            )['items']
+            yield from wazo_users
+            if len(wazo_users) < self._batch_size:
+                return
+            offset += len(wazo_users)
 
     def _format_users(self, header, users):
         for user in users:
@@ -0,0 +1,140 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+
+from hamcrest import assert_that, contains_exactly, equal_to, none
+from unittest.mock import Mock, sentinel as s
+
+from ..entry import Entry, EntryLookup
+
+
+def _entry_dict(**resources):
+    entry_dict = {
+        'context': {},
+        'voicemail': {},
+        'extension': {},
+        'extension_incall': {},
+        'incall': {},
+        'call_permissions': {},
+    }
+    entry_dict.update(resources)
+    return entry_dict
+
+
+class TestEntryLookup(unittest.TestCase):
+    def test_from_entry_dicts_queries_each_table_once(self):
+        dao = Mock()
+        entry_dicts = [
+            _entry_dict(
+                context={'context': 'default'},
+                voicemail={'number': '1000', 'context': 'default'},
+                extension={'exten': '1000', 'context': 'default'},
+                call_permissions={'names': ['a', 'b']},
+            ),
+            _entry_dict(
+                context={'context': 'default'},
+                extension={'exten': '1001', 'context': 'default'},
+                extension_incall={'exten': '5551001', 'context': 'from-extern'},
+                incall={'exten': '5551001', 'context': 'from-extern'},
+                call_permissions={'names': ['b']},
+            ),
+        ]
+
+        EntryLookup.from_entry_dicts(dao, entry_dicts, s.tenant_uuid)
+
+        dao.find_contexts.assert_called_once_with(s.tenant_uuid, ['default'])
+        dao.find_voicemails.assert_called_once_with([('1000', 'default')])
+        assert_that(
+            sorted(dao.find_extensions.call_args[0][0]),
+            contains_exactly(
+                ('1000', 'default'),
+                ('1001', 'default'),
+                ('5551001', 'from-extern'),
+            ),
+        )
+        dao.find_incalls.assert_called_once_with([('5551001', 'from-extern')])
+        assert_that(
+            sorted(dao.find_call_permissions.call_args[0][1]),
+            contains_exactly('a', 'b'),
+        )
+
+    def test_find_preloaded(self):
+        lookup = EntryLookup(extensions={('1000', 'default'): s.extension})
+
+        result = lookup.find('extension', {'exten': '1000', 'context': 'default'})
+
+        assert_that(result, equal_to((True, s.extension)))
+
+    def test_find_missing_is_answered(self):
+        lookup = EntryLookup()
+
+        found, model = lookup.find('voicemail', {'number': '1', 'context': 'ctx'})
+
+        assert_that(found, equal_to(True))
+        assert_that(model, none())
+
+    def test_find_missing_context_is_not_answered(self):
+        lookup = EntryLookup()
+
+        result = lookup.find('context', {'context': 'unknown'})
+
+        assert_that(result, equal_to((False, None)))
+
+    def test_find_call_permissions_with_unknown_name_is_not_answered(self):
+        lookup = EntryLookup(call_permissions={'a': s.a})
+
+        result = lookup.find('call_permissions', {'names': ['a', 'b']})
+
+        assert_that(result, equal_to((False, None)))
+
+    def test_created_resources_are_found_by_next_rows(self):
+        lookup = EntryLookup()
+        fields = {'exten': '1000', 'context': 'default'}
+
+        lookup.add('extension', fields, s.extension)
+
+        assert_that(lookup.find('extension', fields), equal_to((True, s.extension)))
+        assert_that(
+            lookup.find('extension_incall', fields), equal_to((True, s.extension))
+        )
+
+
+class TestEntry(unittest.TestCase):
+    def test_find_or_create_uses_lookup_before_creator(self):
+        lookup = EntryLookup(voicemails={('1000', 'default'): s.voicemail})
+        entry = Entry(
+            1, {'voicemail': {'number': '1000', 'context': 'default'}}, lookup
+        )
+        creator = Mock()
+
+        entry.find_or_create('voicemail', creator, s.tenant_uuid)
+
+        creator.find.assert_not_called()
+        creator.create.assert_not_called()
+        assert_that(entry.voicemail, equal_to(s.voicemail))
+
+    def test_find_or_create_creates_missing_and_adds_to_lookup(self):
+        lookup = EntryLookup()
+        fields = {'exten': '1000', 'context': 'default'}
+        entry = Entry(1, {'extension': dict(fields)}, lookup)
+        creator = Mock()
+        creator.create.return_value = s.extension
+
+        entry.find_or_create('extension', creator, s.tenant_uuid)
+
+        creator.find.assert_not_called()
+        assert_that(entry.extension, equal_to(s.extension))
+        assert_that(lookup.find('extension', fields), equal_to((True, s.extension)))
+
+    def test_find_without_lookup_uses_creator(self):
+        entry = Entry(1, {'voicemail': {'number': '1000', 'context': 'default'}})
+        creator = Mock()
+        creator.find.return_value = s.voicemail
+
+        entry.find_or_create('voicemail', creator, s.tenant_uuid)
+
+        creator.find.assert_called_once_with(
+            {'number': '1000', 'context': 'default'}, s.tenant_uuid
+        )
+        assert_that(entry.voicemail, equal_to(s.voicemail))
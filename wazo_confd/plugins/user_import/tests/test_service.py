@@ -0,0 +1,76 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+
+from hamcrest import assert_that, contains_exactly, has_entries, has_key, not_
+from unittest.mock import Mock, patch, sentinel as s
+
+from ..service import ExportService
+
+
+@patch('wazo_confd.plugins.user_import.service.session_scope')
+class TestExportService(unittest.TestCase):
+    def setUp(self):
+        self.user_export_dao = Mock(COLUMNS=('uuid', 'firstname'))
+        self.auth_client = Mock()
+        self.service = ExportService(
+            self.user_export_dao, self.auth_client, batch_size=2
+        )
+
+    def given_users(self, *rows):
+        query = Mock()
+        query.yield_per.return_value = iter(rows)
+        self.user_export_dao.export_query.return_value = (('uuid', 'firstname'), query)
+
+    def given_wazo_user_pages(self, *pages):
+        self.auth_client.users.list.side_effect = [{'items': page} for page in pages]
+
+    def test_export_header(self, session_scope):
+        header, _ = self.service.export(s.tenant_uuid)
+
+        assert_that(header, contains_exactly('uuid', 'firstname', 'username'))
+
+    def test_export_is_lazy(self, session_scope):
+        self.service.export(s.tenant_uuid)
+
+        self.user_export_dao.export_query.assert_not_called()
+        self.auth_client.users.list.assert_not_called()
+
+    def test_export_joins_usernames_from_auth_pages(self, session_scope):
+        self.given_users(('a', 'Alice'), ('b', None), ('c', 'Carol'), ('e', 'Eve'))
+        self.given_wazo_user_pages(
+            [{'uuid': 'a', 'username': 'alice'}, {'uuid': 'b', 'username': 'bob'}],
+            [{'uuid': 'c', 'username': 'carol'}, {'uuid': 'd', 'username': 'dan'}],
+            [],
+        )
+
+        _, users = self.service.export(s.tenant_uuid)
+
+        assert_that(
+            list(users),
+            contains_exactly(
+                has_entries(uuid='a', firstname='Alice', username='alice'),
+                has_entries(uuid='b', firstname='', username='bob'),
+                has_entries(uuid='c', firstname='Carol', username='carol'),
+                has_entries(uuid='e', firstname='Eve'),
+            ),
+        )
+        self.user_export_dao.export_query.return_value[
+            1
+        ].yield_per.assert_called_once_with(2)
+        self.auth_client.users.list.assert_called_with(
+            tenant_uuid=s.tenant_uuid,
+            order='uuid',
+            direction='asc',
+            limit=2,
+            offset=4,
+        )
+
+    def test_export_user_without_wazo_user(self, session_scope):
+        self.given_users(('a', 'Alice'))
+        self.given_wazo_user_pages([])
+
+        _, users = self.service.export(s.tenant_uuid)
+
+        assert_that(list(users), contains_exactly(not_(has_key('username'))))
@@ -1,4 +1,4 @@
-# Copyright 2016-2019 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2016-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
@@ -18,6 +18,7 @@ class Plugin:
     def load(self, dependencies):
         api = dependencies['api']
         config = dependencies['config']
+        http_pools = dependencies['http_pools']
         service_id = config['wizard']['service_id']
         service_key = config['wizard']['service_key']
         auth_config = dict(config['auth'])
@@ -29,10 +30,11 @@ class Plugin:
             )
             return
 
-        auth_client = AuthClient(
-            username=service_id, password=service_key, **auth_config
+        auth_client = http_pools.attach(
+            'auth', AuthClient(username=service_id, password=service_key, **auth_config)
         )
-        provd_client = ProvdClient(**config['provd'])
+        # the wizard sets its own token on this client
+        provd_client = http_pools.attach('provd', ProvdClient(**config['provd']))
 
         service = build_service(provd_client, auth_client, infos_dao)
 
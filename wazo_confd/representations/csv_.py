@@ -1,10 +1,12 @@
-# Copyright 2016-2019 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2016-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import csv
 
 from io import StringIO
-from flask import json, make_response
+from flask import Response, json, make_response
+
+ROWS_PER_CHUNK = 500
 
 
 def output_csv(data, code, http_headers=None):
@@ -15,13 +17,27 @@ def output_csv(data, code, http_headers=None):
     csv_headers = data['headers']
     csv_entries = data['content']
 
+    response = Response(_generate_csv(csv_headers, csv_entries), code)
+    response.headers.extend(http_headers or {})
+    return response
+
+
+def _generate_csv(csv_headers, csv_entries):
+    # entries may be a generator, rows are written by chunks as they come
     csv_text = StringIO()
     writer = csv.DictWriter(csv_text, csv_headers)
     writer.writeheader()
 
-    for entry in csv_entries:
+    for position, entry in enumerate(csv_entries, 1):
         writer.writerow(entry)
+        if position % ROWS_PER_CHUNK == 0:
+            yield _pop_text(csv_text)
 
-    response = make_response(csv_text.getvalue(), code)
-    response.headers.extend(http_headers or {})
-    return response
+    yield _pop_text(csv_text)
+
+
+def _pop_text(csv_text):
+    text = csv_text.getvalue()
+    csv_text.seek(0)
+    csv_text.truncate()
+    return text
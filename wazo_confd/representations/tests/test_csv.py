@@ -1,11 +1,11 @@
-# Copyright 2016-2019 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2016-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from unittest import TestCase
 
-from hamcrest import assert_that, equal_to, has_entry
+from hamcrest import assert_that, equal_to, has_entry, has_length
 
-from ..csv_ import output_csv
+from ..csv_ import ROWS_PER_CHUNK, output_csv
 
 SOME_STATUS_CODE = 200
 SOME_INPUT = {'headers': [], 'content': []}
@@ -44,3 +44,12 @@ class TestCSVRepresentation(TestCase):
 
         assert_that(result.status_code, equal_to(200))
         assert_that(result.headers, has_entry('my-header', 'my-value'))
+
+    def test_csv_streamed_by_chunks(self):
+        body = ({'a': i} for i in range(ROWS_PER_CHUNK + 1))
+        result = output_csv({'headers': ['a'], 'content': body}, SOME_STATUS_CODE)
+
+        chunks = list(result.response)
+
+        assert_that(chunks, has_length(2))
+        assert_that(chunks[1], equal_to('{}\r\n'.format(ROWS_PER_CHUNK)))
@@ -0,0 +1,128 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from collections import defaultdict
+from unittest import TestCase
+from unittest.mock import Mock, sentinel as s
+
+from hamcrest import (
+    assert_that,
+    calling,
+    close_to,
+    equal_to,
+    has_entries,
+    not_,
+    has_key,
+    raises,
+    same_instance,
+)
+from requests.exceptions import ConnectionError
+from xivo.status import Status
+
+from .._http_pools import HTTPPool, HTTPPools, LatencyHistogram
+
+
+def _session():
+    session = Mock(headers={'Connection': 'close', 'X-Auth-Token': s.token})
+    session.request.return_value = s.response
+    return session
+
+
+class TestLatencyHistogram(TestCase):
+    def test_snapshot_counts_are_cumulative(self):
+        histogram = LatencyHistogram(buckets=(0.1, 1))
+
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+
+        assert_that(
+            histogram.snapshot(),
+            has_entries(
+                buckets={'0.1': 1, '1': 2, '+Inf': 3},
+                count=3,
+                sum=close_to(5.55, 0.001),
+            ),
+        )
+
+
+class TestHTTPPool(TestCase):
+    def setUp(self):
+        self.pool = HTTPPool('provd', pool_size=2, timeout=5)
+
+    def test_mount_shares_the_connections(self):
+        session = _session()
+        request = session.request
+
+        self.pool.mount(session)
+        response = session.request('GET', 'http://provd/devices')
+
+        assert_that(response, equal_to(s.response))
+        assert_that(session.headers, not_(has_key('Connection')))
+        assert_that(session.mount.call_count, equal_to(2))
+        request.assert_called_once_with('GET', 'http://provd/devices', timeout=5)
+        assert_that(self.pool.latencies.snapshot(), has_entries(count=1))
+
+    def test_given_timeout_is_kept(self):
+        session = self.pool.mount(_session())
+        request = session.request.args[0]
+
+        session.request('GET', 'http://provd/devices', timeout=1)
+
+        request.assert_called_once_with('GET', 'http://provd/devices', timeout=1)
+
+    def test_errors_are_counted(self):
+        session = _session()
+        session.request.side_effect = ConnectionError
+        self.pool.mount(session)
+
+        assert_that(
+            calling(session.request).with_args('GET', 'http://provd'),
+            raises(ConnectionError),
+        )
+        assert_that(self.pool.provide_status(), has_entries(errors=1))
+
+    def test_attach_mounts_each_session_of_the_client(self):
+        session = _session()
+        client = Mock()
+        client.session.return_value = session
+
+        self.pool.attach(client)
+
+        assert_that(client.session(), same_instance(session))
+        assert_that(session.headers, equal_to({'X-Auth-Token': s.token}))
+
+
+class TestHTTPPools(TestCase):
+    def setUp(self):
+        self.pools = HTTPPools()
+        self.pools.configure({'provd': {'pool_size': 2, 'timeout': 5}})
+
+    def test_pools_are_created_once_by_service(self):
+        pool = self.pools.get('provd')
+
+        assert_that(self.pools.get('provd'), same_instance(pool))
+        assert_that(pool.timeout, equal_to(5))
+        assert_that(self.pools.get('ari').timeout, equal_to(10))
+
+    def test_provide_status(self):
+        self.pools.get('provd')
+        status = defaultdict(dict)
+
+        self.pools.provide_status(status)
+
+        assert_that(
+            status['http_pools'],
+            has_entries(status=Status.ok, provd=has_entries(errors=0)),
+        )
+
+    def test_subscribers_get_each_call(self):
+        callback = Mock()
+        self.pools.subscribe(callback)
+        session = self.pools.get('provd').mount(_session())
+
+        session.request('GET', 'http://provd/devices')
+
+        name, seconds = callback.call_args[0]
+        assert_that(name, equal_to('provd'))
+        assert_that(seconds, close_to(0, 1))
@@ -0,0 +1,112 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+
+from flask import Flask
+from hamcrest import (
+    assert_that,
+    contains_exactly,
+    contains_string,
+    empty,
+    equal_to,
+    has_entries,
+    has_key,
+    not_,
+)
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+
+from .._metrics import Metrics
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = Metrics()
+        self.app = Flask(__name__)
+        self.metrics.init_app(self.app)
+        self.addCleanup(self._remove_listeners)
+        self.engine = create_engine('sqlite://')
+
+        @self.app.route('/users/<int:id>')
+        def get_user(id):
+            self.engine.execute('SELECT 1').fetchall()
+            self.engine.execute('SELECT 2').fetchall()
+            self.metrics.record_call('provd', 0.5)
+            self.metrics.record_bus_events(3)
+            return 'user'
+
+        @self.app.route('/error')
+        def error():
+            return 'error', 503
+
+        self.client = self.app.test_client()
+
+    def _remove_listeners(self):
+        event.remove(
+            Engine, 'before_cursor_execute', self.metrics._before_cursor_execute
+        )
+        event.remove(Engine, 'after_cursor_execute', self.metrics._after_cursor_execute)
+
+    def test_counters_by_endpoint(self):
+        self.client.get('/users/1')
+        self.client.get('/users/2')
+        self.client.get('/error')
+
+        endpoints = self.metrics.snapshot()['endpoints']
+        assert_that(
+            endpoints['GET /users/<int:id>'],
+            has_entries(
+                requests=2,
+                errors=0,
+                latency=has_entries(count=2),
+                db_queries=4,
+                calls={'provd': {'count': 2, 'time': 1.0}},
+                bus_events=6,
+                response_bytes=8,
+            ),
+        )
+        assert_that(endpoints['GET /error'], has_entries(requests=1, errors=1))
+
+    def test_queries_outside_requests_are_not_counted(self):
+        self.engine.execute('SELECT 1').fetchall()
+        self.client.get('/error')
+
+        endpoint = self.metrics.snapshot()['endpoints']['GET /error']
+        assert_that(endpoint, has_entries(db_queries=0))
+
+    def test_queries_are_counted_once_when_initialized_twice(self):
+        self.metrics.init_app(Flask(__name__))
+
+        self.client.get('/users/1')
+
+        endpoint = self.metrics.snapshot()['endpoints']['GET /users/<int:id>']
+        assert_that(endpoint, has_entries(db_queries=2))
+
+    def test_unknown_urls_are_not_counted(self):
+        self.client.get('/unknown')
+
+        assert_that(self.metrics.snapshot()['endpoints'], empty())
+
+    def test_disabled(self):
+        self.metrics.enabled = False
+
+        self.client.get('/users/1')
+
+        assert_that(
+            self.metrics.snapshot()['endpoints'], not_(has_key('GET /users/<int:id>'))
+        )
+
+    def test_slowest_profiles_are_kept(self):
+        self.metrics.profile_sample_rate = 1
+        self.metrics.profile_keep = 1
+
+        self.client.get('/users/1')
+        self.client.get('/error')
+
+        profiles = self.metrics.snapshot()['profiles']
+        assert_that(
+            profiles,
+            contains_exactly(has_entries(stats=contains_string('function calls'))),
+        )
+        assert_that(self.metrics._profiler_lock.locked(), equal_to(False))
@@ -0,0 +1,68 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+
+from hamcrest import assert_that, contains_exactly, equal_to, has_entries, is_not
+from unittest.mock import Mock, patch, sentinel
+
+from .._plugins import LazyService, PluginLoader
+
+
+@patch('wazo_confd._plugins.NamedExtensionManager')
+class TestPluginLoader(unittest.TestCase):
+    def setUp(self):
+        self.loader = PluginLoader()
+
+    def test_enabled_plugins_are_loaded_in_order(self, manager):
+        extensions = {'foo': Mock(), 'bar': Mock()}
+        manager.side_effect = lambda namespace, names, **kwargs: [extensions[names[0]]]
+
+        self.loader.load(
+            'wazo_confd.plugins',
+            {'foo': True, 'baz': False, 'bar': True},
+            {'api': sentinel.api},
+        )
+
+        assert_that(list(self.loader.timings), contains_exactly('foo', 'bar'))
+        for extension in extensions.values():
+            dependencies = extension.obj.load.call_args[0][0]
+            assert_that(
+                dependencies, has_entries(api=sentinel.api, lazy=self.loader.lazy)
+            )
+
+    def test_failing_plugin_does_not_stop_loading(self, manager):
+        failing, other = Mock(), Mock()
+        failing.obj.load.side_effect = Exception()
+        manager.side_effect = [[failing], [other]]
+
+        self.loader.load('wazo_confd.plugins', {'foo': True, 'bar': True}, {})
+
+        other.obj.load.assert_called_once()
+
+
+class TestLazy(unittest.TestCase):
+    def test_service_is_built_right_away_by_default(self):
+        factory = Mock()
+
+        service = PluginLoader().lazy(factory, sentinel.dao, option=True)
+
+        factory.assert_called_once_with(sentinel.dao, option=True)
+        assert_that(service, equal_to(factory.return_value))
+
+    def test_service_is_built_on_first_use(self):
+        factory = Mock()
+        factory.return_value.find.return_value = sentinel.result
+
+        service = PluginLoader(lazy=True).lazy(factory, sentinel.dao)
+
+        factory.assert_not_called()
+        assert_that(service, is_not(equal_to(factory.return_value)))
+        assert_that(service.find(), equal_to(sentinel.result))
+        service.find()
+        factory.assert_called_once_with(sentinel.dao)
+
+    def test_proxy_attributes_do_not_hide_the_service(self):
+        service = LazyService(Mock, _factory=sentinel.factory)
+
+        assert_that(service._factory, equal_to(sentinel.factory))
@@ -0,0 +1,95 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+
+from flask import Flask
+from hamcrest import assert_that, contains_string, equal_to, has_length
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from unittest.mock import patch
+
+from .._query_detector import QueryDetector, query_budget, _shape
+
+
+class TestShape(unittest.TestCase):
+    def test_parameter_lists_are_collapsed(self):
+        statement = (
+            'SELECT *\n  FROM user WHERE id IN (%(id_1)s, %(id_2)s) AND x = %(x)s'
+        )
+
+        assert_that(
+            _shape(statement),
+            equal_to('SELECT * FROM user WHERE id IN (...) AND x = %(x)s'),
+        )
+
+
+class TestQueryDetector(unittest.TestCase):
+    def setUp(self):
+        self.detector = QueryDetector(enabled=True, threshold=3)
+        patcher = patch('wazo_confd._query_detector.query_detector', self.detector)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._remove_listener)
+
+        self.app = Flask(__name__)
+        self.detector.init_app(self.app)
+        self.engine = create_engine('sqlite://')
+
+        @self.app.route('/loop/<int:count>')
+        @query_budget(4)
+        def loop(count):
+            for i in range(count):
+                self.engine.execute('SELECT ?', i).fetchall()
+            return 'ok'
+
+        @self.app.route('/items/<int:count>')
+        @query_budget(1, per_item=2, items=lambda count: range(count))
+        def items(count):
+            for i in range(2 * count + 1):
+                self.engine.execute('SELECT ?', i).fetchall()
+            return 'ok'
+
+        self.client = self.app.test_client()
+
+    def _remove_listener(self):
+        event.remove(
+            Engine, 'before_cursor_execute', self.detector._before_cursor_execute
+        )
+
+    def test_repeated_statements_are_logged_with_their_stack(self):
+        with self.assertLogs('wazo_confd._query_detector', 'WARNING') as logs:
+            self.client.get('/loop/3')
+
+        assert_that(logs.output, has_length(1))
+        assert_that(logs.output[0], contains_string('executed 3 times: SELECT ?'))
+        assert_that(logs.output[0], contains_string('in loop'))
+
+    def test_budget_exceeded_is_logged(self):
+        with self.assertLogs('wazo_confd._query_detector', 'WARNING') as logs:
+            response = self.client.get('/loop/5')
+
+        assert_that(response.status_code, equal_to(200))
+        assert_that(logs.output[0], contains_string('made 5 SQL queries'))
+
+    def test_budget_exceeded_fails_the_request_when_enforced(self):
+        self.detector.enforce_budgets = True
+
+        response = self.client.get('/loop/5')
+
+        assert_that(response.status_code, equal_to(500))
+
+    def test_budget_grows_with_the_items(self):
+        self.detector.enforce_budgets = True
+        self.detector.threshold = 100
+
+        response = self.client.get('/items/10')
+
+        assert_that(response.status_code, equal_to(200))
+
+    def test_disabled_detector_registers_nothing(self):
+        app = Flask(__name__)
+
+        QueryDetector(enabled=False).init_app(app)
+
+        assert_that(app.before_request_funcs, equal_to({}))
@@ -1,12 +1,30 @@
-# Copyright 2013-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2013-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from unittest import TestCase
 
-from unittest.mock import patch, Mock
-from hamcrest import assert_that, equal_to, has_entries, has_items
-
-from .._sysconfd import SysconfdPublisher
+from flask import Flask
+from unittest.mock import patch, Mock, sentinel as s
+from xivo.status import Status
+from hamcrest import (
+    assert_that,
+    calling,
+    contains_exactly,
+    contains_inanyorder,
+    equal_to,
+    has_entries,
+    has_items,
+    none,
+    raises,
+)
+
+from .._sysconfd import (
+    LiveReloadState,
+    ReloadScheduler,
+    SysconfdDispatcher,
+    SysconfdError,
+    SysconfdPublisher,
+)
 
 
 class TestSysconfdClient(TestCase):
@@ -213,3 +231,314 @@ class TestSysconfdClient(TestCase):
         self.session.request.assert_called_once_with(
             'DELETE', url, params={'name': moh_name}
         )
+
+
+class TestSysconfdDispatcher(TestCase):
+    def setUp(self):
+        session_init_patch = patch('wazo_confd._sysconfd.requests.Session')
+        session_init = session_init_patch.start()
+        self.addCleanup(session_init_patch.stop)
+        self.session = session_init.return_value
+        self.session.request.return_value = Mock(status_code=200)
+        self.url = "http://localhost:8668"
+        self.dispatcher = SysconfdDispatcher(self.url, coalesce_delay=60)
+        self.publisher = SysconfdPublisher(self.url, Mock())
+
+    def dispatch_all(self):
+        # stop() sends every job queued before it
+        self.dispatcher.start()
+        self.dispatcher.stop()
+
+    def test_handlers_of_jobs_are_merged(self):
+        for command in ('dialplan reload', 'dialplan reload', 'module reload x'):
+            self.publisher.add_handlers({'ipbx': [command]})
+            self.publisher.dispatch(self.dispatcher)
+
+        self.dispatch_all()
+
+        self.session.request.assert_called_once()
+        method, url = self.session.request.call_args[0]
+        assert_that(url, equal_to('http://localhost:8668/exec_request_handlers'))
+        assert_that(
+            self.session.request.call_args[1]['json'],
+            has_entries(ipbx=contains_inanyorder('dialplan reload', 'module reload x')),
+        )
+
+    def test_handlers_are_sent_before_the_requests_of_their_job(self):
+        self.publisher.add_handlers({'ipbx': ['dialplan reload']})
+        self.publisher.dispatch(self.dispatcher)
+        self.publisher.add_handlers({'ipbx': ['module reload x']})
+        self.publisher.delete_moh('moh')
+        self.publisher.dispatch(self.dispatcher)
+        self.publisher.add_handlers({'ipbx': ['module reload y']})
+        self.publisher.dispatch(self.dispatcher)
+
+        self.dispatch_all()
+
+        urls = [call[0][1] for call in self.session.request.call_args_list]
+        assert_that(
+            urls,
+            contains_exactly(
+                'http://localhost:8668/exec_request_handlers',
+                'http://localhost:8668/moh',
+                'http://localhost:8668/exec_request_handlers',
+            ),
+        )
+
+    def test_publisher_is_reset_after_dispatch(self):
+        self.publisher.add_handlers({'ipbx': ['dialplan reload']})
+
+        self.publisher.dispatch(self.dispatcher)
+
+        assert_that(self.publisher.handlers, equal_to({}))
+
+    def test_empty_job_is_not_queued(self):
+        job = self.publisher.dispatch(self.dispatcher)
+
+        assert_that(job, none())
+
+    def test_wait_raises_sysconfd_errors(self):
+        self.session.request.return_value = Mock(status_code=500)
+        self.publisher.delete_moh('moh')
+        job = self.publisher.dispatch(self.dispatcher)
+
+        self.dispatch_all()
+
+        assert_that(calling(self.dispatcher.wait).with_args(job), raises(SysconfdError))
+
+    def test_error_of_a_job_does_not_drop_the_others(self):
+        self.session.request.side_effect = [
+            Mock(status_code=500),
+            Mock(status_code=200),
+        ]
+        self.publisher.delete_moh('first')
+        failed_job = self.publisher.dispatch(self.dispatcher)
+        self.publisher.delete_moh('second')
+        job = self.publisher.dispatch(self.dispatcher)
+
+        self.dispatch_all()
+
+        assert_that(self.session.request.call_count, equal_to(2))
+        assert_that(
+            calling(self.dispatcher.wait).with_args(failed_job),
+            raises(SysconfdError),
+        )
+        self.dispatcher.wait(job)
+
+    def test_wait_times_out_when_the_dispatcher_is_stopped(self):
+        self.publisher.delete_moh('moh')
+        job = self.publisher.dispatch(self.dispatcher)
+
+        assert_that(
+            calling(self.dispatcher.wait).with_args(job, timeout=0),
+            raises(SysconfdError),
+        )
+
+    def test_reloads_are_rate_limited_and_flushed_on_stop(self):
+        self.dispatcher = SysconfdDispatcher(
+            self.url, coalesce_delay=0, reload_interval=60
+        )
+        self.dispatcher.start()
+        for _ in range(3):
+            self.publisher.add_handlers({'ipbx': ['dialplan reload']})
+            job = self.publisher.dispatch(self.dispatcher)
+            self.dispatcher.wait(job)
+
+        self.dispatcher.stop()
+
+        assert_that(self.session.request.call_count, equal_to(2))
+
+    def test_reloads_of_a_job_with_requests_are_not_delayed(self):
+        self.dispatcher = SysconfdDispatcher(
+            self.url, coalesce_delay=0, reload_interval=60
+        )
+        self.dispatcher.start()
+        self.addCleanup(self.dispatcher.stop)
+        self.publisher.add_handlers({'ipbx': ['dialplan reload']})
+        self.dispatcher.wait(self.publisher.dispatch(self.dispatcher))
+        self.publisher.add_handlers({'ipbx': ['dialplan reload']})
+        self.publisher.delete_moh('moh')
+        self.dispatcher.wait(self.publisher.dispatch(self.dispatcher))
+
+        urls = [call[0][1] for call in self.session.request.call_args_list]
+        assert_that(
+            urls,
+            contains_exactly(
+                'http://localhost:8668/exec_request_handlers',
+                'http://localhost:8668/exec_request_handlers',
+                'http://localhost:8668/moh',
+            ),
+        )
+
+    def test_urgent_job_reloads_are_not_delayed(self):
+        self.dispatcher = SysconfdDispatcher(
+            self.url, coalesce_delay=0, reload_interval=60
+        )
+        self.dispatcher.start()
+        self.addCleanup(self.dispatcher.stop)
+        for _ in range(2):
+            self.publisher.add_handlers({'ipbx': ['dialplan reload']})
+            job = self.publisher.dispatch(self.dispatcher, urgent=True)
+            self.dispatcher.wait(job)
+
+        assert_that(self.session.request.call_count, equal_to(2))
+
+    def test_failed_reloads_stay_pending(self):
+        self.session.request.return_value = Mock(status_code=500)
+        self.publisher.add_handlers({'ipbx': ['dialplan reload']})
+        self.publisher.dispatch(self.dispatcher, urgent=True)
+
+        self.dispatch_all()
+
+        assert_that(self.dispatcher._reload_scheduler.pending_count, equal_to(1))
+
+    def test_provide_status(self):
+        status = {'sysconfd_dispatcher': {}}
+        self.publisher.delete_moh('moh')
+        self.publisher.dispatch(self.dispatcher)
+
+        self.dispatch_all()
+        self.dispatcher.provide_status(status)
+
+        assert_that(
+            status['sysconfd_dispatcher'],
+            has_entries(status=Status.fail, queue_size=0, jobs=1, errors=0),
+        )
+
+
+class TestReloadScheduler(TestCase):
+    def setUp(self):
+        self.scheduler = ReloadScheduler(interval=10)
+
+    def send_due(self, now, force=False):
+        handlers, contexts = self.scheduler.due(now, force)
+        self.scheduler.sent(handlers, now)
+        return handlers, contexts
+
+    def test_first_reload_is_sent_immediately(self):
+        self.scheduler.add({'ipbx': {'dialplan reload'}}, [])
+
+        handlers, _ = self.send_due(now=100)
+
+        assert_that(handlers, equal_to({'ipbx': {'dialplan reload'}}))
+
+    def test_reloads_during_interval_are_sent_once_when_it_expires(self):
+        self.scheduler.add({'ipbx': {'dialplan reload'}}, [])
+        self.send_due(now=100)
+
+        for now in (101, 102, 103):
+            self.scheduler.add({'ipbx': {'dialplan reload'}}, [s.context])
+            handlers, _ = self.send_due(now=now)
+            assert_that(handlers, equal_to({}))
+        assert_that(self.scheduler.time_until_due(now=103), equal_to(7))
+
+        handlers, contexts = self.send_due(now=110)
+
+        assert_that(handlers, equal_to({'ipbx': {'dialplan reload'}}))
+        assert_that(contexts, equal_to([s.context] * 3))
+        assert_that(self.scheduler.time_until_due(now=110), none())
+        assert_that(self.scheduler.requested_count, equal_to(4))
+        assert_that(self.scheduler.sent_count, equal_to(2))
+
+    def test_interval_is_per_command(self):
+        self.scheduler.add({'ipbx': {'dialplan reload'}}, [])
+        self.send_due(now=100)
+
+        self.scheduler.add({'ipbx': {'dialplan reload', 'module reload x'}}, [])
+        handlers, _ = self.send_due(now=101)
+
+        assert_that(handlers, equal_to({'ipbx': {'module reload x'}}))
+        assert_that(self.scheduler.pending_count, equal_to(1))
+
+    def test_force_sends_pending_reloads(self):
+        self.scheduler.add({'ipbx': {'dialplan reload'}}, [])
+        self.send_due(now=100)
+        self.scheduler.add({'ipbx': {'dialplan reload'}}, [])
+
+        handlers, _ = self.send_due(now=101, force=True)
+
+        assert_that(handlers, equal_to({'ipbx': {'dialplan reload'}}))
+
+    def test_failed_reloads_are_retried_after_the_retry_delay(self):
+        self.scheduler = ReloadScheduler(interval=0, retry_delay=5)
+        self.scheduler.add({'ipbx': {'dialplan reload'}}, [s.context])
+        self.scheduler.due(now=100)
+
+        self.scheduler.failed(now=100)
+
+        assert_that(self.scheduler.due(now=101), equal_to(({}, [])))
+        assert_that(self.scheduler.time_until_due(now=101), equal_to(4))
+        handlers, contexts = self.send_due(now=105)
+        assert_that(handlers, equal_to({'ipbx': {'dialplan reload'}}))
+        assert_that(contexts, equal_to([s.context]))
+        assert_that(self.scheduler.pending_count, equal_to(0))
+
+    def test_contexts_are_sent_once_all_their_commands_are_sent(self):
+        self.scheduler.add({'ipbx': {'module reload res_pjsip.so'}}, [])
+        self.send_due(now=100)
+        self.scheduler.add(
+            {'ipbx': {'module reload res_pjsip.so', 'dialplan reload'}}, [s.meeting]
+        )
+        self.scheduler.add({'ipbx': {'dialplan reload'}}, [s.context])
+
+        handlers, contexts = self.send_due(now=101)
+
+        assert_that(handlers, equal_to({'ipbx': {'dialplan reload'}}))
+        assert_that(contexts, equal_to([s.context]))
+
+        handlers, contexts = self.send_due(now=110)
+
+        assert_that(handlers, equal_to({'ipbx': {'module reload res_pjsip.so'}}))
+        assert_that(contexts, equal_to([s.meeting]))
+
+
+class TestLiveReloadState(TestCase):
+    def setUp(self):
+        self.dao = Mock()
+        self.dao.is_live_reload_enabled.return_value = True
+        self.state = LiveReloadState(self.dao, ttl=10)
+        self.app = Flask(__name__)
+
+    def test_value_is_read_once_during_ttl(self):
+        with patch('time.monotonic', side_effect=[0, 5, 11, 11]):
+            assert_that(self.state.is_live_reload_enabled(), equal_to(True))
+            assert_that(self.state.is_live_reload_enabled(), equal_to(True))
+            assert_that(self.state.is_live_reload_enabled(), equal_to(True))
+
+        assert_that(self.dao.is_live_reload_enabled.call_count, equal_to(2))
+
+    def test_set_replaces_the_value(self):
+        self.state.is_live_reload_enabled()
+
+        self.state.set(False)
+
+        assert_that(self.state.is_live_reload_enabled(), equal_to(False))
+        self.dao.is_live_reload_enabled.assert_called_once_with()
+
+    def test_invalidate_reads_the_value_again(self):
+        self.state.is_live_reload_enabled()
+
+        self.state.invalidate()
+        self.state.is_live_reload_enabled()
+
+        assert_that(self.dao.is_live_reload_enabled.call_count, equal_to(2))
+
+    def test_edited_value_is_set_once_committed(self):
+        self.state.is_live_reload_enabled()
+
+        with self.app.test_request_context():
+            self.state.edited(False)
+            assert_that(self.state.is_live_reload_enabled(), equal_to(True))
+            self.state.committed()
+
+        assert_that(self.state.is_live_reload_enabled(), equal_to(False))
+
+    def test_edited_value_is_dropped_when_rolled_back(self):
+        self.state.is_live_reload_enabled()
+
+        with self.app.test_request_context():
+            self.state.edited(False)
+            self.state.rolled_back()
+            self.state.committed()
+
+        assert_that(self.state.is_live_reload_enabled(), equal_to(True))
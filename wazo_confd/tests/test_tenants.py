@@ -0,0 +1,225 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import threading
+import unittest
+
+from flask import Flask, g
+from hamcrest import assert_that, contains_inanyorder, equal_to, has_entries, none
+from unittest.mock import Mock, patch
+
+from xivo_dao.helpers.exception import NotFoundError
+
+from .._tenants import KnownTenants, TenantTree
+from ..helpers.common import handle_api_exception
+
+TENANTS = [
+    {'uuid': 'master', 'parent_uuid': 'master'},
+    {'uuid': 'top', 'parent_uuid': 'master'},
+    {'uuid': 'sub', 'parent_uuid': 'top'},
+    {'uuid': 'subsub', 'parent_uuid': 'sub'},
+    {'uuid': 'other', 'parent_uuid': 'master'},
+]
+
+
+class TestTenantTree(unittest.TestCase):
+    def setUp(self):
+        self.auth_client = Mock()
+        self.auth_client.tenants.list.return_value = {'items': TENANTS}
+        self.tree = TenantTree(self.auth_client, ttl=300)
+
+    def test_sub_tenants(self):
+        assert_that(
+            self.tree.visible_tenant_uuids('top'),
+            contains_inanyorder('top', 'sub', 'subsub'),
+        )
+        assert_that(self.tree.visible_tenant_uuids('subsub'), equal_to(['subsub']))
+        assert_that(
+            self.tree.visible_tenant_uuids('master'),
+            contains_inanyorder('master', 'top', 'sub', 'subsub', 'other'),
+        )
+        self.auth_client.tenants.list.assert_called_once_with()
+
+    def test_unknown_tenant(self):
+        assert_that(self.tree.visible_tenant_uuids('unknown'), none())
+
+    def test_not_configured(self):
+        tree = TenantTree()
+
+        assert_that(tree.visible_tenant_uuids('top'), none())
+
+    @patch('wazo_confd._tenants.time')
+    def test_tenants_are_listed_again_after_ttl(self, time):
+        time.monotonic.return_value = 100
+        self.tree.visible_tenant_uuids('top')
+        time.monotonic.return_value = 401
+        self.tree.visible_tenant_uuids('top')
+
+        assert_that(self.auth_client.tenants.list.call_count, equal_to(2))
+
+    def test_listing_error(self):
+        self.auth_client.tenants.list.side_effect = Exception('wazo-auth is down')
+
+        assert_that(self.tree.visible_tenant_uuids('top'), none())
+        assert_that(self.tree.visible_tenant_uuids('top'), none())
+        self.auth_client.tenants.list.assert_called_once_with()
+
+    def test_added_tenant(self):
+        self.tree.visible_tenant_uuids('top')
+
+        self.tree.add('new', 'sub')
+
+        assert_that(
+            self.tree.visible_tenant_uuids('top'),
+            contains_inanyorder('top', 'sub', 'subsub', 'new'),
+        )
+        self.auth_client.tenants.list.assert_called_once_with()
+
+    def test_added_tenant_of_unknown_parent_lists_tenants_again(self):
+        self.tree.visible_tenant_uuids('top')
+
+        self.tree.add('new', None)
+        self.tree.visible_tenant_uuids('top')
+
+        assert_that(self.auth_client.tenants.list.call_count, equal_to(2))
+
+    def test_removed_tenant(self):
+        self.tree.visible_tenant_uuids('top')
+
+        self.tree.remove('sub')
+
+        assert_that(self.tree.visible_tenant_uuids('top'), equal_to(['top']))
+        assert_that(self.tree.visible_tenant_uuids('subsub'), none())
+
+    def test_events_received_during_listing_are_applied(self):
+        def list_tenants():
+            self.tree.remove('other')
+            self.tree.add('new', 'top')
+            return {'items': TENANTS}
+
+        self.auth_client.tenants.list.side_effect = list_tenants
+
+        assert_that(self.tree.visible_tenant_uuids('other'), none())
+        assert_that(
+            self.tree.visible_tenant_uuids('top'),
+            contains_inanyorder('top', 'sub', 'subsub', 'new'),
+        )
+
+    def test_outdated_tenants_are_used_during_listing(self):
+        tree = TenantTree(self.auth_client, ttl=0)
+        tree.visible_tenant_uuids('top')
+        listing, release = threading.Event(), threading.Event()
+
+        def list_tenants():
+            listing.set()
+            release.wait(5)
+            return {'items': TENANTS}
+
+        self.auth_client.tenants.list.side_effect = list_tenants
+        thread = threading.Thread(target=tree.visible_tenant_uuids, args=('top',))
+        thread.start()
+        listing.wait(5)
+
+        result = tree.visible_tenant_uuids('sub')
+
+        release.set()
+        thread.join()
+        assert_that(result, contains_inanyorder('sub', 'subsub'))
+        assert_that(self.auth_client.tenants.list.call_count, equal_to(2))
+
+    def test_provide_status(self):
+        self.tree.visible_tenant_uuids('top')
+        self.tree.visible_tenant_uuids('unknown')
+        status = {'tenant_tree': {}}
+
+        self.tree.provide_status(status)
+
+        assert_that(
+            status['tenant_tree'],
+            has_entries(tenants=5, hits=1, misses=1, fetches=1, errors=0),
+        )
+
+
+class TestKnownTenants(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.dao = Mock()
+        self.tenants = KnownTenants(self.dao, ttl=300)
+
+    def ensure(self, tenant_uuid, committed=True):
+        with self.app.test_request_context():
+            self.tenants.ensure(tenant_uuid)
+            if committed:
+                self.tenants.committed()
+
+    def test_created_tenant_is_known_once_committed(self):
+        self.ensure('tenant')
+        self.ensure('tenant')
+
+        self.dao.find_or_create_tenant.assert_called_once_with('tenant')
+
+    def test_tenant_of_rolled_back_request_is_not_known(self):
+        self.ensure('tenant', committed=False)
+        self.ensure('tenant')
+
+        assert_that(self.dao.find_or_create_tenant.call_count, equal_to(2))
+
+    @patch('wazo_confd.helpers.common.Session')
+    def test_tenant_of_failed_resource_is_not_known(self, session):
+        @handle_api_exception
+        def post():
+            self.tenants.ensure('tenant')
+            raise NotFoundError('not found')
+
+        with patch('wazo_confd.helpers.common.known_tenants', self.tenants):
+            with self.app.test_request_context():
+                assert_that(post()[1], equal_to(404))
+                self.tenants.committed()
+        self.ensure('tenant')
+
+        session.rollback.assert_called_once_with()
+        assert_that(self.dao.find_or_create_tenant.call_count, equal_to(2))
+
+    def test_committed_without_tenant(self):
+        with self.app.test_request_context():
+            self.tenants.committed()
+
+            assert_that(g.get('created_tenant_uuids'), none())
+
+    @patch('wazo_confd._tenants.session_scope')
+    @patch('wazo_confd._tenants.tenant_db')
+    def test_tenants_are_loaded_from_the_database(self, tenant_db, session_scope):
+        tenant_db.find_all_uuids.return_value = {'tenant', 'other'}
+
+        self.tenants.load()
+        self.ensure('tenant')
+        self.ensure('other')
+
+        self.dao.find_or_create_tenant.assert_not_called()
+
+    def test_tenant_events(self):
+        self.tenants.add('added')
+        self.ensure('deleted')
+        self.tenants.discard('deleted')
+
+        self.ensure('added')
+        self.ensure('deleted')
+
+        assert_that(self.dao.find_or_create_tenant.call_count, equal_to(2))
+
+    @patch('wazo_confd._tenants.time')
+    def test_tenants_are_forgotten_after_ttl(self, time):
+        time.monotonic.return_value = 100
+        self.ensure('tenant')
+        time.monotonic.return_value = 401
+        self.ensure('tenant')
+
+        assert_that(self.dao.find_or_create_tenant.call_count, equal_to(2))
+
+    def test_disabled(self):
+        self.tenants.configure(ttl=0)
+
+        self.ensure('tenant')
+        self.ensure('tenant')
+
+        assert_that(self.dao.find_or_create_tenant.call_count, equal_to(2))
@@ -0,0 +1,159 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+
+from datetime import datetime, timedelta
+from functools import wraps
+
+from flask import Flask, request
+from hamcrest import assert_that, calling, equal_to, has_entries, raises
+from unittest.mock import Mock
+
+from .._token_cache import TokenCache
+
+
+class Unauthorized(Exception):
+    pass
+
+
+class FakeVerifier:
+    def __init__(self):
+        self.valid_tokens = {'valid-token'}
+        self.checks = []
+
+    def verify_token(self, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            acl = func.acl.format(**kwargs)
+            self.checks.append(acl)
+            if request.headers.get('X-Auth-Token') not in self.valid_tokens:
+                raise Unauthorized(acl)
+            return func(*args, **kwargs)
+
+        return wrapper
+
+
+def view(id):
+    return id
+
+
+view.acl = 'confd.users.{id}.read'
+
+
+class Resource:
+    def get(self, id):
+        return id
+
+    get.acl = 'confd.users.{id}.read'
+
+
+class TestTokenCache(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.verifier = FakeVerifier()
+        self.auth_client = Mock()
+        self.expires_at = datetime.utcnow() + timedelta(hours=1)
+        self.auth_client.token.get.return_value = {
+            'session_uuid': 'session',
+            'utc_expires_at': self.expires_at.isoformat(),
+        }
+        self.cache = TokenCache(self.auth_client, size=10, ttl=30)
+
+    def call(self, id, token='valid-token', tenant=None):
+        headers = {'X-Auth-Token': token}
+        if tenant:
+            headers['Wazo-Tenant'] = tenant
+        with self.app.test_request_context('/users', headers=headers):
+            decorated = self.cache.cached(self.verifier.verify_token)(view)
+            return decorated(id=id)
+
+    def test_accepted_token_is_not_checked_again(self):
+        assert_that(self.call(1), equal_to(1))
+        assert_that(self.call(1), equal_to(1))
+
+        assert_that(self.verifier.checks, equal_to(['confd.users.1.read']))
+        self.auth_client.token.get.assert_called_once_with('valid-token')
+        assert_that(self.cache.hits, equal_to(1))
+        assert_that(self.cache.misses, equal_to(1))
+
+    def test_methods_decorated_on_each_request(self):
+        for _ in range(2):
+            with self.app.test_request_context(
+                '/users', headers={'X-Auth-Token': 'valid-token'}
+            ):
+                method = self.cache.cached(self.verifier.verify_token)(Resource().get)
+                method(id=1)
+
+        assert_that(len(self.verifier.checks), equal_to(1))
+
+    def test_other_arguments_or_tenant_are_checked(self):
+        self.call(1)
+        self.call(2)
+        self.call(1, tenant='other')
+
+        assert_that(len(self.verifier.checks), equal_to(3))
+        self.auth_client.token.get.assert_called_once_with('valid-token')
+
+    def test_refused_token_is_checked_again(self):
+        for _ in range(2):
+            assert_that(
+                calling(self.call).with_args(1, token='invalid'), raises(Unauthorized)
+            )
+
+        assert_that(len(self.verifier.checks), equal_to(2))
+
+    def test_expired_token_is_checked_again(self):
+        self.auth_client.token.get.return_value['utc_expires_at'] = (
+            datetime.utcnow() - timedelta(seconds=1)
+        ).isoformat()
+
+        self.call(1)
+        self.call(1)
+
+        assert_that(len(self.verifier.checks), equal_to(2))
+
+    def test_unknown_expiration_is_not_kept(self):
+        self.auth_client.token.get.side_effect = Exception()
+
+        self.call(1)
+        self.call(1)
+
+        assert_that(len(self.verifier.checks), equal_to(2))
+
+    def test_deleted_session(self):
+        self.call(1)
+
+        self.cache.remove_session('session')
+        self.call(1)
+
+        assert_that(len(self.verifier.checks), equal_to(2))
+
+    def test_least_recently_used_are_removed(self):
+        for id_ in range(11):
+            self.call(id_)
+        self.call(10)
+        self.call(0)
+
+        assert_that(len(self.verifier.checks), equal_to(12))
+
+    def test_disabled(self):
+        self.cache.ttl = 0
+
+        self.call(1)
+        self.call(1)
+
+        assert_that(len(self.verifier.checks), equal_to(2))
+        self.auth_client.token.get.assert_not_called()
+
+    def test_provide_status(self):
+        self.call(1)
+        self.call(1)
+        status = {'token_cache': {}}
+
+        self.cache.provide_status(status)
+
+        assert_that(
+            status['token_cache'],
+            has_entries(enabled=True, size=1, hits=1, misses=1),
+        )